@@ -0,0 +1,281 @@
+"""Module for accounting Python memory allocations of the game loop.
+Allocations are measured for every frame, for every subsystem (game
+object) and for every game state. The report is a table of average
+bytes per frame compared with the budgets, it's printed and saved to
+JSON file on exit, so it may be checked automatically.
+
+Two values are measured for every call by tracemalloc:
+    peak - the most memory allocated during the call, i.e. the pressure
+    of temporary objects (lists, dicts, rects) which drives garbage
+    collection;
+    net - the memory left allocated after the call.
+Subsystem calls are inclusive: if one subsystem calls another one then
+the inner allocations are counted for both.
+
+Every SAMPLE_PERIOD frames every line of the code executed during the
+frame is measured instead (see sys.settrace()): the peak allocated while
+the line runs is its churn, temporary objects included. The lines with
+the greatest churn are reported as allocation sites of the subsystem
+running them. Line tracing is slow (sampled frames are not accounted),
+the game runs noticeably slower in this mode."""
+import atexit
+import json
+import os
+import sys
+import tracemalloc
+from collections import defaultdict
+
+ALLOC_PROFILE_FILENAME = 'alloc_profile.json'
+
+# Budgets in bytes per frame: peak allocations of the whole frame and
+# of a single subsystem (may be specified for every subsystem). Peaks
+# of several calls of the subsystem within the frame are summed up.
+FRAME_BUDGET = 1024 * 1024
+SUBSYSTEM_BUDGET = 64 * 1024
+SUBSYSTEM_BUDGETS = {
+    # Drawing the stars builds the list of blits for every visible star
+    'stars': 768 * 1024,
+    'title_screen': 768 * 1024,
+    }
+
+# Allocation sites are sampled every SAMPLE_PERIOD frames
+SAMPLE_PERIOD = 60
+# Number of allocation sites of every subsystem in the report
+TOP_SITES = 5
+
+# Width of the name columns in the report table
+NAME_WIDTH = 24
+
+class AllocationProfiler():
+    """The class accumulates allocations in format:
+    {state: {subsystem: {'calls': n, 'peak': bytes, 'net': bytes}}}
+    Whole frames are accounted as subsystem 'frame'. Disabled profiler
+    wraps nothing and its frame methods cost nearly nothing."""
+    def __init__(self, enabled=True, frame_budget=FRAME_BUDGET,
+                 subsystem_budgets=SUBSYSTEM_BUDGETS):
+        """Input parameters:
+        enabled - if False then nothing is measured;
+        frame_budget - peak allocations budget for the frame in bytes;
+        subsystem_budgets - dict in format {subsystem: bytes}, the
+        subsystems not listed have SUBSYSTEM_BUDGET."""
+        self.enabled = enabled
+        self.frame_budget = frame_budget
+        self.subsystem_budgets = subsystem_budgets
+        self.reported = False
+        self.stats = defaultdict(lambda: defaultdict(
+            lambda: {'calls': 0, 'peak': 0, 'net': 0}))
+        self.frames = defaultdict(int)
+        # Format: {(subsystem, 'file:line'): {'size': bytes, 'count': n}}
+        # where count is the number of runs of the line which allocated
+        self.sites = defaultdict(lambda: {'size': 0, 'count': 0})
+        self.sampled_frames = 0
+        self.state = None
+        self.frame_count = 0
+        self.sampling = False
+        # Measured calls: [[subsystem, memory at start, peak so far],...]
+        self.stack = []
+        # The line measured now: (subsystem, 'file:line') or None
+        self.line = None
+        self.line_start = 0
+        # The code of these files is not traced line by line
+        self.skipped_files = (tracemalloc.__file__, __file__)
+        if self.enabled:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self.line_bias = self._get_line_bias()
+            atexit.register(self.report)
+
+    def _enter(self, subsystem):
+        if self.sampling:
+            # Memory is measured by the lines of the sampled frame
+            self.stack.append([subsystem, 0, 0])
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if self.stack:
+            # Keeping the peak of the outer call before resetting
+            self.stack[-1][2] = max(self.stack[-1][2], peak)
+        tracemalloc.reset_peak()
+        self.stack.append([subsystem, current, current])
+
+    def _exit(self):
+        subsystem, start, peak = self.stack.pop()
+        if self.sampling:
+            return
+        current, last_peak = tracemalloc.get_traced_memory()
+        peak = max(peak, last_peak)
+        if self.stack:
+            self.stack[-1][2] = max(self.stack[-1][2], peak)
+        stats = self.stats[self.state][subsystem]
+        stats['calls'] += 1
+        stats['peak'] += peak - start
+        stats['net'] += current - start
+
+    def _start_line(self, line):
+        self.line = line
+        tracemalloc.reset_peak()
+        self.line_start = tracemalloc.get_traced_memory()[0]
+
+    def _end_line(self):
+        """Adds the churn of the line measured now to its site."""
+        if self.line is None:
+            return
+        size = tracemalloc.get_traced_memory()[1] - self.line_start
+        size -= self.line_bias
+        if size > 0:
+            site = self.sites[self.line]
+            site['size'] += size
+            site['count'] += 1
+        self.line = None
+
+    def _get_line_bias(self):
+        """Returns the churn of an empty line, i.e. the memory allocated
+        by the measuring itself."""
+        bias = None
+        for i in range(10):
+            self._start_line(None)
+            size = tracemalloc.get_traced_memory()[1] - self.line_start
+            bias = size if bias is None else min(bias, size)
+        self.line = None
+        return bias
+
+    def _trace_call(self, frame, event, arg):
+        """Global trace function of sampled frames (see sys.settrace())."""
+        if frame.f_code.co_filename in self.skipped_files:
+            return None
+        return self._trace_line
+
+    def _trace_line(self, frame, event, arg):
+        """Local trace function: every line is measured until the next
+        one starts. After return the caller's line is measured again."""
+        self._end_line()
+        if event == 'return':
+            frame = frame.f_back
+            if frame is None or frame.f_trace is None:
+                return None
+        elif event != 'line':
+            return self._trace_line
+        self._start_line((self.stack[-1][0],
+                          f"{frame.f_code.co_filename}:{frame.f_lineno}"))
+        return self._trace_line
+
+    def instrument(self, obj, method_name, subsystem):
+        """Replaces the method of the object with the one measuring
+        allocations of the subsystem. Does nothing if the profiler is
+        disabled."""
+        if not self.enabled:
+            return
+        function = getattr(obj, method_name)
+
+        def measured(*args, **kwargs):
+            if self.state is None or self.stack[-1][0] == subsystem:
+                # Calls between the frames are not accounted as well as
+                # the calls inside the same subsystem
+                return function(*args, **kwargs)
+            self._enter(subsystem)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._exit()
+
+        setattr(obj, method_name, measured)
+
+    def begin_frame(self, state):
+        """Starts accounting the frame in given game state (name)."""
+        if not self.enabled:
+            return
+        self.state = state
+        self.sampling = self.frame_count % SAMPLE_PERIOD == 0
+        self.frame_count += 1
+        self._enter('frame')
+        if self.sampling:
+            self.sampled_frames += 1
+            sys.settrace(self._trace_call)
+        else:
+            self.frames[state] += 1
+
+    def end_frame(self):
+        """Finishes accounting the frame."""
+        if not self.enabled or self.state is None:
+            return
+        if self.sampling:
+            sys.settrace(None)
+            self._end_line()
+        self._exit()
+        self.state = None
+
+    def get_budget(self, subsystem):
+        """Returns the budget of the subsystem in bytes per frame."""
+        if subsystem == 'frame':
+            return self.frame_budget
+        return self.subsystem_budgets.get(subsystem, SUBSYSTEM_BUDGET)
+
+    def get_table(self):
+        """Returns a list of dicts with average allocations per frame:
+        [{'state', 'subsystem', 'calls', 'peak', 'net', 'budget',
+          'over_budget'},...]"""
+        table = []
+        for state, subsystems in self.stats.items():
+            frames = max(self.frames[state], 1)
+            for subsystem, stats in subsystems.items():
+                peak = stats['peak'] / frames
+                table.append({
+                    'state': state,
+                    'subsystem': subsystem,
+                    'calls': stats['calls'],
+                    'peak': peak,
+                    'net': stats['net'] / frames,
+                    'budget': self.get_budget(subsystem),
+                    'over_budget': peak > self.get_budget(subsystem),
+                    })
+        table.sort(key=lambda row: (row['state'], -row['peak']))
+        return table
+
+    def get_sites(self):
+        """Returns a list of the allocation sites with the greatest churn
+        in sampled frames (TOP_SITES for every subsystem):
+        [{'subsystem', 'site', 'size', 'count'},...]"""
+        sites = [{'subsystem': subsystem, 'site': site, **values}
+                 for (subsystem, site), values in self.sites.items()]
+        sites.sort(key=lambda site: (site['subsystem'], -site['size']))
+        top_sites = []
+        for site in sites:
+            if (len(top_sites) < TOP_SITES or
+                    top_sites[-TOP_SITES]['subsystem'] != site['subsystem']):
+                top_sites.append(site)
+        return top_sites
+
+    def report(self, filename=ALLOC_PROFILE_FILENAME):
+        """Saves the report to JSON file and prints it. Returns True if
+        all the allocations are within the budgets and False otherwise.
+        Does nothing (and returns True) if the profiler is disabled or
+        the report has been done already."""
+        if not self.enabled or self.reported:
+            return True
+        self.reported = True
+        table = self.get_table()
+        sites = self.get_sites()
+        within_budget = not any(row['over_budget'] for row in table)
+
+        with open(filename, 'w') as file:
+            json.dump({'frames': self.frames,
+                       'sampled_frames': self.sampled_frames,
+                       'within_budget': within_budget,
+                       'table': table, 'sites': sites}, file, indent=4)
+
+        print(f"{'STATE':<{NAME_WIDTH}} {'SUBSYSTEM':<{NAME_WIDTH}} "
+              f"{'PEAK B':>9} {'NET B':>9} {'BUDGET B':>9}")
+        for row in table:
+            mark = ' OVER' if row['over_budget'] else ''
+            print(f"{row['state'][:NAME_WIDTH]:<{NAME_WIDTH}} "
+                  f"{row['subsystem'][:NAME_WIDTH]:<{NAME_WIDTH}} "
+                  f"{row['peak']:>9.0f} {row['net']:>9.0f} "
+                  f"{row['budget']:>9}{mark}")
+        print(f"{'SITE':<{NAME_WIDTH * 2}} {'CHURN B':>9} {'COUNT':>9} "
+              f"(in {self.sampled_frames} sampled frames)")
+        for site in sites:
+            name = f"{site['subsystem']} {os.path.basename(site['site'])}"
+            print(f"{name[:NAME_WIDTH * 2]:<{NAME_WIDTH * 2}} "
+                  f"{site['size']:>9} {site['count']:>9}")
+        print(f"Allocations are {'within' if within_budget else 'over'} "
+              "the budget")
+        return within_budget
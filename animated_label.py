@@ -1,65 +1,165 @@
-"""Module introduces AnimatedLabel class which is the base for building
-classes with different animations. AnimatedLabel itself contains no
-specific animation effects and visually works as ordinary TextLabel.
-Though it encapsulates self.progress attribute for keeping the status
-of some continuous process."""
-from text_label import TextLabel, DEFAULT_COLOR, DEFAULT_SIZE, TYPEFACE_NORMAL
-
-DEFAULT_MAX_PROGRESS = 100
-
-class AnimatedLabel(TextLabel):
-    def __init__(self, scr, text='', color=DEFAULT_COLOR, size=DEFAULT_SIZE,
-                 typeface=TYPEFACE_NORMAL):
-        """The parameters are the same as for TextLabel."""
-        super().__init__(scr, text, color, size, typeface)
-        self.speed = 1
-        self.max_progress = DEFAULT_MAX_PROGRESS
-        self.repeat = True
-        self._reset()
-
-    def _reset(self):
-        self.finished = False
-        self.progress = 0
-
-    def restart(self):
-        """Forces the animation effect to start again."""
-        self._reset()
-        # This is needed for complete reset in child class instances
-        self.update()
-        self._reset()
-
-    def update(self):
-        """Respectively updates self.progress attribute."""
-        if not self.finished:
-            self.progress += self.speed
-            if self.progress > self.max_progress:
-                if self.repeat:
-                    self.progress = 0
-                else:
-                    self.progress = self.max_progress
-                    self.finished = True
-
-    def set_speed(self, speed=1):
-        """Sets the speed of animation effect. It means the increment
-        for self.progress attribute.
-        Input value should be positive float or int."""
-        self.speed = speed
-
-    def set_max_progress(self, max_progress=DEFAULT_MAX_PROGRESS):
-        """Sets maximum value for self.progress attribute.
-        Input value should be positive float or int."""
-        self.max_progress = max_progress
-        if self.progress > self.max_progress:
-            if self.repeat:
-                self.progress = 0
-            else:
-                self.progress = self.max_progress
-                self.finished = True
-
-    def set_repeat(self, repeat=True):
-        """Changes 'repeat' parameter of the animation effect. If the
-        animation has finished, then setting repeat to True will start
-        it again."""
-        self.repeat = repeat
-        if self.finished and self.repeat:
-            self.finished = False
+"""Module introduces AnimatedLabel class which is the base for building
+classes with different animations. AnimatedLabel itself contains no
+specific animation effects and visually works as ordinary TextLabel.
+Though it encapsulates self.progress attribute for keeping the status
+of some continuous process.
+
+Animation effects are deterministic functions of the progress, so their
+frames are baked: each frame is rendered only once (lazily or by calling
+bake()) and then just blitted. The frames are dropped when the text,
+color or size of the label changes."""
+from text_label import TextLabel, DEFAULT_COLOR, DEFAULT_SIZE, TYPEFACE_NORMAL
+
+DEFAULT_MAX_PROGRESS = 100
+
+# Shapes of the ramps (see get_ramp())
+RAMP_UP = 0
+RAMP_DOWN = 1
+RAMP_TRIANGLE = 2
+
+# Shared ramps: {(max_progress, speed, shape, levels): [fraction,...]}
+_ramps = {}
+
+def get_ramp(max_progress, speed, shape, levels=None):
+    """Returns a list of fractions (from 0 to 1) for each progress step
+    of the animation. The last item corresponds to max_progress.
+    Input parameters:
+    max_progress, speed - see AnimatedLabel attributes;
+    shape - RAMP_UP [0..1], RAMP_DOWN [1..0] or RAMP_TRIANGLE [0..1..0];
+    levels - if specified then fractions are rounded to this number of
+    levels (it limits the number of distinct frames to be baked).
+    The ramps are computed only once and are shared by all labels."""
+    key = (max_progress, speed, shape, levels)
+    if key not in _ramps:
+        progress_list = []
+        progress = 0
+        while progress < max_progress:
+            progress_list.append(progress)
+            progress += speed
+        progress_list.append(max_progress)
+
+        ramp = []
+        for progress in progress_list:
+            if shape == RAMP_UP:
+                fraction = progress / max_progress
+            elif shape == RAMP_DOWN:
+                fraction = 1 - progress / max_progress
+            else:
+                fraction = 1 - 2*abs(progress / max_progress - 0.5)
+            if levels:
+                fraction = round(fraction * levels) / levels
+            ramp.append(fraction)
+        _ramps[key] = ramp
+
+    return _ramps[key]
+
+class AnimatedLabel(TextLabel):
+    def __init__(self, scr, text='', color=DEFAULT_COLOR, size=DEFAULT_SIZE,
+                 typeface=TYPEFACE_NORMAL):
+        """The parameters are the same as for TextLabel."""
+        # Baked frames of the animation: {key: pygame.Surface,...}
+        self.frames = {}
+        super().__init__(scr, text, color, size, typeface)
+        self.speed = 1
+        self.max_progress = DEFAULT_MAX_PROGRESS
+        self.repeat = True
+        self._reset()
+
+    def _reset(self):
+        self.finished = False
+        self.progress = 0
+
+    def restart(self):
+        """Forces the animation effect to start again."""
+        self._reset()
+        # This is needed for complete reset in child class instances
+        self.update()
+        self._reset()
+
+    def _get_fraction(self, shape, levels=None, progress=None):
+        """Returns the fraction of the ramp (see get_ramp()) for given
+        progress (current one by default)."""
+        if progress is None:
+            progress = self.progress
+        ramp = get_ramp(self.max_progress, self.speed, shape, levels)
+        if progress >= self.max_progress:
+            return ramp[-1]
+        return ramp[min(int(round(progress / self.speed)), len(ramp) - 1)]
+
+    def _render_frame(self, key):
+        """Takes baked frame for the given key or renders and stores it
+        if there is no such frame yet."""
+        image = self.frames.get(key)
+        if image is None:
+            self._render()
+            self.frames[key] = self.image
+        elif image is not self.image:
+            self.image = image
+            self.image_version += 1
+
+    def bake(self):
+        """Renders all the frames of the animation effect beforehand.
+        There are no frames to be baked for the base class."""
+        pass
+
+    def set_text(self, text):
+        """Sets new text of the label and drops baked frames."""
+        if self.text != text:
+            self.frames = {}
+        super().set_text(text)
+
+    def set_color(self, color):
+        """Sets new color of the label and drops baked frames."""
+        if self.color != list(color):
+            self.frames = {}
+        super().set_color(color)
+
+    def set_size(self, size):
+        """Sets new size of the label font and drops baked frames."""
+        if self.size != size:
+            self.frames = {}
+        super().set_size(size)
+
+    def get_frames_to_change(self):
+        """Returns the number of updates after which the label may look
+        different or None if it doesn't change any more. The base class
+        can't predict its child classes, so any update may change it."""
+        if self.finished:
+            return None
+        return 1
+
+    def update(self):
+        """Respectively updates self.progress attribute."""
+        if not self.finished:
+            self.progress += self.speed
+            if self.progress > self.max_progress:
+                if self.repeat:
+                    self.progress = 0
+                else:
+                    self.progress = self.max_progress
+                    self.finished = True
+
+    def set_speed(self, speed=1):
+        """Sets the speed of animation effect. It means the increment
+        for self.progress attribute.
+        Input value should be positive float or int."""
+        self.speed = speed
+
+    def set_max_progress(self, max_progress=DEFAULT_MAX_PROGRESS):
+        """Sets maximum value for self.progress attribute.
+        Input value should be positive float or int."""
+        self.max_progress = max_progress
+        if self.progress > self.max_progress:
+            if self.repeat:
+                self.progress = 0
+            else:
+                self.progress = self.max_progress
+                self.finished = True
+
+    def set_repeat(self, repeat=True):
+        """Changes 'repeat' parameter of the animation effect. If the
+        animation has finished, then setting repeat to True will start
+        it again."""
+        self.repeat = repeat
+        if self.finished and self.repeat:
+            self.finished = False
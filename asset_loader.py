@@ -0,0 +1,188 @@
+"""Module for preparing game resources in parallel before the game
+objects are created. Decoding of images, cropping of track tiles,
+parsing of maps and building of bitmask bits for animation frames are
+done by the pool of workers (threads by default). Prepared resources
+are handed to the game objects through the assets module (see
+assets.preload()), so the objects load them as usual."""
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+import pygame
+import pygame.image
+import pygame.mask
+import pygame.surfarray
+
+from assets import open_asset, preload
+from asset_variants import get_asset_variants
+from image_crop import image_crop
+from map import map_read
+
+# Pixel format of the images passed between processes
+PIXEL_FORMAT = 'RGBA'
+# Pixels with greater alpha are set in the masks (the same threshold as
+# pygame.mask.from_surface() has)
+MASK_THRESHOLD = 127
+
+# Image passed between processes as raw pixel buffer
+RawImage = namedtuple('RawImage', ('size', 'pixels'))
+# Bitmask passed as raw buffer: one byte (0 or 1) per pixel
+RawMask = namedtuple('RawMask', ('size', 'bits'))
+
+def _decode_image(path):
+    """Worker function: decodes the image. Returns pygame.Surface."""
+    with open_asset(path) as file:
+        return pygame.image.load(file, os.path.basename(path))
+
+def _decode_cropped_image(path):
+    """Worker function: decodes the image and removes transparent area
+    near the edges. Returns a dict in format of image_crop()."""
+    return image_crop(_decode_image(path))
+
+def _prepare_frame_masks(path, frame_cols, frame_rows):
+    """Worker function: builds the bits of the masks for the animation
+    frames of the sprite sheet scaled as in the game. Returns a list of
+    RawMask in the order of AnimatedSprite frames."""
+    image = get_asset_variants().prepare_image(path, frame_cols, frame_rows)
+    bits = (pygame.surfarray.array_alpha(image).T >
+            MASK_THRESHOLD).astype(np.uint8)
+    width = image.get_width() // frame_cols
+    height = image.get_height() // frame_rows
+    masks = []
+    for frame in range(frame_cols * frame_rows):
+        x = (frame % frame_cols) * width
+        y = (frame // frame_cols) * height
+        masks.append(RawMask((width, height),
+                             bits[y:y + height, x:x + width].tobytes()))
+    return masks
+
+def _wrap_mask(raw_mask):
+    """Returns pygame.mask.Mask with the bits of RawMask."""
+    # 8-bit surface with transparent zeros is the cheapest way to set
+    # all the bits at once
+    surface = pygame.image.frombuffer(raw_mask.bits, raw_mask.size, 'P')
+    surface.set_colorkey(0)
+    return pygame.mask.from_surface(surface)
+
+def _pack(resource):
+    """Replaces surfaces in the resource with raw pixel buffers, so the
+    resource may be passed between processes."""
+    if isinstance(resource, pygame.Surface):
+        return RawImage(resource.get_size(),
+                        pygame.image.tostring(resource, PIXEL_FORMAT))
+    if isinstance(resource, dict):
+        return {key: _pack(value) for key, value in resource.items()}
+    if isinstance(resource, list):
+        return [_pack(item) for item in resource]
+    return resource
+
+def _unpack(resource):
+    """Wraps raw pixel buffers in the resource into surfaces
+    (see _pack()) and raw masks into masks. Pixels are not copied."""
+    if isinstance(resource, RawImage):
+        return pygame.image.frombuffer(resource.pixels, resource.size,
+                                       PIXEL_FORMAT)
+    if isinstance(resource, RawMask):
+        return _wrap_mask(resource)
+    if isinstance(resource, dict):
+        return {key: _unpack(value) for key, value in resource.items()}
+    if isinstance(resource, list):
+        return [_unpack(item) for item in resource]
+    return resource
+
+def _run_job(function, args, packed=False):
+    """Worker function: calls another worker function with given tuple
+    of arguments and measures it. Returns a tuple (result, wall time,
+    CPU time of the worker thread). If packed is True then the result
+    is packed (see _pack())."""
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    result = function(*args)
+    if packed:
+        result = _pack(result)
+    return (result, time.perf_counter() - wall, time.thread_time() - cpu)
+
+class AssetLoader():
+    """The class prepares resources by the pool of workers. Threads are
+    used by default: pygame releases GIL while decoding images, so the
+    workers really run in parallel and surfaces are passed to the main
+    thread as they are. Process pool may be used instead, then the
+    surfaces are passed as raw pixel buffers and wrapped into surfaces
+    again by the main thread. Mask bits are always passed as raw
+    buffers and wrapped into masks by the main thread."""
+    def __init__(self, workers=None, use_processes=False):
+        """Input parameters:
+        workers - number of workers (by default - number of CPU cores);
+        use_processes - if True then process pool is used instead of
+        thread pool."""
+        self.workers = workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.executor = None
+        # Format: {(kind, path): job}
+        self.jobs = {}
+        # Time spent by the workers, format: {'kind path': (wall, cpu)}
+        self.timings = {}
+
+    def start(self, images=(), cropped_images=(), maps=(), frame_masks=()):
+        """Starts preparing the resources and returns immediately.
+        Resources are prepared in order of the arguments and the paths.
+        Input parameters:
+        images - paths of images to be loaded with load_image();
+        cropped_images - paths of images to be loaded with
+        load_cropped_image();
+        maps - paths of maps to be loaded with map_read();
+        frame_masks - list of sprite sheets for load_frame_masks() in
+        format: [(path, frame_cols, frame_rows),...]."""
+        if self.executor is None:
+            if self.use_processes:
+                self.executor = ProcessPoolExecutor(self.workers)
+            else:
+                self.executor = ThreadPoolExecutor(self.workers)
+
+        for kind, function, jobs_args in (
+                ('image', _decode_image, [(path,) for path in images]),
+                ('cropped_image', _decode_cropped_image,
+                 [(path,) for path in cropped_images]),
+                ('map', map_read, [(path,) for path in maps]),
+                ('frame_masks', _prepare_frame_masks, frame_masks)):
+            for args in jobs_args:
+                job = self.executor.submit(_run_job, function, args,
+                                           self.use_processes)
+                self.jobs[(kind, args[0])] = job
+
+    def collect(self, paths=None, wait=False):
+        """Stores prepared resources with assets.preload(). Returns True
+        if all the requested resources have been stored.
+        Input parameters:
+        paths - paths of the resources to be stored (by default - all
+        the resources started);
+        wait - if True then waits for the resources being prepared."""
+        if paths is None:
+            keys = list(self.jobs)
+        else:
+            # Every kind of resources prepared for the path
+            keys = [key for path in paths for key in self.jobs
+                    if key[1] == path]
+
+        for key in keys:
+            job = self.jobs[key]
+            if not (wait or job.done()):
+                return False
+            resource, wall, cpu = job.result()
+            kind, path = key
+            preload(kind, path, _unpack(resource))
+            self.timings[f"{kind} {path}"] = (wall, cpu)
+            del self.jobs[key]
+
+        if not self.jobs and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        return True
+
+    def load(self, images=(), cropped_images=(), maps=(), frame_masks=()):
+        """Prepares the resources and stores them with assets.preload().
+        Input parameters are the same as for start()."""
+        self.start(images, cropped_images, maps, frame_masks)
+        self.collect(wait=True)
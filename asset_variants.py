@@ -0,0 +1,190 @@
+"""Module for loading game images pre-scaled for the logical resolution
+(see scaling.py). Every image is scaled only once: the result is stored
+on disk in the variants directory and is loaded from there next time,
+so the game never scales images while playing and higher resolutions
+cost load time only. Don't create AssetVariants objects manually, use
+get_asset_variants() function instead.
+
+Variant file format (all integers are unsigned little-endian):
+    width (4 bytes) | height (4 bytes) | offset_x (4 bytes) |
+    offset_y (4 bytes) | zlib-compressed RGBA pixels
+Where offsets are the ones of cropped images (see image_crop())."""
+import os
+import struct
+import zlib
+
+import pygame
+import pygame.image
+import pygame.transform
+
+from assets import BASE_DIR, load_image, get_asset_mtime, take_preloaded
+from assets import open_asset
+from image_crop import load_cropped_image
+from scaling import ASSET_SCALE
+
+# Directory for variant files (relative to the game directory)
+VARIANTS_DIR = 'variants'
+HEADER_FORMAT = '<IIII'
+PIXEL_FORMAT = 'RGBA'
+# Variants are mostly transparent, so the fastest compression is enough
+COMPRESS_LEVEL = 1
+# Maximum side of scaled image in pixels: larger sprite sheets are
+# scaled less than the others to fit it
+MAX_VARIANT_SIDE = 8192
+
+asset_variants = None
+
+class AssetVariants():
+    """The class provides images scaled by given factor. Scaled images
+    are kept on disk in the subdirectory named after the factor and are
+    scaled anew if the source image is newer. It counts images loaded
+    from disk (hits) and scaled anew (misses)."""
+    def __init__(self, scale=ASSET_SCALE, directory=VARIANTS_DIR):
+        """Input parameters:
+        scale - scale factor for the images;
+        directory - directory for variant files (relative to the game
+        directory)."""
+        self.scale = scale
+        self.directory = os.path.join(BASE_DIR, directory, f"{scale:g}")
+        self.hits = 0
+        self.misses = 0
+
+    def _get_filename(self, path):
+        return os.path.join(self.directory, f"{path}.var")
+
+    def _read(self, path):
+        """Returns a tuple (image, offset_x, offset_y) with the variant
+        of the image or None if there is no up-to-date variant."""
+        filename = self._get_filename(path)
+        try:
+            if os.path.getmtime(filename) < get_asset_mtime(path):
+                return None
+            with open(filename, 'rb') as f:
+                data = f.read()
+            width, height, offset_x, offset_y = struct.unpack_from(
+                HEADER_FORMAT, data)
+            pixels = zlib.decompress(
+                memoryview(data)[struct.calcsize(HEADER_FORMAT):])
+        except (OSError, struct.error, zlib.error):
+            return None
+        if len(pixels) != width * height * len(PIXEL_FORMAT):
+            return None
+        image = pygame.image.frombuffer(pixels, (width, height),
+                                        PIXEL_FORMAT)
+        return (image, offset_x, offset_y)
+
+    def _write(self, path, image, offset_x=0, offset_y=0):
+        """Stores the variant of the image. The game still works if the
+        variant can't be stored, it's just scaled again next time."""
+        filename = self._get_filename(path)
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(f"{filename}.tmp", 'wb') as f:
+                f.write(struct.pack(HEADER_FORMAT, image.get_width(),
+                                    image.get_height(), offset_x, offset_y))
+                f.write(zlib.compress(
+                    pygame.image.tostring(image, PIXEL_FORMAT),
+                    COMPRESS_LEVEL))
+            os.replace(f"{filename}.tmp", filename)
+        except OSError as e:
+            print(f"Can't store image variant {filename}: {e}")
+
+    def _get_size(self, size, frame_cols=1, frame_rows=1):
+        """Returns scaled size of the image with given size. Animation
+        frames of sprite sheets keep integer size."""
+        frame_width = size[0] // frame_cols
+        frame_height = size[1] // frame_rows
+        scale = min(self.scale, MAX_VARIANT_SIDE / max(size))
+        return (max(round(frame_width * scale), 1) * frame_cols,
+                max(round(frame_height * scale), 1) * frame_rows)
+
+    def get_image(self, path, frame_cols=1, frame_rows=1):
+        """Returns pygame.Surface with scaled image (in the same pixel
+        format as load_image() does).
+        Input parameters:
+        path - path to the image (relative to the game directory);
+        frame_cols, frame_rows - number of columns and rows of
+        animation frames if the image is a sprite sheet."""
+        if self.scale == 1:
+            return load_image(path)
+
+        variant = self._read(path)
+        if variant:
+            # The source image prepared beforehand is not needed
+            take_preloaded('image', path)
+            self.hits += 1
+            return variant[0]
+
+        self.misses += 1
+        image = load_image(path)
+        image = pygame.transform.smoothscale(
+            image, self._get_size(image.get_size(), frame_cols, frame_rows))
+        self._write(path, image)
+        return image
+
+    def prepare_image(self, path, frame_cols=1, frame_rows=1):
+        """Returns pygame.Surface with the image scaled as get_image()
+        does, but the images prepared beforehand are not used and the
+        variant is neither stored nor counted, so it's safe to call
+        from the workers of AssetLoader. Parameters are the same as for
+        get_image()."""
+        if self.scale != 1:
+            variant = self._read(path)
+            if variant:
+                return variant[0]
+
+        with open_asset(path) as file:
+            image = pygame.image.load(file, os.path.basename(path))
+        if self.scale == 1:
+            return image
+        return pygame.transform.smoothscale(
+            image, self._get_size(image.get_size(), frame_cols, frame_rows))
+
+    def get_cropped_image(self, path):
+        """Returns scaled cropped image in the same format as
+        image_crop.load_cropped_image() does. Offsets are scaled too."""
+        if self.scale == 1:
+            return load_cropped_image(path)
+
+        variant = self._read(path)
+        if variant:
+            take_preloaded('cropped_image', path)
+            self.hits += 1
+            image, offset_x, offset_y = variant
+            return {'image': image, 'offset_x': offset_x,
+                    'offset_y': offset_y}
+
+        self.misses += 1
+        crop_result = load_cropped_image(path)
+        image = crop_result['image']
+        # Scaling the edges rather than the size, so cropped parts of
+        # the tiles still fit the grid
+        left = round(crop_result['offset_x'] * self.scale)
+        top = round(crop_result['offset_y'] * self.scale)
+        right = round((crop_result['offset_x'] + image.get_width())
+                      * self.scale)
+        bottom = round((crop_result['offset_y'] + image.get_height())
+                       * self.scale)
+        image = pygame.transform.smoothscale(
+            image, (max(right - left, 1), max(bottom - top, 1)))
+        self._write(path, image, left, top)
+        return {'image': image, 'offset_x': left, 'offset_y': top}
+
+    def get_stats(self):
+        """Returns a dict with scale factor, the number of hits and
+        misses."""
+        return {'scale': self.scale, 'hits': self.hits,
+                'misses': self.misses}
+
+
+def init(scale=ASSET_SCALE):
+    """Initializes AssetVariants instance for further using."""
+    global asset_variants
+    asset_variants = AssetVariants(scale)
+
+def get_asset_variants():
+    """Returns AssetVariants singleton."""
+    global asset_variants
+    if asset_variants == None:
+        init()
+    return asset_variants
@@ -0,0 +1,208 @@
+"""Module for loading game resources (images, sounds, music, fonts and
+maps). Resources are taken from the packed archive (see pack_assets.py)
+if it exists, otherwise - from loose files in the game directory.
+
+The archive is memory-mapped: resources are handed to pygame as
+file-like objects reading directly from the mapping, so neither the
+archive nor its members are copied into memory as a whole.
+
+Archive format (all integers are unsigned little-endian):
+    magic (8 bytes) | index size (4 bytes) | index | data
+Where index is UTF-8 JSON in format {path: [offset, size],...}
+and offsets are counted from the beginning of the archive."""
+import io
+import json
+import mmap
+import os
+import struct
+
+import pygame
+import pygame.font
+import pygame.mask
+import pygame.mixer
+import pygame.transform
+
+from memory_registry import get_memory_registry
+
+ARCHIVE_FILENAME = 'assets.pak'
+ARCHIVE_MAGIC = b'SRPAK\x00\x00\x01'
+INDEX_SIZE_FORMAT = '<I'
+
+# Directories with resources (relative to the game directory)
+ASSET_DIRS = ('img', 'img/tiles', 'img/bg', 'snd', 'mus', 'fnt', 'map')
+
+# Game directory: resources don't depend on current working directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+archive = None
+
+# Resources prepared beforehand (see AssetLoader): {(kind, path): resource}
+_preloaded = {}
+
+class ArchiveFile(io.RawIOBase):
+    """Read-only file-like object for single archive member. It reads
+    directly from the memory-mapped archive."""
+    def __init__(self, view):
+        """Input parameters:
+        view - memoryview of the member data."""
+        super().__init__()
+        self.view = view
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), len(self.view) - self.pos)
+        if size <= 0:
+            return 0
+        buffer[:size] = self.view[self.pos:self.pos + size]
+        self.pos += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.pos = offset
+        elif whence == io.SEEK_CUR:
+            self.pos += offset
+        elif whence == io.SEEK_END:
+            self.pos = len(self.view) + offset
+        self.pos = max(self.pos, 0)
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+class AssetArchive():
+    """The class provides access to the members of the packed archive."""
+    def __init__(self, filename):
+        """Input parameters:
+        filename - path to the archive file.
+        Raises ValueError if the file is not a valid archive."""
+        self.file = open(filename, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_size = len(ARCHIVE_MAGIC) + struct.calcsize(INDEX_SIZE_FORMAT)
+        if self.map[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC:
+            self.close()
+            raise ValueError(f"Not an asset archive: {filename}")
+        index_size = struct.unpack_from(INDEX_SIZE_FORMAT, self.map,
+                                        len(ARCHIVE_MAGIC))[0]
+        self.index = json.loads(
+            self.map[header_size:header_size + index_size].decode('utf-8'))
+        self.view = memoryview(self.map)
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def open(self, path):
+        """Returns ArchiveFile object for the member with given path."""
+        offset, size = self.index[path]
+        return ArchiveFile(self.view[offset:offset + size])
+
+    def close(self):
+        if getattr(self, 'view', None) is not None:
+            self.view.release()
+        self.map.close()
+        self.file.close()
+
+
+def init(filename=ARCHIVE_FILENAME):
+    """Opens the archive for further using. If there is no archive
+    then loose files are used."""
+    global archive
+    path = os.path.join(BASE_DIR, filename)
+    if os.path.isfile(path):
+        archive = AssetArchive(path)
+    else:
+        archive = False
+
+def get_archive():
+    """Returns AssetArchive singleton or False if loose files are
+    used."""
+    global archive
+    if archive == None:
+        init()
+    return archive
+
+def _get_source(path):
+    """Returns archive member file-like object or full path to the loose
+    file for given resource path (relative to the game directory)."""
+    if get_archive() and path in archive:
+        return archive.open(path)
+    return os.path.join(BASE_DIR, path)
+
+def get_asset_mtime(path):
+    """Returns modification time of the resource with given path: the
+    time of the archive if the resource is packed, otherwise the time
+    of the loose file."""
+    if get_archive() and path in archive:
+        return os.path.getmtime(archive.file.name)
+    return os.path.getmtime(os.path.join(BASE_DIR, path))
+
+def preload(kind, path, resource):
+    """Stores the resource prepared beforehand. It will be returned
+    once instead of loading the resource of this kind from given path.
+    Kinds are 'image' (see load_image()), 'cropped_image'
+    (see image_crop.load_cropped_image()), 'map' (see map_read()) and
+    'frame_masks' (see load_frame_masks())."""
+    _preloaded[(kind, path)] = resource
+
+def take_preloaded(kind, path):
+    """Returns the resource prepared beforehand and forgets it.
+    Returns None if there is no such resource."""
+    return _preloaded.pop((kind, path), None)
+
+def open_asset(path):
+    """Returns binary file-like object for given resource path."""
+    source = _get_source(path)
+    if isinstance(source, str):
+        return open(source, 'rb')
+    return source
+
+def load_image(path):
+    """Loads image and returns pygame.Surface."""
+    image = take_preloaded('image', path)
+    if image is None:
+        image = pygame.image.load(_get_source(path), os.path.basename(path))
+    return image
+
+def load_frame_masks(path, image, frame_cols=1, frame_rows=1):
+    """Returns a list of bitmasks (pygame.mask.Mask) for the animation
+    frames of the sprite sheet (in the order of AnimatedSprite frames).
+    The masks prepared beforehand for given path are taken if there are
+    any, otherwise they are built from the image."""
+    masks = take_preloaded('frame_masks', path)
+    if masks is None:
+        width = image.get_width() // frame_cols
+        height = image.get_height() // frame_rows
+        masks = [pygame.mask.from_surface(image.subsurface(pygame.Rect(
+            (frame % frame_cols) * width, (frame // frame_cols) * height,
+            width, height))) for frame in range(frame_cols * frame_rows)]
+    return masks
+
+def load_background(path, size=None):
+    """Loads image, converts it to display format and scales it to
+    given size (if specified and differs). Returns pygame.Surface."""
+    image = load_image(path).convert()
+    if size is not None and image.get_size() != tuple(size):
+        image = pygame.transform.smoothscale(image, size)
+    return get_memory_registry().register('backgrounds', image)
+
+def load_sound(path):
+    """Loads sound and returns pygame.mixer.Sound object."""
+    return pygame.mixer.Sound(_get_source(path))
+
+def load_font(path, size):
+    """Loads font of given size and returns pygame.font.Font object."""
+    return pygame.font.Font(_get_source(path), size)
+
+def load_music(path):
+    """Loads music for playing with pygame.mixer.music."""
+    source = _get_source(path)
+    if isinstance(source, str):
+        pygame.mixer.music.load(source)
+    else:
+        pygame.mixer.music.load(source, os.path.basename(path))
@@ -0,0 +1,36 @@
+"""Module introduces AtlasLabel class which can render frequently
+changing on-screen text (such as score) without rasterizing every new
+string by the font."""
+import pygame
+
+from text_label import TextLabel
+from text_cache import get_text_cache
+from memory_registry import get_memory_registry
+
+class AtlasLabel(TextLabel):
+    """This type of label composes the text from separately rendered
+    characters. Each character is rendered only once and then is taken
+    from the text cache, so changing the text costs just a few blits.
+    Note: kerning is not applied, so the label suits best for short
+    strings like numbers and counters."""
+    def _render(self):
+        text_cache = get_text_cache()
+        glyphs = []
+        for char in self.text:
+            glyphs.append(text_cache.render(self.font, self.font_key, char,
+                                            self.color))
+
+        width = sum(glyph.get_width() for glyph in glyphs)
+        self.image = get_memory_registry().register('text', pygame.Surface(
+            (width, self.font.get_height()), pygame.SRCALPHA))
+        self.image.fill((0, 0, 0, 0))
+        x = 0
+        for glyph in glyphs:
+            # Characters don't overlap and the image is transparent, so
+            # taking the maximum copies glyph pixels as they are (normal
+            # blending would darken antialiased edges)
+            self.image.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += glyph.get_width()
+
+        self.image_version += 1
+        self.rect.width, self.rect.height = self.image.get_size()
@@ -0,0 +1,611 @@
+"""Module with Autopilot class which controls the ship of a level
+simulation (see simulation.py). The autopilot follows a plan of the
+level (see TrackPlan): the places of the ship which don't touch the
+track are found with the ship's bitmask, and the plan knows how to reach
+the finish line from every place braking as little as possible. The
+asteroids ahead of the ship are passed by a detour (see Detour) or shot
+by the laser on the way. If there is no way between the asteroids the
+ship keeps out of them braking while the laser is being charged."""
+from bisect import bisect_right
+
+import numpy as np
+import pygame.mask
+
+from map import tile_to_abs, abs_to_tile
+from game_rules import STATUS_NORMAL, STATUS_RESTORING, SHIP_MOVEMENT
+from game_rules import CHARGE_MAX, get_world_pos, get_full_speed
+
+# Distance in cells to the track which is enough for the ship (it goes
+# to the places farther from the track than this if it can)
+CLEARANCE_MAX = 6
+# Number of the rows (ticks) ahead of the ship where it keeps to the
+# middle of the track (so it has room to pass the asteroids appearing)
+LOOK_AHEAD = 40
+# Cost of shooting an asteroid (as many rows the ship brakes in): the
+# ship passes the asteroids if it can, so the laser is kept charged
+SHOOTING_COST = 2
+# Number of the shots of the laser planned ahead (the asteroids shot
+# first clear the way to the next ones)
+SHOTS_AHEAD = 3
+# Number of the rows ahead of an asteroid where the laser has to hit it
+# (it destroys single asteroid a tick, so the others may be hit first)
+SHOOTING_LEAD = 4
+# Cost of getting stuck between the asteroids (plus the number of the
+# rows left to the end of the detour): if the ship can't pass them it
+# goes as far as it can
+STUCK_COST = 10000
+# Horizontal gap in pixels between the ship and the aim within which
+# the ship doesn't steer (avoids wobbling)
+DEAD_ZONE = SHIP_MOVEMENT / 2
+
+# Plans of the levels already built (see get_track_plan())
+track_plans = {}
+# Bitmasks covering all the animation frames of the asteroid images and
+# the common parts of the frames (see get_asteroid_shape())
+asteroid_shapes = {}
+
+def _shift(array, offset, fill):
+    """Returns the row shifted by offset cells (to the right if it's
+    positive) with the cells left filled."""
+    if offset == 0:
+        return array.copy()
+    result = np.full_like(array, fill)
+    if offset > 0:
+        result[offset:] = array[:-offset]
+    else:
+        result[:offset] = array[-offset:]
+    return result
+
+def _spread(values, passable, reach):
+    """Returns the least values of the cells of the row reachable from
+    every cell going up to reach cells sideways through the passable
+    cells (the values of the other cells are kept)."""
+    for i in range(reach):
+        spread = values.copy()
+        np.minimum(spread[1:], values[:-1], out=spread[1:])
+        np.minimum(spread[:-1], values[1:], out=spread[:-1])
+        values = np.where(passable, spread, values)
+    return values
+
+def get_asteroid_shape(asteroid):
+    """Returns a tuple (shape, core) with the bitmasks of the asteroid
+    covering all its animation frames and their common part: the ship
+    passes the asteroid beside the shape, and the laser hits it over the
+    core (whatever frame the asteroid shows)."""
+    if asteroid.index not in asteroid_shapes:
+        shape = pygame.mask.Mask(asteroid.masks[0].get_size())
+        core = pygame.mask.Mask(asteroid.masks[0].get_size(), fill=True)
+        for mask in asteroid.masks:
+            shape.draw(mask, (0, 0))
+            core = core.overlap_mask(mask, (0, 0))
+        asteroid_shapes[asteroid.index] = (shape, core)
+    return asteroid_shapes[asteroid.index]
+
+class Detour():
+    """The part of the plan (see TrackPlan) recalculated with the cells
+    taken by the asteroids. The attributes are the rows of TrackPlan
+    arrays free and cost from the row first, and the array shooting of
+    the cells where the ship has to shoot an asteroid to pass it."""
+    def __init__(self, first, free, cost, shooting):
+        self.first = first
+        self.free = free
+        self.cost = cost
+        self.shooting = shooting
+
+    def get_cells(self, row):
+        """Returns a tuple (free, cost) of the rows of the arrays or None
+        if the row isn't in the detour."""
+        index = row - self.first
+        if 0 <= index < len(self.free):
+            return (self.free[index], self.cost[index])
+        return None
+
+    def is_shooting(self, row, index):
+        """Returns True if the ship has to shoot in the cell."""
+        row -= self.first
+        return (0 <= row < len(self.shooting) and index is not None and
+                bool(self.shooting[row, index]))
+
+    def has_shots(self, row):
+        """Returns True if the ship may have to shoot from the row on."""
+        return bool(self.shooting[max(row - self.first, 0):].any())
+
+class TrackPlan():
+    """The plan of the level for the ship of the simulation. The rows of
+    the plan are the ship's y at every tick if it doesn't brake, and the
+    cells of the rows are its x going SHIP_MOVEMENT pixels sideways a
+    tick (see get_x()), so the ship not braking moves from a cell to one
+    of the three nearest cells of the next row. Braking the ship passes a
+    row in a few ticks (see get_braking_ticks()) going as many cells
+    sideways. Only the cells around the track are kept: the rows of the
+    arrays start from the cells in offsets. The attributes are:
+    rows - list of the ship's y of the rows;
+    offsets - array of the first cells of the rows kept;
+    free - 2-d array of the cells where the ship doesn't touch the track
+    (found with the bitmasks, so it's as precise as the collisions);
+    clearance - 2-d array of distances in cells from the free cells to
+    the track (not more than CLEARANCE_MAX);
+    cost - 2-d array of the least numbers of the rows where the ship has
+    to brake to go from the cell to the finish line (infinity if it
+    can't);
+    centers - array of the cells in the middle of the ones of the rows
+    where the finish line can be reached from (not the dead ends of the
+    track)."""
+    def __init__(self, simulation):
+        ship = simulation.ship
+        self.ship_speed = ship.speed
+        self.ship_acceleration = ship.acceleration
+        self.can_brake = (ship.acceleration == 0 and
+                          ship.speed > SHIP_MOVEMENT)
+        self.rows = [ship.y]
+        while self.rows[-1] <= simulation.finish_line_y:
+            self.rows.append(self.rows[-1] + self._get_speed(self.rows[-1]))
+
+        track_mask, mask_left, top = simulation.track.get_mask()
+        self.left = ship.x - (ship.x - mask_left) // SHIP_MOVEMENT * \
+            SHIP_MOVEMENT
+        columns = int((mask_left + track_mask.get_size()[0] - ship.width -
+                       self.left) // SHIP_MOVEMENT) + 1
+        spans = []
+        for y in self.rows:
+            center_y = y - ship.height / 2
+            track_columns = self._get_track_columns(simulation, y, columns)
+            free = []
+            for column in track_columns:
+                x = self.get_x(column)
+                left, ship_top = get_world_pos(x, y)
+                free.append(not (
+                    simulation.track.is_off_track(x, x + ship.width,
+                                                  center_y) or
+                    track_mask.overlap(ship.mask, (left - mask_left,
+                                                   ship_top - top))))
+            free = np.array(free, dtype=bool)
+            if free.any():
+                first = int(np.argmax(free))
+                last = len(free) - int(np.argmax(free[::-1]))
+                free = free[first:last]
+            else:
+                first = 0
+            # A non-free cell is kept on both sides of the free ones
+            spans.append((track_columns.start + first - 1, free))
+
+        self.offsets = np.array([offset for offset, free in spans])
+        self.free = np.zeros(
+            (len(self.rows), max(len(free) for offset, free in spans) + 2),
+            dtype=bool)
+        for row, (offset, free) in enumerate(spans):
+            self.free[row, 1:len(free) + 1] = free
+
+        self.clearance = np.zeros(self.free.shape, dtype=np.int8)
+        cells = self.free.copy()
+        for i in range(CLEARANCE_MAX):
+            # The side cells of the rows aren't free
+            cells[:, 1:-1] = cells[:, 1:-1] & cells[:, :-2] & cells[:, 2:]
+            self.clearance += cells
+
+        # The costs are small whole numbers, so they are kept in half
+        # precision (and calculated in single one)
+        self.cost = np.full(self.free.shape, np.inf, dtype=np.float16)
+        self.cost[-1][self.free[-1]] = 0
+        for row in range(len(self.rows) - 2, -1, -1):
+            self.cost[row] = self._get_cost(row, self.free[row],
+                                            self.free[row + 1],
+                                            self.cost[row + 1])
+        self.centers = np.array(
+            [offset + (np.argmax(cells) + len(cells) - 1 -
+                       np.argmax(cells[::-1])) / 2
+             for offset, cells in zip(self.offsets, self.cost != np.inf)])
+
+    def _get_speed(self, y):
+        """Returns the ship's speed without braking at given y."""
+        return get_full_speed(self.ship_speed, self.ship_acceleration, y)
+
+    def _get_track_columns(self, simulation, y, columns):
+        """Returns the range of the cells between the leftmost and the
+        rightmost tiles beside the ship with given y (the other cells are
+        outside the track) from the given number of the cells."""
+        ship = simulation.ship
+        tiles = simulation.track.tiles
+        lines = [line for line in tiles[max(abs_to_tile(y - ship.height), 0):
+                                        abs_to_tile(y) + 1] if line]
+        if not lines:
+            return range(columns)
+        first = (tile_to_abs(min(min(line) for line in lines)) -
+                 self.left) // SHIP_MOVEMENT
+        last = (tile_to_abs(max(max(line) for line in lines) + 1) -
+                ship.width - self.left) // SHIP_MOVEMENT
+        return range(max(int(first), 0), min(int(last), columns - 1) + 1)
+
+    def _get_cost(self, row, free, next_free, next_cost):
+        """Returns the row of the cost array for the row with given free
+        cells from the rows of the next one."""
+        offset = int(self.offsets[row + 1] - self.offsets[row])
+        next_free = _shift(next_free, offset, False)
+        next_cost = _shift(next_cost.astype(np.float32), offset, np.inf)
+        passable = free & next_free
+        cost = np.minimum(_spread(next_cost, free, 1),
+                          _spread(next_cost, passable,
+                                  self.get_braking_reach(row)) + 1)
+        return np.where(free, cost, np.inf)
+
+    def _get_cells(self, row, detour):
+        """Returns a tuple (free, cost) of the rows of the arrays of the
+        plan or the detour (if it has the row)."""
+        cells = detour and detour.get_cells(row)
+        return cells or (self.free[row], self.cost[row])
+
+    def get_braking_reach(self, row):
+        """Returns the number of the cells the ship can go sideways
+        braking on its way from the row to the next one (0 if it can't
+        brake)."""
+        if not self.can_brake:
+            return 0
+        speed = self._get_speed(self.rows[row])
+        return int(speed // (speed - SHIP_MOVEMENT))
+
+    def get_charging_rate(self, row):
+        """Returns the number of the rows the ship passes a tick from the
+        row while the laser is being charged: it brakes then if it can."""
+        if not self.can_brake:
+            return 1
+        speed = self._get_speed(self.rows[row])
+        return (speed - SHIP_MOVEMENT) / speed
+
+    def get_braking_ticks(self, y, row):
+        """Returns the number of the ticks the ship with given y has to
+        brake to get to the row (at least 1)."""
+        return max(round((self.rows[row] - y) /
+                         (self._get_speed(y) - SHIP_MOVEMENT)), 1)
+
+    def get_x(self, column):
+        """Returns the ship's x for the cell of the rows."""
+        return self.left + column * SHIP_MOVEMENT
+
+    def get_column(self, x):
+        """Returns the cell of the rows nearest to the ship with given x."""
+        return int(round((x - self.left) / SHIP_MOVEMENT))
+
+    def get_row(self, y):
+        """Returns the row nearest to the ship with given y."""
+        row = min(max(bisect_right(self.rows, y) - 1, 0), len(self.rows) - 2)
+        if self.rows[row + 1] - y < y - self.rows[row]:
+            row += 1
+        return min(row, len(self.rows) - 2)
+
+    def get_index(self, row, column):
+        """Returns the index of the cell in the row of the arrays or None
+        if the cell isn't kept."""
+        index = column - self.offsets[row]
+        if 0 <= index < self.free.shape[1]:
+            return index
+        return None
+
+    def is_feasible(self, ship):
+        """Returns True if the ship can reach the finish line by the plan
+        from its place (not counting the asteroids)."""
+        row = self.get_row(ship.y)
+        index = self.get_index(row, self.get_column(ship.x))
+        return index is not None and self.cost[row, index] != np.inf
+
+    def _get_asteroid_cells(self, simulation, asteroid):
+        """Returns a tuple (blocked, aimed) of dicts {row: list of indexes
+        of the cells} where the ship touches the asteroid and where the
+        laser hits it (not later than SHOOTING_LEAD rows before the ship
+        gets to it)."""
+        ship = simulation.ship
+        ship_left, ship_top = ship.get_pos()
+        laser_left, laser_top = ship.get_laser_pos()
+        laser_left -= ship_left
+        laser_top -= ship_top
+        shape, core = get_asteroid_shape(asteroid)
+        asteroid_left, asteroid_top = get_world_pos(asteroid.x, asteroid.y)
+        blocked = {}
+        aimed = {}
+        rows = range(bisect_right(self.rows, asteroid.y - asteroid.height),
+                     min(bisect_right(self.rows, asteroid.y + ship.height),
+                         len(self.rows) - 1))
+        columns = range(
+            int((asteroid.x - ship.width - self.left) // SHIP_MOVEMENT) - 1,
+            int((asteroid.x + asteroid.width - self.left) //
+                SHIP_MOVEMENT) + 2)
+        for row in rows:
+            top = get_world_pos(0, self.rows[row])[1] - asteroid_top
+            for column in columns:
+                index = self.get_index(row, column)
+                if index is None or not self.free[row, index]:
+                    continue
+                left = get_world_pos(self.get_x(column), 0)[0] - \
+                    asteroid_left
+                if shape.overlap(ship.mask, (left, top)):
+                    blocked.setdefault(row, []).append(index)
+        if not blocked:
+            return (blocked, aimed)
+
+        # The laser covers the asteroid from far behind it
+        rows = range(bisect_right(self.rows, asteroid.y - asteroid.height +
+                                  laser_top),
+                     min(blocked) - SHOOTING_LEAD)
+        columns = range(
+            int((asteroid.x - laser_left - ship.laser_width - self.left) //
+                SHIP_MOVEMENT),
+            int((asteroid.x + asteroid.width - laser_left - self.left) //
+                SHIP_MOVEMENT) + 2)
+        for row in rows:
+            top = get_world_pos(0, self.rows[row])[1] - asteroid_top + \
+                laser_top
+            for column in columns:
+                index = self.get_index(row, column)
+                if index is None or not self.free[row, index]:
+                    continue
+                left = get_world_pos(self.get_x(column), 0)[0] - \
+                    asteroid_left + laser_left
+                if core.overlap(ship.laser_mask, (left, top)):
+                    aimed.setdefault(row, []).append(index)
+        return (blocked, aimed)
+
+    def get_detour(self, simulation, asteroid_cells):
+        """Returns the detour (see Detour) of the asteroids ahead of the
+        ship of the simulation or None if there are none. The cells where
+        the ship would touch an asteroid aren't free, and the asteroids
+        are shot from the cells where the charged laser hits them: the
+        way after them has the cells of these asteroids free (and the
+        laser is charged again for the next shot, see SHOTS_AHEAD). The
+        cells of the asteroids found before are given in the dict
+        asteroid_cells {asteroid: (blocked, aimed)}, the new ones are
+        added to it (see _get_asteroid_cells())."""
+        ship = simulation.ship
+        first = self.get_row(ship.y)
+        rate = self.get_charging_rate(first)
+        charged = max(first + int((ship.laser_left + CHARGE_MAX -
+                                   ship.charge) * rate), first)
+        asteroids = []
+        for asteroid in simulation.asteroids.items:
+            if asteroid not in asteroid_cells:
+                asteroid_cells[asteroid] = self._get_asteroid_cells(
+                    simulation, asteroid)
+            blocked, aimed = asteroid_cells[asteroid]
+            blocked = {row: indexes for row, indexes in blocked.items()
+                       if row >= first}
+            if blocked:
+                asteroids.append((blocked, {
+                    row: indexes for row, indexes in aimed.items()
+                    if row >= charged}))
+        if not asteroids:
+            return None
+
+        last = max(max(blocked) for blocked, aimed in asteroids)
+        # The numbers of the asteroids taking the cells
+        taken = np.zeros((last + 1 - first, self.free.shape[1]),
+                         dtype=np.int8)
+        for blocked, aimed in asteroids:
+            for row, indexes in blocked.items():
+                taken[row - first, indexes] += 1
+        free = self.free[first:last + 1] & (taken == 0)
+
+        # The cells aimed at the same asteroids (by their numbers)
+        targets = {}
+        for number, (blocked, aimed) in enumerate(asteroids):
+            for row, indexes in aimed.items():
+                for index in indexes:
+                    targets.setdefault((row, index), []).append(number)
+        groups = {}
+        for (row, index), numbers in targets.items():
+            groups.setdefault(tuple(numbers), {}).setdefault(
+                row, []).append(index)
+        # The groups by the last rows of their asteroids: a tuple (aimed,
+        # free) of the cells aimed at the asteroids and the free cells
+        # with the asteroids shot
+        shots = {}
+        for numbers, aimed in groups.items():
+            group_last = max(max(asteroids[number][0]) for number in numbers)
+            own = np.zeros((group_last + 1 - first, self.free.shape[1]),
+                           dtype=np.int8)
+            for number in numbers:
+                for row, indexes in asteroids[number][0].items():
+                    own[row - first, indexes] += 1
+            shots.setdefault(group_last, []).append((aimed, self.free[
+                first:group_last + 1] & (taken[:len(own)] == own)))
+
+        # The laser is charged again not farther than this number of the
+        # rows after a shot
+        recharge = int(np.ceil((ship.laser_frames + CHARGE_MAX) * rate))
+        # The costs of the next shots are the ones of the previous plan
+        aiming_cost = None
+        for shot in range(SHOTS_AHEAD):
+            cost, shooting, aiming_cost = self._get_detour_cost(
+                first, free, shots, aiming_cost, recharge)
+        return Detour(first, free, cost, shooting)
+
+    def _get_detour_cost(self, first, free, shots, next_aiming_cost,
+                         recharge):
+        """Returns a tuple (cost, shooting, aiming_cost) of the arrays of
+        the detour (see get_detour()) from its free cells and the costs
+        of the cells aimed at the asteroids for the next shot (or
+        None)."""
+        last = first + len(free) - 1
+        aiming_cost = np.full(free.shape, np.inf, dtype=np.float32)
+        cost = np.empty(free.shape, dtype=np.float32)
+        shooting = np.zeros(free.shape, dtype=bool)
+        next_free = self.free[last + 1]
+        next_cost = self.cost[last + 1]
+        for row in range(last, first - 1, -1):
+            index = row - first
+            for aimed, shot_free in shots.get(row, ()):
+                self._aim(first, last, aimed, shot_free, next_free,
+                          next_cost, aiming_cost, next_aiming_cost,
+                          recharge)
+            row_cost = np.minimum(
+                self._get_cost(row, free[index], next_free, next_cost),
+                self._get_stuck_cost(row, free[index], last))
+            row_aiming_cost = np.where(free[index], aiming_cost[index],
+                                       np.inf)
+            shooting[index] = row_aiming_cost < row_cost
+            cost[index] = np.minimum(row_cost, row_aiming_cost)
+            next_free = free[index]
+            next_cost = cost[index]
+        return (cost, shooting, aiming_cost)
+
+    def _get_stuck_cost(self, row, free, end):
+        """Returns the costs of getting stuck in the free cells of the
+        row of the detour ending with the row end (see STUCK_COST). The
+        dead ends of the track are left out."""
+        return np.where(free & (self.cost[row] != np.inf),
+                        STUCK_COST + end - row, np.inf)
+
+    def _aim(self, first, end, aimed, free, next_free, next_cost,
+             aiming_cost, next_aiming_cost, recharge):
+        """Sets the costs of the cells aimed at the asteroids in the
+        aiming_cost array of the detour from the row first to the row end
+        (see get_detour()). The free cells with the asteroids shot are
+        given up to their last row, the rows of the detour after it are
+        given too."""
+        for row in range(first + len(free) - 1, min(aimed) - 1, -1):
+            index = row - first
+            row_cost = np.minimum(
+                self._get_cost(row, free[index], next_free, next_cost),
+                self._get_stuck_cost(row, free[index], end))
+            if next_aiming_cost is not None and row >= max(aimed) + recharge:
+                row_cost = np.minimum(row_cost, np.where(
+                    free[index], next_aiming_cost[index], np.inf))
+            if row in aimed:
+                indexes = aimed[row]
+                aiming_cost[index, indexes] = np.minimum(
+                    aiming_cost[index, indexes],
+                    row_cost[indexes] + SHOOTING_COST)
+            next_free = free[index]
+            next_cost = row_cost
+
+    def get_control(self, ship, detour=None):
+        """Returns a tuple (x, braking, passable) with the ship's x to go
+        to, the number of the ticks to brake getting there (0 if the ship
+        doesn't have to brake), and False if the ship can't pass the
+        detour (if specified). Then, or if the detour has to be passed
+        shooting, the ship keeps out of the asteroids braking (if it can)
+        while the laser is being charged. Returns None if the ship is off
+        the plan."""
+        row = self.get_row(ship.y)
+        column = self.get_column(ship.x)
+        if self.get_index(row, column) is None:
+            return None
+
+        free = self._get_cells(row, detour)[0]
+        next_free, cost = self._get_cells(row + 1, detour)
+        plan_cost = self.cost[row + 1]
+        clearance = self.clearance[row + 1]
+        center = self.centers[min(row + LOOK_AHEAD, len(self.rows) - 1)]
+        targets = [(target, 0) for target in range(column - 1, column + 2)]
+        reach = self.get_braking_reach(row)
+        if reach:
+            ticks = self.get_braking_ticks(ship.y, row + 1)
+            for step in (-1, 1):
+                for target in range(column, column + step * (reach + 1),
+                                    step):
+                    # The ship braking is between the rows
+                    index = self.get_index(row, target)
+                    next_index = self.get_index(row + 1, target)
+                    if (index is None or next_index is None or
+                            not free[index] or not next_free[next_index]):
+                        break
+                    targets.append((target, ticks))
+
+        choices = []
+        for target, ticks in targets:
+            index = self.get_index(row + 1, target)
+            if index is not None and next_free[index]:
+                choices.append((cost[index] + (ticks > 0),
+                                plan_cost[index] + (ticks > 0),
+                                -clearance[index], abs(target - center),
+                                target, ticks))
+        if not choices:
+            return None
+        passable = min(choices)[0] < STUCK_COST
+        if reach and (not passable or ship.charge < CHARGE_MAX and
+                      detour is not None and detour.has_shots(row)):
+            # Braking gives the laser more time to be charged
+            choices = [choice for choice in choices if choice[5]] or choices
+        best = min(choices)
+        return (self.get_x(best[4]), best[5], passable)
+
+def get_track_plan(simulation):
+    """Returns the plan of the simulated level (it's built only once for
+    the level and the ship's speed)."""
+    ship = simulation.ship
+    key = (simulation.level, ship.speed, ship.acceleration)
+    if key not in track_plans:
+        track_plans[key] = TrackPlan(simulation)
+    return track_plans[key]
+
+class Autopilot():
+    """The object is a controller for LevelSimulation.run(): it's called
+    every tick with the simulation and sets the controls of its ship."""
+    def __init__(self):
+        # False if the ship couldn't reach the finish line by the plan
+        # (not counting the asteroids) when it was controlled last time
+        self.feasible = True
+        # Ticks left to brake and the x to go to braking (see
+        # TrackPlan.get_control())
+        self.braking_ticks = 0
+        self.braking_x = None
+        # The detour of the asteroids, the asteroids it was made for and
+        # False if the ship couldn't pass it last time
+        self.detour = None
+        self.asteroids = []
+        self.passable = True
+        # The cells of the asteroids (see TrackPlan.get_detour())
+        self.asteroid_cells = {}
+        # True if the laser was charged when the detour was made
+        self.charged = True
+
+    def __call__(self, simulation):
+        ship = simulation.ship
+        ship.moving_left = False
+        ship.moving_right = False
+        ship.moving_down = False
+        ship.shooting = False
+        if ship.status not in (STATUS_NORMAL, STATUS_RESTORING):
+            self.braking_ticks = 0
+            return
+
+        plan = get_track_plan(simulation)
+        # The detour is made again when the laser is charged (the shots
+        # were planned for the charging time the ship was expected to
+        # brake for)
+        if (simulation.asteroids.items != self.asteroids or
+                ship.charge == CHARGE_MAX and not self.charged):
+            self.asteroids = list(simulation.asteroids.items)
+            self.asteroid_cells = {
+                asteroid: cells
+                for asteroid, cells in self.asteroid_cells.items()
+                if asteroid in self.asteroids}
+            self.detour = plan.get_detour(simulation, self.asteroid_cells)
+            self.charged = ship.charge == CHARGE_MAX
+
+        self.feasible = plan.is_feasible(ship)
+        if self.braking_ticks == 0:
+            control = plan.get_control(ship, self.detour)
+            if control is None:
+                self.braking_x = ship.x
+                self.braking_ticks = int(plan.can_brake)
+                self.passable = False
+            else:
+                self.braking_x, self.braking_ticks, self.passable = control
+        ship.moving_down = self.braking_ticks > 0
+        if ship.moving_down:
+            self.braking_ticks -= 1
+        ship.moving_left = ship.x > self.braking_x + DEAD_ZONE
+        ship.moving_right = ship.x < self.braking_x - DEAD_ZONE
+
+        # Shoot if the laser hits an asteroid after the move and the
+        # detour has to be passed so (the laser is kept charged
+        # otherwise), or if it can't be passed at all
+        move_x = SHIP_MOVEMENT * (ship.moving_right - ship.moving_left)
+        move_y = ship.get_full_speed() - SHIP_MOVEMENT * ship.moving_down
+        laser_left, laser_top = ship.get_laser_pos()
+        row = plan.get_row(ship.y + move_y)
+        ship.shooting = bool(
+            (not self.passable or self.detour is not None and
+             self.detour.is_shooting(row, plan.get_index(
+                 row, plan.get_column(ship.x + move_x)))) and
+            simulation.asteroids.collide(
+                ship.laser_mask, laser_left + move_x,
+                laser_top - round(move_y), tick=simulation.tick + 1))
@@ -0,0 +1,303 @@
+"""Microbenchmarks of the hot paths of the game: reading maps, cropping
+tiles, track visibility and collisions, asteroids, stars, explosions
+and text rendering. Every benchmark runs without a window and sound
+device, with fixed screen size, seeded randomness and the garbage
+collector disabled. The number of calls is calibrated so that one
+measurement lasts at least MIN_MEASURE_TIME, and the best (minimum)
+time per call of several measurements is compared with the baseline.
+Usage:
+    bench.py [--filter=TEXT] [--repeat=N] [--tolerance=PERCENT]
+             [--baseline=FILENAME] [--save-baseline]
+Where:
+--filter - only the benchmarks with the text in their names are run;
+--repeat - number of measurements of every benchmark (7 by default);
+--tolerance - slowdown in percents against the baseline which counts
+as regression (20 by default);
+--baseline - file with the baseline results (bench_baseline.json by
+default);
+--save-baseline - the results are saved as the new baseline instead of
+comparing with it.
+The results are saved to bench_results.json. The exit status is 1 if
+any benchmark has regressed."""
+import os
+import sys
+
+# No window and sound device are needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import gc
+import json
+import platform
+import random
+import time
+from statistics import median
+
+import numpy as np
+import pygame
+import pygame.mask
+
+import font_registry
+from options import get_option
+from scaling import ASSET_SCALE
+from assets import load_image
+from image_crop import image_crop
+from map import map_read
+from view_point import ViewPoint
+from game_level import LEVELS
+from track import Track, TILE_FILES
+from asteroids import Asteroids
+from explosions import Explosions
+from stars import Stars, STAR_LIMIT
+from ship import SHIP_FILE
+from game_rules import get_world_pos
+from text_label import TextLabel
+from atlas_label import AtlasLabel
+from text_cache import get_text_cache
+from font_registry import TYPEFACE_3D
+
+RESULTS_FILENAME = 'bench_results.json'
+BASELINE_FILENAME = 'bench_baseline.json'
+
+BENCH_SCREEN_SIZE = (1024, 768)
+SEED = 1
+
+DEFAULT_REPEAT = 7
+DEFAULT_TOLERANCE = 20
+# Minimum duration of one measurement in seconds
+MIN_MEASURE_TIME = 0.1
+
+# Numbers of entities for the benchmarks of asteroids and explosions
+ASTEROID_COUNTS = (10, 100, 1000)
+EXPLOSION_COUNTS = (10, 100)
+
+TEXT_SIZE = 48
+TEXT = 'LEVEL COMPLETE'
+
+def measure(func, repeat=DEFAULT_REPEAT):
+    """Calls the function repeatedly and returns a dict with the number
+    of calls in one measurement and the minimum and median time of one
+    call in microseconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for i in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_MEASURE_TIME:
+            break
+        number *= 2 if elapsed * 4 >= MIN_MEASURE_TIME else 10
+
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number * 1000000)
+    return {'number': number, 'min': min(times), 'median': median(times)}
+
+def get_environment():
+    """Returns a dict describing the conditions of the benchmarks. The
+    results are comparable only under the same conditions."""
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'asset_scale': ASSET_SCALE,
+        'screen_size': list(BENCH_SCREEN_SIZE),
+        }
+
+def _add_asteroids(asteroids, scr, count):
+    """Fills the viewport with given number of asteroids."""
+    asteroids.items.clear()
+    view_pt = asteroids.view_pt
+    for i in range(count):
+        asteroids.add(
+            view_pt.scr_to_x(random.randint(0, scr.get_width())),
+            view_pt.scr_to_y(random.randint(0, scr.get_height())))
+
+def _add_explosions(explosions, scr, count):
+    """Fills the viewport with given number of explosions."""
+    explosions.items.empty()
+    view_pt = explosions.view_pt
+    for i in range(count):
+        explosions.add(
+            view_pt.scr_to_x(random.randint(0, scr.get_width())),
+            view_pt.scr_to_y(random.randint(0, scr.get_height())))
+
+def get_benchmarks(scr):
+    """Creates the game objects for the benchmarks and returns a list
+    of tuples (name, setup, func). Function setup prepares the objects
+    for func (if not None), and func is being timed."""
+    view_pt = ViewPoint(scr)
+    track = Track(scr, view_pt)
+    explosions = Explosions(scr, view_pt)
+    asteroids = Asteroids(scr, view_pt, explosions, track)
+    stars = Stars(scr, view_pt)
+    ship_mask = pygame.mask.from_surface(load_image(f'img/{SHIP_FILE}'))
+    ship_width, ship_height = ship_mask.get_size()
+    benchmarks = []
+
+    for level in LEVELS:
+        filename = f"map/{level['mapfile']}"
+        benchmarks.append((f"map_read/{level['mapfile']}", None,
+                           lambda filename=filename: map_read(filename)))
+
+    for filename in TILE_FILES:
+        image = load_image(f"img/tiles/{filename}")
+        benchmarks.append((f"image_crop/{filename}", None,
+                           lambda image=image: image_crop(image)))
+
+    for level in LEVELS:
+        tiles = map_read(f"map/{level['mapfile']}")['map']
+        benchmarks.append((f"track.set_tile_map/{level['mapfile']}", None,
+                           lambda tiles=tiles: track.set_tile_map(tiles)))
+
+    def setup_track():
+        track.set_tile_map(map_read(f"map/{LEVELS[0]['mapfile']}")['map'])
+        # The view point is in the middle of the track
+        view_pt.set_center(0, track.get_track_height() / 2)
+        track.update()
+
+    # The ship is in the middle of the track or on its left border
+    setup_track()
+    x_left, x_right = track.get_track_borders(view_pt.y)
+    miss_pos = get_world_pos((x_left + x_right - ship_width) / 2,
+                             view_pt.y + ship_height / 2)
+    hit_pos = get_world_pos(x_left - ship_width / 2,
+                            view_pt.y + ship_height / 2)
+
+    benchmarks.append(('track._get_visible_tiles', setup_track,
+                       track._get_visible_tiles))
+    benchmarks.append(('track.collide/miss', setup_track,
+                       lambda: track.collide(ship_mask, *miss_pos)))
+    benchmarks.append(('track.collide/hit', setup_track,
+                       lambda: track.collide(ship_mask, *hit_pos)))
+
+    # The ship is out of the viewport, so every asteroid is checked
+    outside_pos = get_world_pos(view_pt.x, view_pt.y + scr.get_height())
+    for count in ASTEROID_COUNTS:
+        setup = lambda count=count: _add_asteroids(asteroids, scr, count)
+        benchmarks.append((f"asteroids.update/{count}", setup,
+                           asteroids.update))
+        benchmarks.append((f"asteroids.collide/{count}", setup,
+                           lambda: asteroids.collide(ship_mask,
+                                                     *outside_pos)))
+
+    def setup_stars():
+        view_pt.reset()
+        stars.rng = np.random.default_rng(SEED)
+        stars.set_limit(STAR_LIMIT)
+        stars.respawn()
+
+    benchmarks.append(('stars.update', setup_stars, stars.update))
+    benchmarks.append(('stars.draw', setup_stars, stars.draw))
+
+    for count in EXPLOSION_COUNTS:
+        setup = lambda count=count: _add_explosions(explosions, scr, count)
+        benchmarks.append((f"explosions.update/{count}", setup,
+                           explosions.update))
+        benchmarks.append((f"explosions.draw/{count}", setup,
+                           explosions.draw))
+
+    text_label = TextLabel(scr, size=TEXT_SIZE, typeface=TYPEFACE_3D)
+    text_cache = get_text_cache()
+
+    def render_uncached():
+        text_cache.clear()
+        text_label._render()
+
+    atlas_label = AtlasLabel(scr, size=TEXT_SIZE)
+    counter = iter(range(sys.maxsize))
+    benchmarks.append(('text/cached', lambda: text_label.set_text(TEXT),
+                       text_label._render))
+    benchmarks.append(('text/uncached', lambda: text_label.set_text(TEXT),
+                       render_uncached))
+    benchmarks.append(('text/atlas_counter', None,
+                       lambda: atlas_label.set_text(str(next(counter)))))
+    return benchmarks
+
+def run(name_filter=None, repeat=DEFAULT_REPEAT):
+    """Runs the benchmarks and returns a dict in format:
+    {'environment': {...}, 'results': {name: {'number', 'min',
+    'median'},...}}"""
+    pygame.init()
+    scr = pygame.display.set_mode(BENCH_SCREEN_SIZE)
+    font_registry.init()
+    random.seed(SEED)
+    results = {}
+    for name, setup, func in get_benchmarks(scr):
+        if name_filter is not None and name_filter not in name:
+            continue
+        random.seed(SEED)
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            results[name] = measure(func, repeat)
+        finally:
+            gc.enable()
+        print(f"{name:<40} {results[name]['min']:>12.1f} us "
+              f"(median {results[name]['median']:.1f} us, "
+              f"{results[name]['number']} calls)")
+    pygame.quit()
+    return {'environment': get_environment(), 'results': results}
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compares the results with the baseline (dicts in the format
+    returned by run()). Prints the differences and returns a list of
+    names of the benchmarks being slower than the baseline by more
+    than tolerance percents."""
+    if current['environment'] != baseline['environment']:
+        print("Warning: the baseline was measured under other conditions:")
+        for key, value in baseline['environment'].items():
+            if current['environment'].get(key) != value:
+                print(f"    {key}: {value} "
+                      f"(now {current['environment'].get(key)})")
+
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:<40} new")
+            continue
+        change = (result['min'] / base['min'] - 1) * 100
+        mark = ''
+        if change > tolerance:
+            mark = ' REGRESSION'
+            regressions.append(name)
+        print(f"{name:<40} {base['min']:>12.1f} -> {result['min']:>12.1f} us "
+              f"({change:+.1f}%){mark}")
+    return regressions
+
+
+if __name__ == '__main__':
+    results = run(get_option('--filter'),
+                  int(get_option('--repeat', DEFAULT_REPEAT)))
+    baseline_filename = get_option('--baseline', BASELINE_FILENAME)
+    with open(RESULTS_FILENAME, 'w') as f:
+        json.dump(results, f, indent=4)
+
+    if '--save-baseline' in sys.argv:
+        with open(baseline_filename, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline is saved to {baseline_filename}")
+        sys.exit(0)
+
+    try:
+        with open(baseline_filename) as f:
+            baseline = json.load(f)
+    except OSError:
+        print(f"No baseline {baseline_filename}, use --save-baseline key "
+              f"to create it")
+        sys.exit(0)
+
+    tolerance = float(get_option('--tolerance', DEFAULT_TOLERANCE))
+    regressions = compare(results, baseline, tolerance)
+    if regressions:
+        print(f"FAILED: {len(regressions)} benchmarks are slower than the "
+              f"baseline by more than {tolerance:g}%")
+        sys.exit(1)
+    print("PASSED")
@@ -1,37 +1,79 @@
-"""Module introduces BlinkingLabel class which can render blinking
-on-screen text."""
-import pygame
-
-from text_label import DEFAULT_COLOR, DEFAULT_SIZE, TYPEFACE_NORMAL
-from animated_label import AnimatedLabel
-
-class BlinkingLabel(AnimatedLabel):
-    """This type of label implements blinking animation effect. The text
-    slowly changes its color - one time or in the loop."""
-    def __init__(self, scr, text='', color=DEFAULT_COLOR, size=DEFAULT_SIZE,
-                 typeface=TYPEFACE_NORMAL, second_color=DEFAULT_COLOR):
-        """Input parameters:
-        color, second_color - colors of the text for performing blinking
-        effect (list or tuple [r, g, b]).
-        The scheme of color changing for one period of animation:
-
-        color  ========>  second_color  ========> color
-          |--------------------+--------------------|
-          0             max_progress/2        max_progress
-
-        (Other parameters are the same as for TextLabel)."""
-        super().__init__(scr, text, color, size, typeface)
-        self.first_color = tuple(self.color)
-        self.second_color = second_color
-
-    def update(self):
-        """Updates the color of the text label."""
-        if not self.finished:
-            # fraction vary like this [0..1..0] during one period of animation
-            fraction = 1 - 2*abs(self.progress/self.max_progress - 0.5)
-            for i in range(0, len(self.color)):
-                self.color[i] = int(self.first_color[i] + (self.second_color[i]
-                                    - self.first_color[i]) * fraction)
-            self._render()
-
-        super().update()
+"""Module introduces BlinkingLabel class which can render blinking
+on-screen text."""
+import pygame
+
+from text_label import DEFAULT_COLOR, DEFAULT_SIZE, TYPEFACE_NORMAL
+from animated_label import AnimatedLabel, RAMP_TRIANGLE, get_ramp
+
+# Number of distinct colors between color and second_color. It limits
+# the number of baked frames for the animation.
+COLOR_LEVELS = 16
+
+class BlinkingLabel(AnimatedLabel):
+    """This type of label implements blinking animation effect. The text
+    slowly changes its color - one time or in the loop."""
+    def __init__(self, scr, text='', color=DEFAULT_COLOR, size=DEFAULT_SIZE,
+                 typeface=TYPEFACE_NORMAL, second_color=DEFAULT_COLOR):
+        """Input parameters:
+        color, second_color - colors of the text for performing blinking
+        effect (list or tuple [r, g, b]).
+        The scheme of color changing for one period of animation:
+
+        color  ========>  second_color  ========> color
+          |--------------------+--------------------|
+          0             max_progress/2        max_progress
+
+        (Other parameters are the same as for TextLabel)."""
+        super().__init__(scr, text, color, size, typeface)
+        self.first_color = tuple(self.color)
+        self.second_color = second_color
+
+    def _get_color(self, fraction):
+        color = []
+        for i in range(0, len(self.first_color)):
+            color.append(int(self.first_color[i] + (self.second_color[i]
+                             - self.first_color[i]) * fraction))
+        return color
+
+    def bake(self):
+        """Renders all the frames of color changing beforehand."""
+        color = self.color
+        for fraction in get_ramp(self.max_progress, self.speed,
+                                 RAMP_TRIANGLE, COLOR_LEVELS):
+            self.color = self._get_color(fraction)
+            self._render_frame(tuple(self.color))
+        self.color = color
+        self._render_frame(tuple(self.color))
+
+    def get_frames_to_change(self):
+        """Returns the number of updates after which the color of the
+        label changes or None if it doesn't change any more. Slow
+        blinking keeps each of COLOR_LEVELS colors for several
+        updates."""
+        if self.finished:
+            return None
+        ramp_length = len(get_ramp(self.max_progress, self.speed,
+                                   RAMP_TRIANGLE, COLOR_LEVELS))
+        progress = self.progress
+        # Each update shows the color for the progress before increment
+        for frames in range(1, ramp_length + 1):
+            fraction = self._get_fraction(RAMP_TRIANGLE, COLOR_LEVELS,
+                                          progress)
+            if self._get_color(fraction) != self.color:
+                return frames
+            progress += self.speed
+            if progress > self.max_progress:
+                if not self.repeat:
+                    return None
+                progress = 0
+        return 1
+
+    def update(self):
+        """Updates the color of the text label."""
+        if not self.finished:
+            # fraction vary like this [0..1..0] during one period of animation
+            fraction = self._get_fraction(RAMP_TRIANGLE, COLOR_LEVELS)
+            self.color = self._get_color(fraction)
+            self._render_frame(tuple(self.color))
+
+        super().update()
@@ -0,0 +1,164 @@
+"""Module for loading bitmasks of the game objects without loading their
+images (see simulation.py). The masks are built from the images only
+once: the result is stored on disk in the variants directory beside the
+scaled images and is loaded from there next time. The masks are built
+anew if any source image is newer. Don't create CollisionMasks objects
+manually, use get_collision_masks() function instead.
+
+Mask file is NumPy .npz archive where every mask is stored as an array
+of bits packed by rows, and 'meta' item keeps JSON with tile offsets
+and frame sizes."""
+import json
+import os
+
+import numpy as np
+import pygame
+import pygame.image
+import pygame.mask
+import pygame.surfarray
+
+from assets import BASE_DIR, get_asset_mtime, load_frame_masks
+from asset_variants import VARIANTS_DIR, get_asset_variants
+from scaling import ASSET_SCALE
+from track import TILE_FILES
+from asteroids import ASTEROID_FILES
+from asteroids import FRAME_COLS as ASTEROID_FRAME_COLS
+from asteroids import FRAME_ROWS as ASTEROID_FRAME_ROWS
+from ship import SHIP_FILE
+from laser import LASER_FILE, LASER_FRAME_COLS, LASER_FRAME_ROWS
+
+MASK_FILENAME = 'masks.npz'
+
+collision_masks = None
+
+def mask_to_bits(mask):
+    """Returns 2-d array of the mask bits packed by rows."""
+    surface = mask.to_surface(setcolor=(255, 255, 255, 255),
+                              unsetcolor=(0, 0, 0, 0))
+    return np.packbits(pygame.surfarray.array_alpha(surface).T > 0, axis=1)
+
+def bits_to_mask(bits, width):
+    """Returns pygame.mask.Mask with given width built from the packed
+    bits (see mask_to_bits())."""
+    bits = np.unpackbits(bits, axis=1, count=width)
+    pixels = np.zeros(bits.shape + (4,), dtype=np.uint8)
+    pixels[:, :, 3] = bits * 255
+    image = pygame.image.frombuffer(pixels.tobytes(),
+                                    (width, bits.shape[0]), 'RGBA')
+    return pygame.mask.from_surface(image)
+
+class CollisionMasks():
+    """The class keeps the masks of the game objects:
+    tiles - list of dicts {'mask', 'offset_x', 'offset_y'} in the order
+    of TILE_FILES (offsets are the ones of cropped tiles);
+    asteroids - list of lists of frame masks in the order of
+    ASTEROID_FILES;
+    ship - mask of the ship;
+    laser - mask of the laser (the first animation frame)."""
+    def __init__(self, scale=ASSET_SCALE, directory=VARIANTS_DIR):
+        """Input parameters:
+        scale - scale factor of the images (see AssetVariants);
+        directory - directory for the mask file (relative to the game
+        directory)."""
+        self.filename = os.path.join(BASE_DIR, directory, f"{scale:g}",
+                                     MASK_FILENAME)
+        self.built = False
+        if not self._read():
+            self._build()
+            self._write()
+
+    def _get_paths(self):
+        return ([f"img/tiles/{filename}" for filename in TILE_FILES] +
+                [f"img/{filename}" for filename in ASTEROID_FILES] +
+                [f"img/{SHIP_FILE}", f"img/{LASER_FILE}"])
+
+    def _read(self):
+        """Loads the masks from the file. Returns False if there is no
+        up-to-date file."""
+        try:
+            mtime = os.path.getmtime(self.filename)
+            if any(mtime < get_asset_mtime(path)
+                   for path in self._get_paths()):
+                return False
+            with np.load(self.filename) as data:
+                meta = json.loads(str(data['meta']))
+                self.tiles = [
+                    {'mask': bits_to_mask(data[f"tile_{i}"], width),
+                     'offset_x': offset_x, 'offset_y': offset_y}
+                    for i, (width, offset_x, offset_y)
+                    in enumerate(meta['tiles'])]
+                self.asteroids = [
+                    [bits_to_mask(data[f"asteroid_{i}_{frame}"], width)
+                     for frame in range(frames)]
+                    for i, (width, frames) in enumerate(meta['asteroids'])]
+                self.ship = bits_to_mask(data['ship'], meta['ship'])
+                self.laser = bits_to_mask(data['laser'], meta['laser'])
+        except (OSError, KeyError, ValueError):
+            return False
+        return True
+
+    def _build(self):
+        """Builds the masks from the images scaled as in the game."""
+        self.built = True
+        variants = get_asset_variants()
+        self.tiles = []
+        for filename in TILE_FILES:
+            crop_result = variants.get_cropped_image(f"img/tiles/{filename}")
+            self.tiles.append({
+                'mask': pygame.mask.from_surface(crop_result['image']),
+                'offset_x': crop_result['offset_x'],
+                'offset_y': crop_result['offset_y']})
+        self.asteroids = []
+        for filename in ASTEROID_FILES:
+            path = f"img/{filename}"
+            self.asteroids.append(load_frame_masks(
+                path, variants.get_image(path, ASTEROID_FRAME_COLS,
+                                         ASTEROID_FRAME_ROWS),
+                ASTEROID_FRAME_COLS, ASTEROID_FRAME_ROWS))
+        self.ship = pygame.mask.from_surface(
+            variants.get_image(f"img/{SHIP_FILE}"))
+        path = f"img/{LASER_FILE}"
+        self.laser = load_frame_masks(
+            path, variants.get_image(path, LASER_FRAME_COLS,
+                                     LASER_FRAME_ROWS),
+            LASER_FRAME_COLS, LASER_FRAME_ROWS)[0]
+
+    def _write(self):
+        """Stores the masks. Simulation still works if they can't be
+        stored, they are just built again next time."""
+        arrays = {}
+        meta = {'tiles': [], 'asteroids': []}
+        for i, tile in enumerate(self.tiles):
+            arrays[f"tile_{i}"] = mask_to_bits(tile['mask'])
+            meta['tiles'].append((tile['mask'].get_size()[0],
+                                  tile['offset_x'], tile['offset_y']))
+        for i, frames in enumerate(self.asteroids):
+            for frame, mask in enumerate(frames):
+                arrays[f"asteroid_{i}_{frame}"] = mask_to_bits(mask)
+            meta['asteroids'].append((frames[0].get_size()[0], len(frames)))
+        arrays['ship'] = mask_to_bits(self.ship)
+        meta['ship'] = self.ship.get_size()[0]
+        arrays['laser'] = mask_to_bits(self.laser)
+        meta['laser'] = self.laser.get_size()[0]
+
+        tmp_filename = f"{self.filename}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            with open(tmp_filename, 'wb') as f:
+                np.savez_compressed(f, meta=json.dumps(meta), **arrays)
+            os.replace(tmp_filename, self.filename)
+        except OSError as e:
+            print(f"Can't save collision masks {self.filename}: {e}")
+
+
+def init(scale=ASSET_SCALE):
+    """Initializes CollisionMasks instance for further using."""
+    global collision_masks
+    collision_masks = CollisionMasks(scale)
+
+def get_collision_masks():
+    """Returns CollisionMasks singleton."""
+    global collision_masks
+    if collision_masks == None:
+        init()
+    return collision_masks
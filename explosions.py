@@ -1,63 +1,101 @@
-"""Module for drawing and keeping explosion animations."""
-from random import randint
-
-import pygame
-from pygame.sprite import Group
-
-from animated_sprite import AnimatedSprite
-
-# Parameters of explosion animation images
-FRAME_COLS = 8
-FRAME_ROWS = 8
-
-# The first file (index 0) is the smallest explosion
-EXPLOSION_FILES = (
-    'explosion_1.png',
-    'explosion_2.png',
-    'explosion_3.png',
-    'explosion_4.png',
-    )
-
-SMALL_EXPLOSION_IND = 0
-BLAST_EXPLOSION_IND = 1
-BIG_EXPLOSION_IND = 2
-DOUBLE_EXPLOSION_IND = 3
-
-class Explosions():
-    def __init__(self, scr, view_point):
-        """Input parameters:
-        scr - Surface for drawing;
-        view_point - ViewPoint class instance."""
-        self.scr = scr
-        self.view_pt = view_point
-        self.images = []
-        for filename in EXPLOSION_FILES:
-            self.images.append(pygame.image.load(f"img/{filename}"))
-        self.items = pygame.sprite.Group()
-
-    def add(self, center_x, center_y, explosion_ind=None):
-        """Adds new explosion animation.
-        Input parameters:
-        center_x, center_y - absolute center coordinates of animation;
-        explosion_ind - index of an animation in the list; if None then
-        the animation is selected randomly (except small explosion)."""
-        if explosion_ind == None:
-            explosion_ind = randint(BLAST_EXPLOSION_IND, DOUBLE_EXPLOSION_IND)
-        explosion = AnimatedSprite(self.images[explosion_ind], self.scr,
-                                   self.view_pt, FRAME_COLS, FRAME_ROWS)
-        explosion.set_center(center_x, center_y)
-        explosion.repeat = False
-        self.items.add(explosion)
-
-    def update(self):
-        """Updates screen positions of the animations and removes the
-        finished ones."""
-        for explosion in self.items.sprites()[:]:
-            if explosion.stopped:
-                self.items.remove(explosion)
-        self.items.update()
-
-    def draw(self):
-        for explosion in self.items.sprites():
-            explosion.draw()
-            explosion.next_frame()
+"""Module for drawing and keeping explosion animations."""
+import math
+from random import randint
+
+import pygame
+from pygame.sprite import Group
+
+from asset_variants import get_asset_variants
+from memory_registry import get_memory_registry
+from scaling import scaled
+from animated_sprite import AnimatedSprite
+
+# Parameters of explosion animation images
+FRAME_COLS = 8
+FRAME_ROWS = 8
+
+# The first file (index 0) is the smallest explosion
+EXPLOSION_FILES = (
+    'explosion_1.png',
+    'explosion_2.png',
+    'explosion_3.png',
+    'explosion_4.png',
+    )
+
+SMALL_EXPLOSION_IND = 0
+BLAST_EXPLOSION_IND = 1
+BIG_EXPLOSION_IND = 2
+DOUBLE_EXPLOSION_IND = 3
+
+# Explosions farther than this distance from the view point are out
+# of player's focus (see Explosions.set_quality())
+FOCUS_RADIUS = scaled(256)
+# Animation speed of the explosions out of focus while frame skipping
+FRAME_SKIP_SPEED = 2
+
+class Explosions():
+    def __init__(self, scr, view_point):
+        """Input parameters:
+        scr - Surface for drawing;
+        view_point - ViewPoint class instance."""
+        self.scr = scr
+        self.view_pt = view_point
+        self.images = []
+        # Half-sized animations for reduced quality
+        self.small_images = []
+        registry = get_memory_registry()
+        for filename in EXPLOSION_FILES:
+            image = registry.register('explosions', get_asset_variants(
+                ).get_image(f"img/{filename}", FRAME_COLS,
+                            FRAME_ROWS).convert_alpha())
+            self.images.append(image)
+            self.small_images.append(registry.register(
+                'explosions', pygame.transform.scale(
+                    image, (image.get_width() // 2, image.get_height() // 2))))
+        self.small = False
+        self.frame_skip = False
+        self.items = pygame.sprite.Group()
+
+    def set_quality(self, small=False, frame_skip=False):
+        """Sets quality of new explosions.
+        Input parameters:
+        small - if True then half-sized animations are used;
+        frame_skip - if True then every second animation frame is
+        skipped for the explosions out of player's focus."""
+        self.small = small
+        self.frame_skip = frame_skip
+
+    def add(self, center_x, center_y, explosion_ind=None):
+        """Adds new explosion animation.
+        Input parameters:
+        center_x, center_y - absolute center coordinates of animation;
+        explosion_ind - index of an animation in the list; if None then
+        the animation is selected randomly (except small explosion)."""
+        if explosion_ind == None:
+            explosion_ind = randint(BLAST_EXPLOSION_IND, DOUBLE_EXPLOSION_IND)
+        if self.small:
+            image = self.small_images[explosion_ind]
+        else:
+            image = self.images[explosion_ind]
+        explosion = AnimatedSprite(image, self.scr, self.view_pt,
+                                   FRAME_COLS, FRAME_ROWS)
+        explosion.set_center(center_x, center_y)
+        explosion.repeat = False
+        if self.frame_skip and (math.hypot(center_x - self.view_pt.x,
+                                           center_y - self.view_pt.y)
+                                > FOCUS_RADIUS):
+            explosion.set_speed(FRAME_SKIP_SPEED)
+        self.items.add(explosion)
+
+    def update(self):
+        """Updates screen positions of the animations and removes the
+        finished ones and the ones left below the screen."""
+        for explosion in self.items.sprites():
+            if explosion.stopped or explosion.below_screen():
+                self.items.remove(explosion)
+        self.items.update()
+
+    def draw(self):
+        """Draws the animations being on the screen."""
+        for explosion in self.items.sprites():
+            explosion.draw()
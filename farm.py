@@ -0,0 +1,165 @@
+"""Farm of level simulations. Every level of LEVELS table is played with
+a number of seeds by the autopilot (see Autopilot) in the renderless
+level simulation (see LevelSimulation), the runs are spread across a
+pool of processes. The results are merged into farm_report.json: for
+every level - completion rate, deaths, collision points and the cost of
+the simulated frames; and the statistics of every run. The collisions
+with the track (and leaving it) where the autopilot could reach the
+finish line by its plan (see TrackPlan) are counted apart as 'autopilot'
+ones: the deaths caused by the autopilot, not by the level. The frame
+cost is the time of the simulation step only (no rendering, see
+stress.py for that) and is comparable between the reports made with the
+same number of processes on the same machine. Usage:
+    farm.py [--levels=N[,N...]] [--seeds=N] [--first-seed=N]
+            [--processes=N] [--max-ticks=N]
+Where:
+--levels - numbers of the levels to play (all by default);
+--seeds - number of seeds (runs) for every level (16 by default);
+--first-seed - the first seed, the seeds go in a row from it (0 by
+default);
+--processes - number of processes (the number of CPUs by default);
+--max-ticks - the run is stopped with 'timeout' result after this number
+of ticks (10 minutes of the game by default)."""
+import json
+import os
+import time
+from multiprocessing import Pool
+from statistics import mean
+
+import numpy as np
+
+from options import get_option
+from game_level import LEVELS
+from collision_masks import get_collision_masks
+from simulation import LevelSimulation, MAX_TICKS, RESULT_FINISHED
+from simulation import COLLISION_TRACK, COLLISION_ASTEROID, COLLISION_PENALTY
+from autopilot import Autopilot
+
+FARM_REPORT_FILENAME = 'farm_report.json'
+DEFAULT_SEEDS = 16
+# Key marking the collisions with the track (and leaving it) caused by
+# the autopilot: it could reach the finish line by its plan then
+COLLISION_AUTOPILOT = 'autopilot'
+
+def run_level(task):
+    """Plays single level by the autopilot. Parameter task is a tuple
+    (level, seed, max_ticks) where level is the index in LEVELS table.
+    Returns the statistics of the run (see LevelSimulation.get_result())
+    with seed, wall time of the run in seconds, the peak number of the
+    asteroids and frame cost in microseconds added. The collisions are
+    marked by 'autopilot' key (see COLLISION_AUTOPILOT)."""
+    level, seed, max_ticks = task
+    start = time.perf_counter()
+    simulation = LevelSimulation(level, seed)
+    autopilot = Autopilot()
+    frame_times = []
+    asteroids_max = 0
+    collisions = 0
+    while simulation.result is None and simulation.tick < max_ticks:
+        autopilot(simulation)
+        frame_start = time.perf_counter()
+        simulation.step()
+        frame_times.append(time.perf_counter() - frame_start)
+        for collision in simulation.collisions[collisions:]:
+            collision[COLLISION_AUTOPILOT] = (
+                collision['kind'] != COLLISION_ASTEROID and
+                autopilot.feasible)
+        collisions = len(simulation.collisions)
+        asteroids_max = max(asteroids_max, len(simulation.asteroids.items))
+
+    result = simulation.get_result()
+    result['seed'] = seed
+    result['time'] = time.perf_counter() - start
+    result['asteroids_max'] = asteroids_max
+    frame_times = np.array(frame_times) * 1e6
+    result['frame'] = {'mean': float(frame_times.mean()),
+                       'p95': float(np.percentile(frame_times, 95)),
+                       'max': float(frame_times.max())}
+    return result
+
+def merge_level(runs):
+    """Returns a dict with the statistics of the level merged from the
+    results of its runs (see run_level())."""
+    ticks = sum(run['ticks'] for run in runs)
+    collisions = [dict(collision, seed=run['seed'])
+                  for run in runs for collision in run['collisions']]
+    return {
+        'runs': len(runs),
+        'completion_rate': (sum(run['result'] == RESULT_FINISHED
+                                for run in runs) / len(runs)),
+        'deaths': {'mean': mean(run['deaths'] for run in runs),
+                   'max': max(run['deaths'] for run in runs)},
+        'progress': mean(run['progress'] for run in runs),
+        'ticks': mean(run['ticks'] for run in runs),
+        'score': mean(run['score'] for run in runs),
+        'asteroids_max': max(run['asteroids_max'] for run in runs),
+        'frame': {
+            'mean': sum(run['frame']['mean'] * run['ticks']
+                        for run in runs) / ticks,
+            'worst_p95': max(run['frame']['p95'] for run in runs),
+            'max': max(run['frame']['max'] for run in runs)},
+        'collision_counts': {
+            kind: sum(collision['kind'] == kind for collision in collisions)
+            for kind in (COLLISION_TRACK, COLLISION_ASTEROID,
+                         COLLISION_PENALTY)},
+        'autopilot_deaths': sum(collision[COLLISION_AUTOPILOT]
+                                for collision in collisions),
+        'collisions': collisions,
+        }
+
+def farm(levels=None, seeds=range(DEFAULT_SEEDS), processes=None,
+         max_ticks=MAX_TICKS, filename=FARM_REPORT_FILENAME):
+    """Plays the levels (indexes in LEVELS table, all if None) with the
+    seeds across the pool of processes and saves the report."""
+    if levels is None:
+        levels = range(len(LEVELS))
+    # The masks are built (if needed) before the processes start, so
+    # they don't build them simultaneously
+    get_collision_masks()
+    tasks = [(level, seed, max_ticks) for level in levels for seed in seeds]
+    start = time.perf_counter()
+    with Pool(processes) as pool:
+        runs = list(pool.imap_unordered(run_level, tasks))
+    wall_time = time.perf_counter() - start
+    runs.sort(key=lambda run: (run['level'], run['seed']))
+
+    report = {'seeds': list(seeds), 'max_ticks': max_ticks,
+              'processes': processes or os.cpu_count(),
+              'wall_time': wall_time,
+              'ticks': sum(run['ticks'] for run in runs),
+              'levels': {}, 'runs': runs}
+    for level in levels:
+        level_runs = [run for run in runs if run['level'] == level + 1]
+        merged = merge_level(level_runs)
+        report['levels'][level + 1] = merged
+        counts = ', '.join(f"{kind} {count}" for kind, count
+                           in merged['collision_counts'].items())
+        print(f"level {level + 1}: completion "
+              f"{merged['completion_rate']:.0%}, deaths "
+              f"{merged['deaths']['mean']:.1f} "
+              f"(max {merged['deaths']['max']}), progress "
+              f"{merged['progress']:.0%}; frame "
+              f"{merged['frame']['mean']:.0f} us "
+              f"(p95 {merged['frame']['worst_p95']:.0f}, "
+              f"max {merged['frame']['max']:.0f}); collisions: {counts} "
+              f"(autopilot {merged['autopilot_deaths']})")
+    run_time = sum(run['time'] for run in runs)
+    print(f"{len(runs)} runs, {report['ticks']} ticks in "
+          f"{wall_time:.1f} s ({report['ticks'] / wall_time:.0f} ticks/s, "
+          f"{run_time / wall_time:.1f}x of serial)")
+
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=4)
+    return report
+
+
+if __name__ == '__main__':
+    levels = get_option('--levels')
+    first_seed = int(get_option('--first-seed', 0))
+    processes = get_option('--processes')
+    farm(levels=([int(level) - 1 for level in levels.split(',')]
+                 if levels else None),
+         seeds=range(first_seed,
+                     first_seed + int(get_option('--seeds', DEFAULT_SEEDS))),
+         processes=int(processes) if processes else None,
+         max_ticks=int(get_option('--max-ticks', MAX_TICKS)))
@@ -0,0 +1,73 @@
+"""Module for sharing font objects. It encapsulates FontRegistry class
+and its only instance - font_registry. Don't create FontRegistry objects
+manually, use get_font_registry() function instead."""
+from assets import load_font
+from scaling import scaled
+
+FONT_FILENAMES = ('Suggested.ttf', 'Suggested3D.ttf')
+# Typefaces are actually indexes for FONT_FILENAMES list
+TYPEFACE_NORMAL = 0
+TYPEFACE_3D = 1
+
+# Fonts loaded beforehand: [(typeface, size),...]. Sizes are scaled the
+# same way as the font sizes of the labels, so they are hits
+PRELOAD_FONTS = (
+    (TYPEFACE_NORMAL, scaled(24)),
+    (TYPEFACE_NORMAL, scaled(32)),
+    (TYPEFACE_NORMAL, scaled(48)),
+    (TYPEFACE_NORMAL, scaled(92)),
+    (TYPEFACE_3D, scaled(192)),
+    )
+
+font_registry = None
+
+class FontRegistry():
+    """The class keeps pygame.font.Font objects keyed by typeface and
+    size, so each font file is opened and parsed only once for every
+    size. It also counts requests for already loaded fonts (hits) and
+    for new ones (misses)."""
+    def __init__(self, preload=PRELOAD_FONTS):
+        """Input parameters:
+        preload - list of fonts to be loaded at once
+        in format: [(typeface, size),...]."""
+        self.fonts = {}
+        self.hits = 0
+        self.misses = 0
+        for typeface, size in preload:
+            self._load(typeface, size)
+
+    def _load(self, typeface, size):
+        filename = FONT_FILENAMES[typeface]
+        font = load_font(f'fnt/{filename}', size)
+        self.fonts[(typeface, size)] = font
+        return font
+
+    def get_font(self, typeface, size):
+        """Returns shared pygame.font.Font object for given typeface
+        (index in FONT_FILENAMES list) and size."""
+        font = self.fonts.get((typeface, size))
+        if font:
+            self.hits += 1
+            return font
+
+        self.misses += 1
+        return self._load(typeface, size)
+
+    def get_stats(self):
+        """Returns a dict with the number of loaded fonts, hits and
+        misses."""
+        return {'fonts': len(self.fonts), 'hits': self.hits,
+                'misses': self.misses}
+
+
+def init(preload=PRELOAD_FONTS):
+    """Initializes FontRegistry instance for further using."""
+    global font_registry
+    font_registry = FontRegistry(preload)
+
+def get_font_registry():
+    """Returns FontRegistry singleton."""
+    global font_registry
+    if font_registry == None:
+        init()
+    return font_registry
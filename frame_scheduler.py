@@ -0,0 +1,78 @@
+"""Module for pacing the main loop. It skips redrawing frames which
+look exactly like the previous ones and lets the process sleep while
+nothing on the screen can change without user input or until the next
+change of a settled screen (with blinking text only, for example)."""
+import pygame
+from pygame.time import Clock
+
+DEFAULT_FRAMERATE = 60
+# Maximum time in milliseconds for blocking while the game is idle
+IDLE_TIMEOUT = 500
+
+class FrameScheduler():
+    """The class keeps the signature of the last drawn frame. The
+    signature is any value describing everything visible on the screen,
+    so equal signatures mean equal frames. The frame with unknown
+    signature (None) is always redrawn."""
+    def __init__(self, framerate=DEFAULT_FRAMERATE, idle_timeout=IDLE_TIMEOUT):
+        """Input parameters:
+        framerate - maximum frames per second while the game is active;
+        idle_timeout - maximum time in milliseconds for waiting
+        for events while the game is idle."""
+        self.clock = Clock()
+        self.framerate = framerate
+        self.idle_timeout = idle_timeout
+        self.signature = None
+        # False, True or the number of frames (see need_redraw())
+        self.idle = False
+
+    def tick(self):
+        """Waits for the next frame and returns the number of frames
+        elapsed since the previous one. If the game is idle then blocks
+        until any event arrives or idle timeout expires (or the settled
+        screen is about to change), and the game must catch up with
+        the frames elapsed."""
+        if self.idle:
+            timeout = self.idle_timeout
+            if self.idle is not True:
+                timeout = min(timeout,
+                              round(self.idle * 1000 / self.framerate))
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                # The event must be processed by the main loop as usual
+                pygame.event.post(event)
+            return max(round(self.clock.tick() * self.framerate / 1000), 1)
+
+        self.clock.tick(self.framerate)
+        return 1
+
+    def need_redraw(self, signature, static=False):
+        """Returns True if the frame with given signature differs from
+        the last drawn one and False otherwise.
+        Input parameters:
+        signature - value describing the frame or None if unknown;
+        static - True if the frame can't change without user input or
+        the number of frames after which it changes by itself (settled
+        screens with endless animations); such unchanged frame makes
+        the game idle."""
+        if signature is None or signature != self.signature:
+            self.signature = signature
+            self.idle = False
+            return True
+
+        self.idle = static
+        return False
+
+    def invalidate(self):
+        """Forces redrawing of the next frame (for example, when the
+        window contents were damaged)."""
+        self.signature = None
+        self.idle = False
+
+
+def get_frames_to_change(items):
+    """Returns the least number of frames after which any of the items
+    (labels, stars) changes or None if none of them changes any more."""
+    frames = [item.get_frames_to_change() for item in items]
+    frames = [count for count in frames if count is not None]
+    return min(frames) if frames else None
@@ -1,140 +1,176 @@
-"""Module providing data and settings for game levels."""
-import pygame
-import pygame.mixer
-
-from map import map_read
-
-LEVELS = (
-    {
-    'mapfile': 'track_01.map',
-    'background': 'bg_01.png',
-    'music': 'level_01.ogg',
-    'description': 'WALK IN THE PARK',
-    'asteroids': 0,
-    'speed': 6,
-    'acceleration': 0,
-    },
-    {
-    'mapfile': 'track_02.map',
-    'background': 'bg_02.png',
-    'music': 'level_02.ogg',
-    'description': 'BRAKING TIME',
-    'asteroids': 0,
-    'speed': 4.9,
-    'acceleration': 0,
-    },
-    {
-    'mapfile': 'track_03.map',
-    'background': 'bg_03.png',
-    'music': 'level_03.ogg',
-    'description': 'ASTEROID FIELD. FLY FAST AND DO NOT STOP!',
-    'asteroids': 5,
-    'speed': 6,
-    'acceleration': 1.0E-5,
-    },
-    {
-    'mapfile': 'track_04.map',
-    'background': 'bg_04.png',
-    'music': 'level_04.ogg',
-    'description': 'BLAST YOUR WAY OUT!',
-    'asteroids': 0,
-    'speed': 8,
-    'acceleration': 0,
-    },
-    {
-    'mapfile': 'track_05.map',
-    'background': 'bg_05.png',
-    'music': 'level_05.ogg',
-    'description': 'SERPENTINE',
-    'asteroids': 0,
-    'speed': 8,
-    'acceleration': 0,
-    },
-    {
-    'mapfile': 'track_06.map',
-    'background': 'bg_06.png',
-    'music': 'level_06.ogg',
-    'description': "ACCELERATE! NO SLOW DOWN!",
-    'asteroids': 0,
-    'speed': 6,
-    'acceleration': 1.0E-5,
-    },
-    )
-
-class GameLevel():
-    """The class loads data for game level and keeps level-wide settings
-    and parameters."""
-    def __init__(self):
-        self.restart()
-
-    def _reload(self):
-        map_read_result = map_read(f"map/{LEVELS[self.level]['mapfile']}")
-        self.map = map_read_result['map']
-        self.spawns = map_read_result['spawns']
-        self.background = pygame.image.load(
-            f"img/bg/{LEVELS[self.level]['background']}").convert()
-
-    def restart(self):
-        """Resets level counter and reloads game resources for the
-        first level."""
-        self.level = 0
-        self._reload()
-
-    def play_music(self):
-        """Starts playing background music for current level."""
-        pygame.mixer.music.load(f"mus/{LEVELS[self.level]['music']}")
-        pygame.mixer.music.play(loops=-1)
-
-    def get_level(self):
-        """Returns current level number."""
-        # Internal level number begins from 0
-        return self.level + 1
-
-    def get_map(self):
-        """Returns already loaded level map (for Track object,
-        see map_read() definition) for current level."""
-        return self.map
-
-    def get_asteroid_spawns(self):
-        """Returns asteroid spawn points (for Asteroids object,
-        see map_read() definition) for current level."""
-        return self.spawns
-
-    def get_background(self):
-        """Returns already loaded background (pygame.Surface)
-        for current level."""
-        return self.background
-
-    def get_description(self):
-        """Returns description for current level."""
-        return LEVELS[self.level]['description']
-
-    def get_asteroids_density(self):
-        """Returns spawn density of asteroids for current level."""
-        return LEVELS[self.level]['asteroids']
-
-    def get_ship_speed(self):
-        """Returns ship vertical constant speed for current level."""
-        return LEVELS[self.level]['speed']
-
-    def get_ship_acceleration(self):
-        """Returns ship vertical acceleration for current level."""
-        return LEVELS[self.level]['acceleration']
-
-    def next_level(self):
-        """Increments level counter and reloads game resources."""
-        if self.level < len(LEVELS) - 1:
-            self.level += 1
-            self._reload()
-            return True
-        else:
-            return False
-
-    def get_level_count(self):
-        """Returns total number of levels."""
-        return len(LEVELS)
-
-    def last_level(self):
-        """Returns True if current level is the last level and
-        False otherwise."""
-        return self.level == len(LEVELS) - 1
+"""Module providing data and settings for game levels."""
+import pygame
+import pygame.mixer
+
+from assets import load_music
+from level_cache import LevelCache, LEVEL_CACHE_BUDGET
+from scaling import ASSET_SCALE
+
+LEVELS = (
+    {
+    'mapfile': 'track_01.map',
+    'background': 'bg_01.png',
+    'music': 'level_01.ogg',
+    'description': 'WALK IN THE PARK',
+    'asteroids': 0,
+    'speed': 6,
+    'acceleration': 0,
+    },
+    {
+    'mapfile': 'track_02.map',
+    'background': 'bg_02.png',
+    'music': 'level_02.ogg',
+    'description': 'BRAKING TIME',
+    'asteroids': 0,
+    'speed': 4.9,
+    'acceleration': 0,
+    },
+    {
+    'mapfile': 'track_03.map',
+    'background': 'bg_03.png',
+    'music': 'level_03.ogg',
+    'description': 'ASTEROID FIELD. FLY FAST AND DO NOT STOP!',
+    'asteroids': 5,
+    'speed': 6,
+    'acceleration': 1.0E-5,
+    },
+    {
+    'mapfile': 'track_04.map',
+    'background': 'bg_04.png',
+    'music': 'level_04.ogg',
+    'description': 'BLAST YOUR WAY OUT!',
+    'asteroids': 0,
+    'speed': 8,
+    'acceleration': 0,
+    },
+    {
+    'mapfile': 'track_05.map',
+    'background': 'bg_05.png',
+    'music': 'level_05.ogg',
+    'description': 'SERPENTINE',
+    'asteroids': 0,
+    'speed': 8,
+    'acceleration': 0,
+    },
+    {
+    'mapfile': 'track_06.map',
+    'background': 'bg_06.png',
+    'music': 'level_06.ogg',
+    'description': "ACCELERATE! NO SLOW DOWN!",
+    'asteroids': 0,
+    'speed': 6,
+    'acceleration': 1.0E-5,
+    },
+    )
+
+def scale_ship_speed(speed):
+    """Returns ship speed from LEVELS table scaled for the logical
+    resolution."""
+    return speed * ASSET_SCALE
+
+def scale_ship_acceleration(acceleration):
+    """Returns ship acceleration from LEVELS table scaled for the
+    logical resolution."""
+    # Accelerated speed is proportional to y ** 1.2 (see Ship.update())
+    # and y is scaled itself, so the speed scales as well
+    return acceleration * ASSET_SCALE ** -0.2
+
+class GameLevel():
+    """The class loads data for game level and keeps level-wide settings
+    and parameters. Level resources are taken from the cache of
+    recently played levels."""
+    def __init__(self, cache_budget=LEVEL_CACHE_BUDGET,
+                 background_size=None):
+        """Input parameters:
+        cache_budget - maximum estimated size in bytes of cached level
+        resources (see LevelCache);
+        background_size - size of the screen for scaling backgrounds
+        (if they differ)."""
+        self.cache = LevelCache(cache_budget, background_size)
+        self.restart()
+
+    def _reload(self):
+        resources = self.cache.get(LEVELS[self.level]['mapfile'],
+                                   LEVELS[self.level]['background'])
+        self.map = resources['map']
+        self.spawns = resources['spawns']
+        self.borders = resources['borders']
+        self.background = resources['background']
+        self.background_color = resources['background_color']
+
+    def restart(self):
+        """Resets level counter and reloads game resources for the
+        first level."""
+        self.level = 0
+        self._reload()
+
+    def play_music(self):
+        """Starts playing background music for current level."""
+        load_music(f"mus/{LEVELS[self.level]['music']}")
+        pygame.mixer.music.play(loops=-1)
+
+    def get_level(self):
+        """Returns current level number."""
+        # Internal level number begins from 0
+        return self.level + 1
+
+    def get_map(self):
+        """Returns already loaded level map (for Track object,
+        see map_read() definition) for current level."""
+        return self.map
+
+    def get_borders(self):
+        """Returns track borders table (for Track object,
+        see map.get_borders()) for current level."""
+        return self.borders
+
+    def get_asteroid_spawns(self):
+        """Returns asteroid spawn points (for Asteroids object,
+        see map_read() definition) for current level."""
+        return self.spawns
+
+    def get_background(self):
+        """Returns already loaded background (pygame.Surface)
+        for current level."""
+        return self.background
+
+    def get_background_color(self):
+        """Returns average color of the background for current level
+        (it replaces the background for reduced quality)."""
+        return self.background_color
+
+    def get_description(self):
+        """Returns description for current level."""
+        return LEVELS[self.level]['description']
+
+    def get_asteroids_density(self):
+        """Returns spawn density of asteroids for current level."""
+        return LEVELS[self.level]['asteroids']
+
+    def get_ship_speed(self):
+        """Returns ship vertical constant speed for current level
+        (scaled for the logical resolution)."""
+        return scale_ship_speed(LEVELS[self.level]['speed'])
+
+    def get_ship_acceleration(self):
+        """Returns ship vertical acceleration for current level
+        (scaled for the logical resolution)."""
+        return scale_ship_acceleration(LEVELS[self.level]['acceleration'])
+
+    def next_level(self):
+        """Increments level counter and reloads game resources."""
+        if self.level < len(LEVELS) - 1:
+            self.level += 1
+            self._reload()
+            return True
+        else:
+            return False
+
+    def get_level_count(self):
+        """Returns total number of levels."""
+        return len(LEVELS)
+
+    def last_level(self):
+        """Returns True if current level is the last level and
+        False otherwise."""
+        return self.level == len(LEVELS) - 1
@@ -0,0 +1,542 @@
+"""Module with the rules of the game which don't depend on rendering:
+ship kinematics, statuses and laser charging, track borders, asteroid
+spawning and animation frames, and collisions of the bitmasks. The game
+objects (Ship, Track and Asteroids) extend the classes of this module
+with images and visual effects, and LevelSimulation steps the classes
+themselves without any display, so both play by the same rules.
+
+The bitmasks are positioned in the world pixel system: x is absolute x
+and y is negated absolute y (so it grows downward as screen y does).
+The positions are rounded there rather than on the screen, so the
+collisions don't depend on the position of the camera."""
+import random
+from statistics import mean
+
+import pygame
+import pygame.mask
+
+from scaling import ASSET_SCALE, scaled
+from map import GRID_SIZE, tile_to_abs, abs_to_tile, get_borders
+from map import get_track_borders, get_inner_tiles
+
+# Pixels per frame
+SHIP_MOVEMENT = 4 * ASSET_SCALE
+
+# Origin of the laser relative to the ship center
+LASER_OFFSET_X = scaled(4)
+LASER_OFFSET_Y = scaled(64)
+# Frames of laser charging after a shot
+CHARGE_MAX = 50
+
+STATUS_NORMAL = 0
+STATUS_INACTIVE = 1
+STATUS_EXPLODING = 2
+STATUS_RESTORING = 3
+STATUS_AUTO = 4
+
+# Duration in frames of ship explosion and restoring
+PROGRESS_MAX = 90
+
+# Frames of asteroid animation per frame of the game
+ASTEROID_ANIMATION_SPEED = 0.1
+
+# First index of small asteroid bitmasks (see asteroids.ASTEROID_FILES)
+ASTEROID_INDEX_SMALL = 7
+
+ASTEROID_SIZE_ANY = 0
+ASTEROID_SIZE_FULL = 1
+ASTEROID_SIZE_SMALL = 2
+
+# Kinds of collisions
+COLLISION_TRACK = 'track'
+COLLISION_ASTEROID = 'asteroid'
+COLLISION_PENALTY = 'penalty'
+
+def get_full_speed(speed, acceleration, y):
+    """Returns vertical speed of the ship with given constant speed and
+    acceleration at absolute coordinate y."""
+    return speed + acceleration * (y ** 1.2)
+
+def get_world_pos(x, y):
+    """Returns the position (left, top) in the world pixel system for
+    the upper-left corner with absolute coordinates (x, y)."""
+    return (round(x), round(-y))
+
+def get_spawn_points(inner_tiles, map_height, scr_height, spawn_density):
+    """Returns a list of random asteroid spawn points in format of
+    absolute coordinates [(center_x, center_y),...].
+    Input parameters:
+    inner_tiles - list of tiles between the track borders (see
+    map.get_inner_tiles());
+    map_height - height in pixels of entire track map;
+    scr_height - height of the viewport;
+    spawn_density - see Asteroids.set_spawn_density()."""
+    scr_height = int(scr_height)
+    map_height = int(map_height)
+    spawn_count = int(
+        (map_height - 2*scr_height) / scr_height * spawn_density)
+    spawns = []
+    # Don't spawn on first and last screens
+    tiles = [tile for tile in inner_tiles
+             if scr_height <= tile_to_abs(tile[1]) <= map_height - scr_height]
+
+    for i in range(0, spawn_count - 1):
+        spawn_point = tiles.pop(random.randint(0, len(tiles) - 1))
+        spawn_point = (tile_to_abs(spawn_point[0]) + GRID_SIZE/2,
+                       tile_to_abs(spawn_point[1]) + GRID_SIZE/2)
+        spawns.append(spawn_point)
+    return spawns
+
+class TrackBody():
+    """Tile map of the track, its borders table and tile bitmasks."""
+    def __init__(self, tile_masks, tiles=None, borders=None):
+        """Input parameters:
+        tile_masks - list of dicts {'mask', 'offset_x', 'offset_y'} for
+        each tile index: bitmask of the cropped tile image and its
+        offset inside the tile;
+        tiles, borders - see set_tile_map()."""
+        self.tile_masks = tile_masks
+        # Format: [{x-coord: tile-index,...},...]
+        self.tiles = [{}]
+        # Format: [(x_left, x_right),...] (see map.get_borders())
+        self.borders = []
+        if tiles is not None:
+            TrackBody.set_tile_map(self, tiles, borders)
+
+    def set_tile_map(self, tiles, borders=None):
+        """Assigns already loaded tile map. The track borders table
+        (see map.get_borders()) is computed if not specified."""
+        self.tiles = tiles
+        if borders is None:
+            borders = get_borders(tiles)
+        self.borders = borders
+
+    def get_track_height(self):
+        """Returns height in pixels of entire track map."""
+        return len(self.tiles) * GRID_SIZE
+
+    def get_track_width(self):
+        """Returns width in pixels of entire track map."""
+        x_list = []
+        for line in self.tiles:
+            for x in line.keys():
+                if x not in x_list:
+                    x_list.append(x)
+        return (max(x_list) - min(x_list) + 1) * GRID_SIZE
+
+    def get_track_borders(self, y):
+        """Returns tuple (x_left, x_right) with coordinates corresponding
+        left and right inner borders of the track being intersected by
+        horizontal line with coordinate y.
+        Assuming all coordinates are absolute."""
+        return get_track_borders(self.borders, y)
+
+    def get_track_inner_tiles(self):
+        """Returns a list of all tiles between left and right track
+        borders in format: [(x_tile, y_tile),...]. The coordinates are
+        in tile grid system."""
+        return get_inner_tiles(self.borders)
+
+    def is_off_track(self, left, right, y):
+        """Returns True if the horizontal span from left to right
+        (absolute x coordinates) lies entirely beside the track borders
+        at absolute y."""
+        borders = self.get_track_borders(y)
+        if borders:
+            return right < borders[0] or left > borders[1]
+        return False
+
+    def _get_tile_pos(self, x, line, tile):
+        """Returns upper-left corner of the tile bitmask in the world
+        pixel system. Parameters x and line are tile grid coordinates,
+        tile is the dict from self.tile_masks."""
+        return (int(tile_to_abs(x)) + tile['offset_x'],
+                tile['offset_y'] - int(tile_to_abs(line) + GRID_SIZE))
+
+    def collide(self, mask, left, top):
+        """Checks a collision between the track borders and given mask
+        positioned with its upper-left corner (left, top) in the world
+        pixel system. Returns point of collision in absolute coordinates
+        if collision occurred and None otherwise."""
+        width, height = mask.get_size()
+        first_line = max(abs_to_tile(-(top + height)), 0)
+        last_line = min(abs_to_tile(-top), len(self.tiles) - 1)
+        first_column = abs_to_tile(left - GRID_SIZE)
+        last_column = abs_to_tile(left + width)
+        for line in range(first_line, last_line + 1):
+            map_line = self.tiles[line]
+            for x in range(first_column, last_column + 1):
+                index = map_line.get(x)
+                if index is None:
+                    continue
+                tile = self.tile_masks[index]
+                tile_left, tile_top = self._get_tile_pos(x, line, tile)
+                point = tile['mask'].overlap(mask, (left - tile_left,
+                                                    top - tile_top))
+                if point:
+                    return (float(tile_left + point[0]),
+                            float(-(tile_top + point[1])))
+        return None
+
+    def get_mask(self):
+        """Returns a tuple (mask, left, top) with the bitmask of entire
+        track map and its upper-left corner in the world pixel system.
+        The mask of a long track is large, so it isn't kept: it's built
+        for checking a lot of positions at once (see collide())."""
+        x_list = [x for line in self.tiles for x in line]
+        left = int(tile_to_abs(min(x_list)))
+        top = -int(self.get_track_height())
+        mask = pygame.mask.Mask((int(tile_to_abs(max(x_list) + 1)) - left,
+                                 -top))
+        for line, map_line in enumerate(self.tiles):
+            for x, index in map_line.items():
+                tile = self.tile_masks[index]
+                tile_left, tile_top = self._get_tile_pos(x, line, tile)
+                mask.draw(tile['mask'], (tile_left - left, tile_top - top))
+        return (mask, left, top)
+
+class AsteroidBody():
+    """Position and animation of single asteroid. The coordinates (x, y)
+    are absolute ones of the upper-left corner, index is the index of
+    the asteroid image (and its bitmasks)."""
+    __slots__ = ('x', 'y', 'index', 'masks', 'width', 'height',
+                 'start_frame', 'start_tick', 'reverse')
+
+    def __init__(self, index, masks, center_x, center_y, tick, reverse):
+        self.index = index
+        self.masks = masks
+        self.width, self.height = masks[0].get_size()
+        self.x = center_x - self.width / 2
+        self.y = center_y + self.height / 2
+        self.reverse = reverse
+        self.start_frame = len(masks) - 1 if reverse else 0
+        self.start_tick = tick
+
+    def get_center(self):
+        """Returns point (x, y) with absolute asteroid center
+        coordinates."""
+        return (self.x + self.width / 2, self.y - self.height / 2)
+
+    def get_frame(self, tick):
+        """Returns the number of the animation frame at given tick (see
+        AnimatedSprite.frame)."""
+        steps = int((tick - self.start_tick) * ASTEROID_ANIMATION_SPEED)
+        if self.reverse:
+            steps = -steps
+        return (self.start_frame + steps) % len(self.masks)
+
+    def get_mask(self, tick):
+        """Returns the bitmask of the animation frame at given tick."""
+        return self.masks[self.get_frame(tick)]
+
+class AsteroidField():
+    """Asteroids spawned on the track while the camera moves along it.
+    The asteroids are AsteroidBody objects kept in self.items list."""
+    def __init__(self, asteroid_masks):
+        """Input parameters:
+        asteroid_masks - list of lists of frame bitmasks for each
+        asteroid image."""
+        self.asteroid_masks = asteroid_masks
+        # Format: [(center_x, center_y),...]
+        self.spawns = []
+        self.items = []
+        # The tick of the last update (see update())
+        self.tick = 0
+
+    def respawn(self, spawns):
+        """Sets the spawn points in format of absolute coordinates
+        [(center_x, center_y),...] and removes all the asteroids."""
+        self.items = []
+        # The lowest spawn point goes last
+        self.spawns = sorted(spawns, key=lambda spawn_point: spawn_point[1],
+                             reverse=True)
+
+    def add(self, center_x, center_y, asteroid_size=ASTEROID_SIZE_ANY):
+        """Creates new asteroid with random image and animation direction
+        and returns it.
+        Input parameters:
+        center_x, center_y - absolute coordinates for asteroid center;
+        asteroid_size - determines whether small, large or random-sized
+        asteroid will be created (see constants section)."""
+        if asteroid_size == ASTEROID_SIZE_FULL:
+            index = random.randint(0, ASTEROID_INDEX_SMALL - 1)
+        elif asteroid_size == ASTEROID_SIZE_SMALL:
+            index = random.randint(ASTEROID_INDEX_SMALL,
+                                   len(self.asteroid_masks) - 1)
+        else:
+            index = random.randint(0, len(self.asteroid_masks) - 1)
+        reverse = random.choice((True, False))
+
+        asteroid = AsteroidBody(index, self.asteroid_masks[index], center_x,
+                                center_y, self.tick, reverse)
+        self.items.append(asteroid)
+        return asteroid
+
+    def update(self, view_pt, tick):
+        """Spawns new asteroid if it's time and removes the ones left
+        below the viewport.
+        Input parameters:
+        view_pt - ViewPoint object of the camera;
+        tick - the number of the frame (for asteroid animations)."""
+        self.tick = tick
+        if (self.spawns and
+                self.spawns[-1][1] < view_pt.y + 2 * view_pt.half_height):
+            spawn_point = self.spawns.pop()
+            self.add(spawn_point[0], spawn_point[1])
+
+        bottom = view_pt.y - view_pt.half_height
+        if any(asteroid.y < bottom for asteroid in self.items):
+            self.items = [asteroid for asteroid in self.items
+                          if asteroid.y >= bottom]
+
+    def find_collision(self, mask, left, top, tick=None):
+        """Checks a collision between the asteroids and given mask
+        positioned with its upper-left corner (left, top) in the world
+        pixel system at given tick (the last update by default). Returns
+        a tuple (asteroid, point) with the first asteroid collided and
+        point of collision in absolute coordinates or None."""
+        if tick is None:
+            tick = self.tick
+        width, height = mask.get_size()
+        for asteroid in self.items:
+            # Inlined get_world_pos() as the loop is hot with many asteroids
+            asteroid_left = round(asteroid.x)
+            asteroid_top = round(-asteroid.y)
+            if (asteroid_left >= left + width or
+                    asteroid_left + asteroid.width <= left or
+                    asteroid_top >= top + height or
+                    asteroid_top + asteroid.height <= top):
+                continue
+            point = asteroid.get_mask(tick).overlap(
+                mask, (left - asteroid_left, top - asteroid_top))
+            if point:
+                return (asteroid, (float(asteroid_left + point[0]),
+                                   float(-(asteroid_top + point[1]))))
+        return None
+
+    def collide(self, mask, left, top, destroy=False, tick=None):
+        """Checks a collision as find_collision() does. If destroy is True
+        then the asteroid collided is destroyed. Returns point of
+        collision in absolute coordinates if collision occurred and None
+        otherwise."""
+        collision = self.find_collision(mask, left, top, tick)
+        if collision is None:
+            return None
+        asteroid, point = collision
+        if destroy:
+            self.destroy(asteroid, point)
+        return point
+
+    def destroy(self, asteroid, collide_point=None):
+        """Removes the asteroid. Parameter collide_point contains
+        absolute coordinates (x, y) of the collision which destroyed
+        the asteroid (if any)."""
+        self.items.remove(asteroid)
+
+    def destroy_nearest(self, center_point):
+        """Destroys the asteroids near the point with absolute
+        coordinates (center_x, center_y). Returns their number."""
+        destroyed = 0
+        for asteroid in list(self.items):
+            asteroid_center = asteroid.get_center()
+            distance = ((center_point[0] - asteroid_center[0]) ** 2 +
+                        (center_point[1] - asteroid_center[1]) ** 2) ** 0.5
+            if distance < GRID_SIZE * 2:
+                self.destroy(asteroid)
+                destroyed += 1
+        return destroyed
+
+class ShipBody():
+    """Ship kinematics, statuses and laser. The coordinates (x, y) are
+    absolute ones of the upper-left corner; the controls are
+    moving_up, moving_down, moving_left, moving_right and shooting
+    attributes."""
+    def __init__(self, mask, laser_mask, laser_frames):
+        """Input parameters:
+        mask - bitmask of the ship;
+        laser_mask - bitmask of the laser beam;
+        laser_frames - duration of the laser shot in frames."""
+        self.mask = mask
+        self.laser_mask = laser_mask
+        self.laser_frames = laser_frames
+        self.width, self.height = mask.get_size()
+        self.laser_width, self.laser_height = laser_mask.get_size()
+        self.x = -(self.width / 2)
+        self.y = self.height
+        self.speed = 0
+        self.acceleration = 0
+        self.status = STATUS_NORMAL
+        # Ship explosion and restoring are continuous processes which
+        # status keeps self.progress attribute
+        self.progress = 0
+        self.charge = CHARGE_MAX
+        # Frames left of the current laser shot
+        self.laser_left = 0
+        # True if the laser has been fired by the last update
+        self.laser_fired = False
+        self.reset_control()
+
+    def reset_control(self):
+        """Stops moving left/right/up/down and shooting."""
+        self.moving_up = False
+        self.moving_down = False
+        self.moving_left = False
+        self.moving_right = False
+        self.shooting = False
+
+    def get_center(self):
+        """Returns point (x, y) with absolute ship center coordinates."""
+        return (self.x + self.width / 2, self.y - self.height / 2)
+
+    def set_center(self, center_x, center_y):
+        """Sets the absolute center coordinates of the ship."""
+        self.x = center_x - (self.width / 2)
+        self.y = center_y + (self.height / 2)
+
+    def set_speed(self, speed):
+        self.speed = speed
+
+    def set_acceleration(self, acceleration):
+        self.acceleration = acceleration
+
+    def get_full_speed(self):
+        """Returns current vertical speed of the ship."""
+        return get_full_speed(self.speed, self.acceleration, self.y)
+
+    def get_pos(self):
+        """Returns upper-left corner of the ship in the world pixel
+        system."""
+        return get_world_pos(self.x, self.y)
+
+    def get_laser_origin(self):
+        """Returns absolute coordinates (x, y) of the point where laser
+        starts shooting (i.e. bottom-center of the beam)."""
+        return (self.x + self.width / 2 + LASER_OFFSET_X,
+                self.y - LASER_OFFSET_Y)
+
+    def get_laser_pos(self):
+        """Returns upper-left corner of the laser beam in the world pixel
+        system."""
+        origin_x, origin_y = self.get_laser_origin()
+        return get_world_pos(origin_x - self.laser_width / 2,
+                             origin_y + self.laser_height)
+
+    def laser_shooting(self):
+        """Returns True if the laser is shooting and False otherwise."""
+        return self.laser_left > 0
+
+    def update(self):
+        """Moves the ship by one frame and advances its status and
+        laser. Returns vertical speed of the ship (the camera follows
+        it)."""
+        full_speed = self.get_full_speed()
+        if self.status in (STATUS_NORMAL, STATUS_RESTORING, STATUS_AUTO):
+            self.y += full_speed
+
+        if self.laser_left > 0:
+            self.laser_left -= 1
+        self.laser_fired = (self.status == STATUS_NORMAL and
+                            self.shooting and self.charge >= CHARGE_MAX and
+                            not self.laser_shooting())
+        if self.laser_fired:
+            self.charge = 0
+            self.laser_left = self.laser_frames
+
+        if self.status in (STATUS_NORMAL, STATUS_RESTORING):
+            if self.moving_left:
+                self.x -= SHIP_MOVEMENT
+            if self.moving_right:
+                self.x += SHIP_MOVEMENT
+            if self.acceleration == 0:
+                # Don't move vertically if acceleration > 0
+                if self.moving_up:
+                    self.y += SHIP_MOVEMENT
+                if self.moving_down:
+                    self.y -= SHIP_MOVEMENT
+
+        if self.status in (STATUS_EXPLODING, STATUS_RESTORING):
+            self.progress += 1
+            if self.progress >= PROGRESS_MAX:
+                self.progress = 0
+                if self.status == STATUS_EXPLODING:
+                    self.status = STATUS_INACTIVE
+                else:
+                    self.status = STATUS_NORMAL
+
+        if not self.laser_shooting() and self.charge < CHARGE_MAX:
+            self.charge += 1
+        return full_speed
+
+    def explode(self):
+        """Starts ship explosion. Returns False if the ship can't
+        explode now."""
+        if self.status != STATUS_NORMAL:
+            return False
+        self.status = STATUS_EXPLODING
+        self.progress = 0
+        return True
+
+    def set_autopilot(self):
+        """Imperatively disables player control of the ship.
+        The only way to return the control is to call restore()."""
+        self.status = STATUS_AUTO
+
+    def restore(self, center_point=None, reset_control=False):
+        """Restores ship after destruction or just assigning special
+        'restoring' status (blinking and temporary invincibility).
+        Returns False if the ship can't be restored now.
+        Input parameters:
+        center_point - new absolute coordinates of the ship
+        (no changing position if None);
+        reset_control - if True then stops moving left/right/up/down
+        and shooting; useful to avoid glitch when game level starts."""
+        if self.status not in (STATUS_NORMAL, STATUS_INACTIVE, STATUS_AUTO):
+            return False
+        self.status = STATUS_RESTORING
+        self.progress = 0
+        if reset_control:
+            self.reset_control()
+        if center_point:
+            self.set_center(center_point[0], center_point[1])
+        return True
+
+
+def check_collisions(ship, track, asteroids):
+    """Checks collisions of the ship (ShipBody) with the track
+    (TrackBody) and the asteroids (AsteroidField), and of its laser with
+    the asteroids. The asteroids collided are destroyed. Returns a tuple
+    (kind, point, laser_hit): kind of the collision destroying the ship
+    (see COLLISION_... constants) or None, its point in absolute
+    coordinates (None if the ship has left the track), and True if the
+    laser has hit an asteroid."""
+    left, top = ship.get_pos()
+    point = track.collide(ship.mask, left, top)
+    if point:
+        return (COLLISION_TRACK, point, False)
+
+    point = asteroids.collide(ship.mask, left, top, destroy=True)
+    if point:
+        return (COLLISION_ASTEROID, point, False)
+
+    laser_hit = False
+    if ship.laser_shooting():
+        laser_left, laser_top = ship.get_laser_pos()
+        laser_hit = bool(asteroids.collide(ship.laser_mask, laser_left,
+                                           laser_top, destroy=True))
+
+    if track.is_off_track(ship.x, ship.x + ship.width, ship.get_center()[1]):
+        return (COLLISION_PENALTY, None, laser_hit)
+    return (None, None, laser_hit)
+
+def restore_ship(ship, track, asteroids):
+    """Restores the destroyed ship in the middle of the track at its
+    height and destroys the asteroids near it. Returns the number of
+    the asteroids destroyed or None if the ship can't be restored
+    now."""
+    restore_x, restore_y = ship.get_center()
+    borders = track.get_track_borders(restore_y)
+    if borders:
+        restore_x = mean(borders)
+    if not ship.restore((restore_x, restore_y)):
+        return None
+    return asteroids.destroy_nearest(ship.get_center())
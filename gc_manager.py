@@ -0,0 +1,110 @@
+"""Module for controlling garbage collection while playing. Long-lived
+objects created by loading (surfaces, masks, fonts, sprite sheets) are
+moved to the permanent generation, so the collector doesn't walk them
+any more. Generation thresholds are raised to make collections rarer
+and full collections are done at safe points (level transitions,
+pause) where a stutter is not noticed.
+
+Every collection is timed through gc.callbacks. The pauses may be
+reported together with frame times on exit (--gc-stats key)."""
+import atexit
+import gc
+import time
+from collections import defaultdict
+
+# Thresholds of generations while playing (Python default is 700, 10, 10)
+GAMEPLAY_THRESHOLDS = (2000, 20, 100)
+
+# Frame time budget in milliseconds for counting stuttered frames
+FRAME_BUDGET = 1000 / 60
+
+class GCManager():
+    """The class keeps statistics of collections in format:
+    {generation: {'count': n, 'total': ms, 'max': ms}}
+    Collections at safe points are accounted as generation 'safe'."""
+    def __init__(self, report=False, thresholds=GAMEPLAY_THRESHOLDS):
+        """Input parameters:
+        report - if True then statistics are printed on exit;
+        thresholds - generation thresholds set by freeze()."""
+        self.thresholds = thresholds
+        self.stats = defaultdict(lambda: {'count': 0, 'total': 0.0,
+                                          'max': 0.0})
+        self.start = None
+        # Collection pauses in milliseconds since the last frame
+        self.pause = 0.0
+        self.frames = {'count': 0, 'total': 0.0, 'max': 0.0,
+                       'collections': 0, 'over_budget': 0,
+                       'over_budget_collections': 0}
+        self.frozen = 0
+        gc.callbacks.append(self._callback)
+        if report:
+            atexit.register(self.report)
+
+    def _add_pause(self, generation, pause):
+        stats = self.stats[generation]
+        stats['count'] += 1
+        stats['total'] += pause
+        stats['max'] = max(stats['max'], pause)
+
+    def _callback(self, phase, info):
+        if phase == 'start':
+            self.start = time.perf_counter()
+        elif self.start is not None:
+            pause = (time.perf_counter() - self.start) * 1000
+            self.start = None
+            self._add_pause(info['generation'], pause)
+            self.pause += pause
+
+    def freeze(self):
+        """Collects the garbage left by loading, moves all the objects
+        to the permanent generation and sets gameplay thresholds. Call
+        once when loading is finished."""
+        self.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+        gc.set_threshold(*self.thresholds)
+
+    def collect(self):
+        """Full collection at a safe point."""
+        # The collection is timed here, so it's not reported twice
+        gc.callbacks.remove(self._callback)
+        start = time.perf_counter()
+        gc.collect()
+        self._add_pause('safe', (time.perf_counter() - start) * 1000)
+        gc.callbacks.append(self._callback)
+
+    def add_frame_time(self, frame_time):
+        """Takes into account the time in milliseconds spent for the
+        frame together with the collection pauses during the frame."""
+        frames = self.frames
+        frames['count'] += 1
+        frames['total'] += frame_time
+        frames['max'] = max(frames['max'], frame_time)
+        if self.pause > 0:
+            frames['collections'] += 1
+        if frame_time > FRAME_BUDGET:
+            frames['over_budget'] += 1
+            if self.pause > 0:
+                frames['over_budget_collections'] += 1
+        self.pause = 0.0
+
+    def report(self):
+        """Prints collection pauses and frame times."""
+        print(f"Frozen objects: {self.frozen}, thresholds: "
+              f"{gc.get_threshold()}")
+        print(f"{'GENERATION':<12} {'COUNT':>7} {'TOTAL ms':>9} "
+              f"{'MAX ms':>9}")
+        for generation, stats in sorted(self.stats.items(),
+                                        key=lambda item: str(item[0])):
+            print(f"{generation:<12} {stats['count']:>7} "
+                  f"{stats['total']:>9.1f} {stats['max']:>9.2f}")
+        frames = self.frames
+        if frames['count'] == 0:
+            return
+        print(f"Frames: {frames['count']}, average "
+              f"{frames['total'] / frames['count']:.1f} ms, "
+              f"max {frames['max']:.1f} ms, "
+              f"with collections: {frames['collections']}; "
+              f"over budget: {frames['over_budget']}, "
+              f"of them with collections: "
+              f"{frames['over_budget_collections']}")
@@ -0,0 +1,90 @@
+"""Module for caching resources of game levels: parsed maps, converted
+backgrounds and derived track tables. Recently played levels are kept
+in memory, so restarting or replaying a level doesn't load anything.
+The least recently used levels are evicted when the estimated size of
+the cache exceeds its budget."""
+import sys
+from collections import OrderedDict
+
+import pygame
+import pygame.transform
+
+from assets import load_background
+from map import map_read, get_borders
+
+# Maximum estimated size of cached level resources in bytes
+LEVEL_CACHE_BUDGET = 24 * 1024 * 1024
+
+class LevelCache():
+    """The class keeps resources of the levels in LRU order. Resources
+    of a level are a dict in format:
+    {
+        'map': tile map (see map_read()),
+        'spawns': asteroid spawn points (see map_read()),
+        'borders': track borders table (see map.get_borders()),
+        'background': converted background image (pygame.Surface),
+        'background_color': average color of the background
+    }
+    Note: the resources are shared and must not be changed."""
+    def __init__(self, budget=LEVEL_CACHE_BUDGET, background_size=None):
+        """Input parameters:
+        budget - maximum estimated size of cached resources in bytes;
+        the most recently used level is kept even if it exceeds
+        the budget;
+        background_size - if specified then backgrounds are scaled to
+        this size (usually the screen size)."""
+        self.budget = budget
+        self.background_size = background_size
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Format: {(mapfile, background): (resources, size),...}
+        self.items = OrderedDict()
+
+    def _get_bytes(self, resources):
+        background = resources['background']
+        size = background.get_pitch() * background.get_height()
+        size += sys.getsizeof(resources['map'])
+        for map_line in resources['map']:
+            size += sys.getsizeof(map_line)
+        size += sys.getsizeof(resources['borders'])
+        size += sys.getsizeof(resources['spawns'])
+        return size
+
+    def _load(self, mapfile, background):
+        map_read_result = map_read(f"map/{mapfile}")
+        resources = {
+            'map': map_read_result['map'],
+            'spawns': map_read_result['spawns'],
+            'borders': get_borders(map_read_result['map']),
+            'background': load_background(f"img/bg/{background}",
+                                          self.background_size),
+            }
+        resources['background_color'] = pygame.transform.average_color(
+            resources['background'])
+        return resources
+
+    def get(self, mapfile, background):
+        """Returns resources of the level (see class description) with
+        given map and background filenames. Loads them if needed."""
+        key = (mapfile, background)
+        if key in self.items:
+            self.hits += 1
+            self.items.move_to_end(key)
+            return self.items[key][0]
+
+        self.misses += 1
+        resources = self._load(mapfile, background)
+        size = self._get_bytes(resources)
+        self.items[key] = (resources, size)
+        self.bytes += size
+        while self.bytes > self.budget and len(self.items) > 1:
+            evicted_key, (evicted, evicted_size) = self.items.popitem(
+                last=False)
+            self.bytes -= evicted_size
+        return resources
+
+    def clear(self):
+        """Removes all the levels from the cache."""
+        self.items.clear()
+        self.bytes = 0
@@ -0,0 +1,70 @@
+"""Module for loading game resources step by step. Loading is split into
+small tasks which the main loop works through in time slices, so the
+window keeps responding to events and the progress may be shown."""
+import time
+
+# Default time in milliseconds for running the tasks during one frame
+DEFAULT_TIME_SLICE = 12
+
+class LoadQueue():
+    """The class keeps the list of loading tasks in order of running.
+    Task is any function without arguments. If the task can't be
+    finished right now (for example, it waits for the resource being
+    prepared by another thread), then it returns False and will be
+    called again next time."""
+    def __init__(self, profiler=None):
+        """Input parameters:
+        profiler - StartupProfiler instance for measuring the tasks."""
+        self.profiler = profiler
+        # Format: [(name, function),...]
+        self.tasks = []
+        self.current = 0
+
+    def add(self, name, function):
+        """Adds the task to the end of the queue.
+        Input parameters:
+        name - short task description;
+        function - function to be called for running the task."""
+        self.tasks.append((name, function))
+
+    def run(self, time_slice=DEFAULT_TIME_SLICE):
+        """Runs the tasks until the time slice (in milliseconds) is
+        over. At least one task is run if the queue is not finished.
+        Returns False if the current task is waiting for something and
+        True otherwise."""
+        deadline = time.perf_counter() + time_slice / 1000
+        while not self.finished():
+            name, function = self.tasks[self.current]
+            if self.profiler:
+                done = self.profiler.call(name, function)
+            else:
+                done = function()
+            if done is False:
+                return False
+            self.current += 1
+            if time.perf_counter() >= deadline:
+                break
+        return True
+
+    def run_all(self):
+        """Runs all the remaining tasks."""
+        while not self.finished():
+            if not self.run():
+                time.sleep(0.001)
+
+    def finished(self):
+        """Returns True if all the tasks have been done."""
+        return self.current >= len(self.tasks)
+
+    def get_progress(self):
+        """Returns the fraction of the tasks done (from 0.0 to 1.0)."""
+        if not self.tasks:
+            return 1.0
+        return self.current / len(self.tasks)
+
+    def get_current_name(self):
+        """Returns the description of the current task or empty string
+        if all the tasks have been done."""
+        if self.finished():
+            return ''
+        return self.tasks[self.current][0]
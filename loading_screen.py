@@ -1,29 +1,57 @@
-"""Module for showing special screen
-while game resources are being loaded."""
-import pygame
-
-from text_label import TextLabel
-
-FONT_SIZE = 32
-TEXT_COLOR = (109, 207, 246)
-SCREEN_COLOR = (8, 0, 51)
-TEXT_MESSAGE = 'LOADING UNIVERSE... PLEASE STAND BY'
-
-class LoadingScreen():
-    def __init__(self, scr):
-        """Input parameters:
-        scr - Surface for drawing."""
-        self.scr = scr
-        self.label = TextLabel(
-            scr=self.scr,
-            text=TEXT_MESSAGE,
-            color=TEXT_COLOR,
-            size=FONT_SIZE)
-        self.label.rect.center = self.scr.get_rect().center
-
-    def draw(self):
-        """Fills the specified surface with solid color and renders
-        the text label with message."""
-        self.scr.fill(SCREEN_COLOR)
-        self.label.draw()
-        pygame.display.flip()
+"""Module for showing special screen
+while game resources are being loaded."""
+import pygame
+
+from text_label import TextLabel
+from scaling import scaled
+
+FONT_SIZE = scaled(32)
+TEXT_COLOR = (109, 207, 246)
+SCREEN_COLOR = (8, 0, 51)
+TEXT_MESSAGE = 'LOADING UNIVERSE... PLEASE STAND BY'
+
+# Progress bar parameters
+BAR_SIZE = (scaled(512), scaled(16))
+BAR_MARGIN = scaled(32)
+BAR_BORDER = scaled(2)
+BAR_COLOR = (109, 207, 246)
+
+class LoadingScreen():
+    def __init__(self, scr):
+        """Input parameters:
+        scr - Surface for drawing."""
+        self.scr = scr
+        self.progress = 0.0
+        self.label = TextLabel(
+            scr=self.scr,
+            text=TEXT_MESSAGE,
+            color=TEXT_COLOR,
+            size=FONT_SIZE)
+        self.label.rect.center = self.scr.get_rect().center
+
+        self.bar_rect = pygame.Rect((0, 0), BAR_SIZE)
+        self.bar_rect.midtop = (self.label.rect.centerx,
+                                self.label.rect.bottom + BAR_MARGIN)
+
+    def set_progress(self, progress):
+        """Sets the fraction of resources loaded (from 0.0 to 1.0)."""
+        self.progress = min(max(progress, 0.0), 1.0)
+
+    def _get_fill_width(self):
+        return round((self.bar_rect.width - BAR_BORDER * 4) * self.progress)
+
+    def get_signature(self):
+        """Returns a tuple describing everything visible on the screen
+        (see FrameScheduler)."""
+        return (self._get_fill_width(),)
+
+    def draw(self):
+        """Fills the specified surface with solid color and renders
+        the text label with message and the progress bar."""
+        self.scr.fill(SCREEN_COLOR)
+        self.label.draw()
+        pygame.draw.rect(self.scr, BAR_COLOR, self.bar_rect, BAR_BORDER)
+        fill_rect = self.bar_rect.inflate(-BAR_BORDER * 4, -BAR_BORDER * 4)
+        fill_rect.width = self._get_fill_width()
+        if fill_rect.width > 0:
+            self.scr.fill(BAR_COLOR, fill_rect)
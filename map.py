@@ -1,177 +1,246 @@
-"""Module for reading game level map."""
-from math import ceil
-from statistics import mean
-
-# Each map tile is actually a square which side is GRID_SIZE pixels
-GRID_SIZE = 128
-
-TILE_BOTLEFT = 0
-TILE_BOTLEFT_MIDRIGHT = 1
-TILE_BOTLEFT_MIDTOP = 2
-TILE_BOTLEFT_TOPRIGHT = 3
-TILE_BOTRIGHT = 4
-TILE_MIDBOT_MIDRIGHT = 5
-TILE_MIDBOT_TOPRIGHT = 6
-TILE_MIDLEFT_BOTRIGHT = 7
-TILE_MIDLEFT_MIDBOT = 8
-TILE_MIDLEFT_MIDRIGHT = 9
-TILE_MIDLEFT_MIDTOP = 10
-TILE_MIDLEFT_TOPRIGHT = 11
-TILE_MIDTOP_BOTRIGHT = 12
-TILE_MIDTOP_MIDBOT = 13
-TILE_MIDTOP_MIDRIGHT = 14
-TILE_TOPLEFT = 15
-TILE_TOPLEFT_BOTRIGHT = 16
-TILE_TOPLEFT_MIDBOT = 17
-TILE_TOPLEFT_MIDRIGHT = 18
-TILE_TOPRIGHT = 19
-
-def tile_to_abs(coord):
-    """Converts map tile coordinate to absolute coordinate."""
-    return float(coord * GRID_SIZE)
-
-def abs_to_tile(coord):
-    """Converts absolute coordinate to map tile coordinate."""
-    return int(coord) // GRID_SIZE
-
-def _recognize_pattern(left=None, topleft=None, top=None, topright=None,
-                       right=None, bottomright=None, bottom=None,
-                       bottomleft=None):
-    """Returns tile index for junction tile. This tile connects a pair
-    of related tiles adjacent to it."""
-    if left == '-' and bottom == '|':
-        return TILE_MIDLEFT_MIDBOT
-    elif right == '-' and bottom == '|':
-        return TILE_MIDBOT_MIDRIGHT
-    elif left == '-' and top == '|':
-        return TILE_MIDLEFT_MIDTOP
-    elif right == '-' and top == '|':
-        return TILE_MIDTOP_MIDRIGHT
-    elif bottomleft == '/' and right == '-':
-        return TILE_BOTLEFT_MIDRIGHT
-    elif bottomright == '\\' and left == '-':
-        return TILE_MIDLEFT_BOTRIGHT
-    elif bottomleft == '/' and top == '|':
-        return TILE_BOTLEFT_MIDTOP
-    elif bottomright == '\\' and top == '|':
-        return TILE_MIDTOP_BOTRIGHT
-    elif left == '-' and topright == '/':
-        return TILE_MIDLEFT_TOPRIGHT
-    elif right == '-' and topleft == '\\':
-        return TILE_TOPLEFT_MIDRIGHT
-    elif bottom == '|' and topright == '/':
-        return TILE_MIDBOT_TOPRIGHT
-    elif bottom == '|' and topleft == '\\':
-        return TILE_TOPLEFT_MIDBOT
-    else:
-        return None
-
-def map_read(filename):
-    """Reads game level map from special-formatted text file and
-    converts it to list of tiles and asteroid spawn points.
-    The file must contain only allowed symbols and correct connections
-    between tile symbols. See file 'map/junctions.map' for reference.
-    Output format:
-    {
-        'map': [{x-coord: tile-index,...},...],
-        'spawns': [[x-coord, y-coord],...]
-    }
-    Where:
-    'map' is a list of tile indexes and coordinates (in tile system),
-    y-coordinate for the tile is the list index itself;
-    'spawns' is a list of asteroid spawn points with its absolute
-    coordinates."""
-    with open(filename) as f:
-        lines = f.readlines()
-
-    lines.reverse()
-
-    tiles = []
-    spawns = []
-    for y in range(0, len(lines)):
-        line = lines[y]
-        map_line = {}
-        for x in range(0, len(lines[y])):
-            # Preparing tile indexes from characters
-            if line[x] == '-':
-                map_line[x] = TILE_MIDLEFT_MIDRIGHT
-            elif line[x] == '|':
-                map_line[x] = TILE_MIDTOP_MIDBOT
-            elif line[x] == '/':
-                map_line[x] = TILE_BOTLEFT_TOPRIGHT
-            elif line[x] == '\\':
-                map_line[x] = TILE_TOPLEFT_BOTRIGHT
-            elif line[x] == '*':
-                # Assigning surrounding box characters
-                left, topleft, top, topright = None, None, None, None
-                right, bottomright, bottom, bottomleft = None, None, None, None
-
-                if x > 0:
-                    left = line[x-1]
-                    if y > 0:
-                        if x <= len(lines[y-1]):
-                            bottomleft = lines[y-1][x-1]
-                    if y < len(lines) - 1:
-                        if x <= len(lines[y+1]):
-                            topleft = lines[y+1][x-1]
-                if x < len(line) - 1:
-                    right = line[x+1]
-                    if y > 0:
-                        if x < len(lines[y-1]) - 1:
-                            bottomright = lines[y-1][x+1]
-                    if y < len(lines) - 1:
-                        if x < len(lines[y+1]) - 1:
-                            topright = lines[y+1][x+1]
-                if y > 0:
-                    if x < len(lines[y-1]):
-                        bottom = lines[y-1][x]
-                if y < len(lines) - 1:
-                    if x < len(lines[y+1]):
-                        top = lines[y+1][x]
-
-                map_line[x] = _recognize_pattern(
-                    left=left, topleft=topleft, top=top, topright=topright,
-                    right=right, bottomright=bottomright, bottom=bottom,
-                    bottomleft=bottomleft)
-
-            elif line[x] == '+':
-                # Asteroid spawn point
-                spawns.append([x, y])
-
-        tiles.append(map_line)
-
-    # Processing diagonals
-    for y in range(0, len(tiles)):
-        map_line = tiles[y].copy()
-        for x, index in map_line.items():
-            if index == TILE_BOTLEFT_TOPRIGHT:
-                tiles[y][x-1] = TILE_BOTRIGHT
-                tiles[y][x+1] = TILE_TOPLEFT
-                if y > 0:
-                    tiles[y-1][x] = TILE_TOPLEFT
-                if y < len(tiles) - 1:
-                    tiles[y+1][x] = TILE_BOTRIGHT
-            elif index == TILE_TOPLEFT_BOTRIGHT:
-                tiles[y][x-1] = TILE_TOPRIGHT
-                tiles[y][x+1] = TILE_BOTLEFT
-                if y > 0:
-                    tiles[y-1][x] = TILE_TOPRIGHT
-                if y < len(tiles) - 1:
-                    tiles[y+1][x] = TILE_BOTLEFT
-
-    # Correcting x-coordinates
-    offset = ceil(mean(tiles[0].keys()))
-    for y in range(0, len(tiles)):
-        map_line = tiles[y].copy()
-        tiles[y] = {}
-        for x, index in map_line.items():
-            tiles[y][x-offset] = index
-
-    # The same thing for asteroid spawns
-    for spawn_point in spawns:
-        spawn_point[0] -= offset
-        # And converting spawns coordinates to absolute
-        spawn_point[0] = tile_to_abs(spawn_point[0]) + GRID_SIZE/2
-        spawn_point[1] = tile_to_abs(spawn_point[1]) + GRID_SIZE/2
-
-    return {'map': tiles, 'spawns': spawns}
+"""Module for reading game level map."""
+import io
+from math import ceil
+from statistics import mean
+
+from assets import open_asset, take_preloaded
+from scaling import scaled
+
+# Each map tile is actually a square which side is GRID_SIZE pixels
+# (128 pixels for the original images)
+GRID_SIZE = scaled(128)
+
+TILE_BOTLEFT = 0
+TILE_BOTLEFT_MIDRIGHT = 1
+TILE_BOTLEFT_MIDTOP = 2
+TILE_BOTLEFT_TOPRIGHT = 3
+TILE_BOTRIGHT = 4
+TILE_MIDBOT_MIDRIGHT = 5
+TILE_MIDBOT_TOPRIGHT = 6
+TILE_MIDLEFT_BOTRIGHT = 7
+TILE_MIDLEFT_MIDBOT = 8
+TILE_MIDLEFT_MIDRIGHT = 9
+TILE_MIDLEFT_MIDTOP = 10
+TILE_MIDLEFT_TOPRIGHT = 11
+TILE_MIDTOP_BOTRIGHT = 12
+TILE_MIDTOP_MIDBOT = 13
+TILE_MIDTOP_MIDRIGHT = 14
+TILE_TOPLEFT = 15
+TILE_TOPLEFT_BOTRIGHT = 16
+TILE_TOPLEFT_MIDBOT = 17
+TILE_TOPLEFT_MIDRIGHT = 18
+TILE_TOPRIGHT = 19
+
+def tile_to_abs(coord):
+    """Converts map tile coordinate to absolute coordinate."""
+    return float(coord * GRID_SIZE)
+
+def abs_to_tile(coord):
+    """Converts absolute coordinate to map tile coordinate."""
+    return int(coord) // GRID_SIZE
+
+def _get_line_borders(map_line):
+    """Returns tuple (x_left, x_right) with coordinates of left and right
+    border tiles of the track for single map line. The coordinates are
+    in tile grid system."""
+    x_list = map_line.keys()
+    x_min = min(x_list)
+    x_max = max(x_list)
+    x_left = x_min
+    x_right = x_max
+
+    while x_left < x_max:
+        if (x_left + 1) not in x_list:
+            break
+        else:
+            x_left += 1
+
+    while x_right > x_min:
+        if (x_right - 1) not in x_list:
+            break
+        else:
+            x_right -= 1
+
+    return (x_left, x_right)
+
+def get_borders(tiles):
+    """Returns a list of tuples (x_left, x_right) with coordinates of
+    left and right border tiles of the track for each line of the map
+    (see map_read()). The coordinates are in tile grid system."""
+    return [_get_line_borders(map_line) for map_line in tiles]
+
+def get_track_borders(borders, y):
+    """Returns tuple (x_left, x_right) with absolute coordinates of left
+    and right inner borders of the track being intersected by horizontal
+    line with absolute coordinate y or None if the line is out of the
+    track. Parameter borders is the table returned by get_borders()."""
+    y_tile = abs_to_tile(y)
+    if y_tile < 0 or y_tile > len(borders) - 1:
+        return None
+
+    x_left, x_right = borders[y_tile]
+
+    # Special issue: too narrow track with no gap between borders.
+    # In this case outer borders are returned (not inner)
+    if x_left > x_right:
+        x_left, x_right = x_right, x_left
+
+    return (tile_to_abs(x_left) + GRID_SIZE, tile_to_abs(x_right))
+
+def get_inner_tiles(borders):
+    """Returns a list of all tiles between left and right track borders
+    in format: [(x_tile, y_tile),...]. Parameter borders is the table
+    returned by get_borders()."""
+    inner_tiles = []
+    for y, (x_left, x_right) in enumerate(borders):
+        if x_right - x_left > 1:
+            for x in range(x_left+1, x_right):
+                inner_tiles.append((x, y))
+    return inner_tiles
+
+def _recognize_pattern(left=None, topleft=None, top=None, topright=None,
+                       right=None, bottomright=None, bottom=None,
+                       bottomleft=None):
+    """Returns tile index for junction tile. This tile connects a pair
+    of related tiles adjacent to it."""
+    if left == '-' and bottom == '|':
+        return TILE_MIDLEFT_MIDBOT
+    elif right == '-' and bottom == '|':
+        return TILE_MIDBOT_MIDRIGHT
+    elif left == '-' and top == '|':
+        return TILE_MIDLEFT_MIDTOP
+    elif right == '-' and top == '|':
+        return TILE_MIDTOP_MIDRIGHT
+    elif bottomleft == '/' and right == '-':
+        return TILE_BOTLEFT_MIDRIGHT
+    elif bottomright == '\\' and left == '-':
+        return TILE_MIDLEFT_BOTRIGHT
+    elif bottomleft == '/' and top == '|':
+        return TILE_BOTLEFT_MIDTOP
+    elif bottomright == '\\' and top == '|':
+        return TILE_MIDTOP_BOTRIGHT
+    elif left == '-' and topright == '/':
+        return TILE_MIDLEFT_TOPRIGHT
+    elif right == '-' and topleft == '\\':
+        return TILE_TOPLEFT_MIDRIGHT
+    elif bottom == '|' and topright == '/':
+        return TILE_MIDBOT_TOPRIGHT
+    elif bottom == '|' and topleft == '\\':
+        return TILE_TOPLEFT_MIDBOT
+    else:
+        return None
+
+def map_read(filename):
+    """Reads game level map from special-formatted text file and
+    converts it to list of tiles and asteroid spawn points.
+    The file must contain only allowed symbols and correct connections
+    between tile symbols. See file 'map/junctions.map' for reference.
+    Output format:
+    {
+        'map': [{x-coord: tile-index,...},...],
+        'spawns': [[x-coord, y-coord],...]
+    }
+    Where:
+    'map' is a list of tile indexes and coordinates (in tile system),
+    y-coordinate for the tile is the list index itself;
+    'spawns' is a list of asteroid spawn points with its absolute
+    coordinates.
+    The result may be prepared beforehand by AssetLoader."""
+    map_read_result = take_preloaded('map', filename)
+    if map_read_result is not None:
+        return map_read_result
+
+    with io.TextIOWrapper(open_asset(filename)) as f:
+        lines = f.readlines()
+
+    lines.reverse()
+
+    tiles = []
+    spawns = []
+    for y in range(0, len(lines)):
+        line = lines[y]
+        map_line = {}
+        for x in range(0, len(lines[y])):
+            # Preparing tile indexes from characters
+            if line[x] == '-':
+                map_line[x] = TILE_MIDLEFT_MIDRIGHT
+            elif line[x] == '|':
+                map_line[x] = TILE_MIDTOP_MIDBOT
+            elif line[x] == '/':
+                map_line[x] = TILE_BOTLEFT_TOPRIGHT
+            elif line[x] == '\\':
+                map_line[x] = TILE_TOPLEFT_BOTRIGHT
+            elif line[x] == '*':
+                # Assigning surrounding box characters
+                left, topleft, top, topright = None, None, None, None
+                right, bottomright, bottom, bottomleft = None, None, None, None
+
+                if x > 0:
+                    left = line[x-1]
+                    if y > 0:
+                        if x <= len(lines[y-1]):
+                            bottomleft = lines[y-1][x-1]
+                    if y < len(lines) - 1:
+                        if x <= len(lines[y+1]):
+                            topleft = lines[y+1][x-1]
+                if x < len(line) - 1:
+                    right = line[x+1]
+                    if y > 0:
+                        if x < len(lines[y-1]) - 1:
+                            bottomright = lines[y-1][x+1]
+                    if y < len(lines) - 1:
+                        if x < len(lines[y+1]) - 1:
+                            topright = lines[y+1][x+1]
+                if y > 0:
+                    if x < len(lines[y-1]):
+                        bottom = lines[y-1][x]
+                if y < len(lines) - 1:
+                    if x < len(lines[y+1]):
+                        top = lines[y+1][x]
+
+                map_line[x] = _recognize_pattern(
+                    left=left, topleft=topleft, top=top, topright=topright,
+                    right=right, bottomright=bottomright, bottom=bottom,
+                    bottomleft=bottomleft)
+
+            elif line[x] == '+':
+                # Asteroid spawn point
+                spawns.append([x, y])
+
+        tiles.append(map_line)
+
+    # Processing diagonals
+    for y in range(0, len(tiles)):
+        map_line = tiles[y].copy()
+        for x, index in map_line.items():
+            if index == TILE_BOTLEFT_TOPRIGHT:
+                tiles[y][x-1] = TILE_BOTRIGHT
+                tiles[y][x+1] = TILE_TOPLEFT
+                if y > 0:
+                    tiles[y-1][x] = TILE_TOPLEFT
+                if y < len(tiles) - 1:
+                    tiles[y+1][x] = TILE_BOTRIGHT
+            elif index == TILE_TOPLEFT_BOTRIGHT:
+                tiles[y][x-1] = TILE_TOPRIGHT
+                tiles[y][x+1] = TILE_BOTLEFT
+                if y > 0:
+                    tiles[y-1][x] = TILE_TOPRIGHT
+                if y < len(tiles) - 1:
+                    tiles[y+1][x] = TILE_BOTLEFT
+
+    # Correcting x-coordinates
+    offset = ceil(mean(tiles[0].keys()))
+    for y in range(0, len(tiles)):
+        map_line = tiles[y].copy()
+        tiles[y] = {}
+        for x, index in map_line.items():
+            tiles[y][x-offset] = index
+
+    # The same thing for asteroid spawns
+    for spawn_point in spawns:
+        spawn_point[0] -= offset
+        # And converting spawns coordinates to absolute
+        spawn_point[0] = tile_to_abs(spawn_point[0]) + GRID_SIZE/2
+        spawn_point[1] = tile_to_abs(spawn_point[1]) + GRID_SIZE/2
+
+    return {'map': tiles, 'spawns': spawns}
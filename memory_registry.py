@@ -0,0 +1,149 @@
+"""Module for accounting memory held by surfaces and masks. Every loaded
+or created surface and mask is registered under the name of its
+subsystem (backgrounds, track, asteroids, text, etc.), so the memory is
+broken down by subsystems and checked against their budgets. Don't
+create MemoryRegistry objects manually, use get_memory_registry()
+function instead.
+
+Surfaces are released automatically when they are deleted. Masks can't
+be watched that way, they are accounted until release() is called (the
+masks of the game objects live as long as the game itself)."""
+import atexit
+import weakref
+
+import pygame
+import pygame.mask
+
+# Budgets of the subsystems in bytes, subsystems not listed have no
+# budget
+MEMORY_BUDGETS = {
+    'backgrounds': 24 * 1024 * 1024,
+    'track': 4 * 1024 * 1024,
+    'asteroids': 24 * 1024 * 1024,
+    'explosions': 384 * 1024 * 1024,
+    'stars': 4 * 1024 * 1024,
+    'ship': 16 * 1024 * 1024,
+    'text': 40 * 1024 * 1024,
+    'pause': 16 * 1024 * 1024,
+    }
+
+# Bitmask rows are stored in machine words
+MASK_WORD_BITS = 64
+
+memory_registry = None
+
+def get_size(obj):
+    """Returns the size in bytes of pixel data of the surface (zero for
+    subsurfaces, they share the pixels with their parents) or of bits
+    of the mask."""
+    if isinstance(obj, pygame.mask.Mask):
+        width, height = obj.get_size()
+        words = (width + MASK_WORD_BITS - 1) // MASK_WORD_BITS
+        return words * MASK_WORD_BITS // 8 * height
+    if obj.get_parent() is not None:
+        return 0
+    return obj.get_pitch() * obj.get_height()
+
+class MemoryRegistry():
+    """The class keeps the statistics of the subsystems in format:
+    {subsystem: {'bytes': held now, 'peak': the most held,
+                 'count': number of objects held now}}
+    A warning is printed when the subsystem exceeds its budget (once
+    until it gets back within the budget)."""
+    def __init__(self, budgets=MEMORY_BUDGETS, report=False):
+        """Input parameters:
+        budgets - dict in format {subsystem: bytes};
+        report - if True then the table is printed on exit."""
+        self.budgets = budgets
+        self.stats = {}
+        self.over_budget = set()
+        if report:
+            atexit.register(self.report)
+
+    def _add(self, subsystem, size, count):
+        stats = self.stats.setdefault(subsystem,
+                                      {'bytes': 0, 'peak': 0, 'count': 0})
+        stats['bytes'] += size
+        stats['count'] += count
+        stats['peak'] = max(stats['peak'], stats['bytes'])
+
+        budget = self.budgets.get(subsystem)
+        if budget is None:
+            return
+        if stats['bytes'] > budget:
+            if subsystem not in self.over_budget:
+                self.over_budget.add(subsystem)
+                print(f"Warning: {subsystem} holds {stats['bytes'] // 1024} "
+                      f"KB of surfaces and masks, the budget is "
+                      f"{budget // 1024} KB")
+        else:
+            self.over_budget.discard(subsystem)
+
+    def register(self, subsystem, obj):
+        """Accounts the surface or the mask for the subsystem. Returns
+        the object itself, so the call may wrap creating it."""
+        size = get_size(obj)
+        self._add(subsystem, size, 1)
+        if isinstance(obj, pygame.Surface):
+            finalizer = weakref.finalize(obj, self._add, subsystem, -size, -1)
+            # Surfaces alive on exit are still held for the report
+            finalizer.atexit = False
+        return obj
+
+    def release(self, subsystem, mask):
+        """Stops accounting the mask (surfaces are released
+        automatically)."""
+        self._add(subsystem, -get_size(mask), -1)
+
+    def get_total(self):
+        """Returns total bytes held by all the subsystems."""
+        return sum(stats['bytes'] for stats in self.stats.values())
+
+    def get_table(self):
+        """Returns a list of dicts sorted by bytes held:
+        [{'subsystem', 'bytes', 'peak', 'count', 'budget'},...]"""
+        table = [dict(stats, subsystem=subsystem,
+                      budget=self.budgets.get(subsystem))
+                 for subsystem, stats in self.stats.items()]
+        table.sort(key=lambda row: -row['bytes'])
+        return table
+
+    def report(self):
+        """Prints the table in kilobytes."""
+        print(f"{'SUBSYSTEM':<16} {'HELD KB':>9} {'PEAK KB':>9} "
+              f"{'COUNT':>7} {'BUDGET KB':>10}")
+        for row in self.get_table():
+            budget = '-' if row['budget'] is None else row['budget'] // 1024
+            mark = ' OVER' if row['subsystem'] in self.over_budget else ''
+            print(f"{row['subsystem']:<16} {row['bytes'] // 1024:>9} "
+                  f"{row['peak'] // 1024:>9} {row['count']:>7} "
+                  f"{budget:>10}{mark}")
+        print(f"Total: {self.get_total() // 1024} KB")
+
+
+def parse_budgets(text, budgets=MEMORY_BUDGETS):
+    """Returns a copy of the budgets changed by the text in format
+    'subsystem:megabytes[,subsystem:megabytes...]' (None leaves the
+    budgets as they are)."""
+    budgets = dict(budgets)
+    if text is None:
+        return budgets
+    for item in text.split(','):
+        subsystem, _, megabytes = item.rpartition(':')
+        try:
+            budgets[subsystem.strip()] = int(float(megabytes) * 1024 * 1024)
+        except ValueError:
+            print(f"Invalid memory budget: {item}")
+    return budgets
+
+def init(budgets=MEMORY_BUDGETS, report=False):
+    """Initializes MemoryRegistry instance for further using."""
+    global memory_registry
+    memory_registry = MemoryRegistry(budgets, report)
+
+def get_memory_registry():
+    """Returns MemoryRegistry singleton."""
+    global memory_registry
+    if memory_registry == None:
+        init()
+    return memory_registry
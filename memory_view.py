@@ -0,0 +1,75 @@
+"""Module for showing memory held by surfaces and masks on the screen
+(see MemoryRegistry). The table is refreshed periodically, not every
+frame."""
+from atlas_label import AtlasLabel
+from memory_registry import get_memory_registry
+from scaling import scaled
+
+FONT_SIZE = scaled(24)
+TEXT_COLOR = (109, 207, 246)
+WARNING_COLOR = (255, 96, 96)
+TEXT_OFFSET = scaled(16)
+# Top of the table leaves room for game statistics
+TABLE_TOP = scaled(64)
+# The table is refreshed every REFRESH_FRAMES frames
+REFRESH_FRAMES = 30
+
+class MemoryView():
+    def __init__(self, scr):
+        """Input parameters:
+        scr - Surface for drawing."""
+        self.scr = scr
+        self.visible = False
+        self.frames = 0
+        self.labels = []
+
+    def toggle(self):
+        """Shows or hides the table."""
+        self.visible = not self.visible
+        self.frames = 0
+        self.labels = []
+
+    def _format_row(self, row):
+        budget = '-' if row['budget'] is None else row['budget'] // 1024
+        return (f"{row['subsystem']}: {row['bytes'] // 1024} KB, "
+                f"peak {row['peak'] // 1024} KB, {row['count']} objects, "
+                f"budget {budget} KB")
+
+    def _refresh(self):
+        registry = get_memory_registry()
+        rows = registry.get_table()
+        lines = [(f"SURFACES AND MASKS: {registry.get_total() // 1024} KB",
+                  TEXT_COLOR)]
+        for row in rows:
+            over_budget = (row['budget'] is not None
+                           and row['bytes'] > row['budget'])
+            lines.append((self._format_row(row),
+                          WARNING_COLOR if over_budget else TEXT_COLOR))
+
+        while len(self.labels) < len(lines):
+            self.labels.append(AtlasLabel(self.scr, size=FONT_SIZE))
+        del self.labels[len(lines):]
+        top = self.scr.get_rect().top + TABLE_TOP
+        for label, (text, color) in zip(self.labels, lines):
+            label.set_color(color)
+            label.set_text(text)
+            label.rect.topleft = (self.scr.get_rect().left + TEXT_OFFSET, top)
+            top += label.rect.height
+
+    def update(self):
+        """Refreshes the table if it's time to. Call every frame."""
+        if not self.visible:
+            return
+        if self.frames % REFRESH_FRAMES == 0:
+            self._refresh()
+        self.frames += 1
+
+    def get_signature(self):
+        """Returns a tuple describing the look of the table (see
+        FrameScheduler)."""
+        return tuple(label.get_signature() for label in self.labels)
+
+    def draw(self):
+        """Renders the table if it is shown."""
+        for label in self.labels:
+            label.draw()
@@ -0,0 +1,44 @@
+"""Module for reading command line options with values."""
+import sys
+
+def get_option(name, default=None):
+    """Returns the value of command line option in format name=value
+    (or name and value as separate arguments) or default if there is
+    no such option."""
+    args = sys.argv[1:]
+    for i, arg in enumerate(args):
+        if arg.startswith(name + '='):
+            return arg[len(name) + 1:]
+        if arg == name and i + 1 < len(args):
+            return args[i + 1]
+    return default
+
+def get_size_option(name, default=None):
+    """Returns the value of command line option in format
+    name=WIDTHxHEIGHT as a tuple (width, height) or default if there is
+    no such option."""
+    value = get_option(name)
+    if value is None:
+        return default
+    width, height = value.lower().split('x')
+    return (int(width), int(height))
+
+def get_percent_option(name, default, minimum=1, maximum=None):
+    """Returns the value of command line option in format name=PERCENT
+    as an integer or default if there is no such option. Values which
+    are not integers or are out of the range [minimum, maximum] are
+    reported and replaced with default."""
+    value = get_option(name)
+    if value is None:
+        return default
+    try:
+        percent = int(value)
+    except ValueError:
+        percent = None
+    if (percent is None or percent < minimum
+            or (maximum is not None and percent > maximum)):
+        limits = f"{minimum}..{maximum}" if maximum else f">= {minimum}"
+        print(f"Invalid {name}: {value} (percents {limits} are expected), "
+              f"{default} is used")
+        return default
+    return percent
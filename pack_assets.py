@@ -0,0 +1,60 @@
+"""Packs all game resources into single archive file (see assets.py
+for the format). Usage:
+    pack_assets.py [archive_filename]
+The archive is written to the game directory by default. Delete it
+to get back to loose resource files."""
+import json
+import os
+import struct
+import sys
+
+from assets import (ARCHIVE_FILENAME, ARCHIVE_MAGIC, INDEX_SIZE_FORMAT,
+                    ASSET_DIRS, BASE_DIR)
+
+def get_asset_paths():
+    """Returns sorted list of all resource paths (relative to the game
+    directory, with forward slashes)."""
+    paths = []
+    for directory in ASSET_DIRS:
+        full_directory = os.path.join(BASE_DIR, directory)
+        for filename in os.listdir(full_directory):
+            if os.path.isfile(os.path.join(full_directory, filename)):
+                paths.append(f'{directory}/{filename}')
+    return sorted(paths)
+
+def pack(filename):
+    """Writes the archive with all resources to the file."""
+    paths = get_asset_paths()
+    sizes = [os.path.getsize(os.path.join(BASE_DIR, path)) for path in paths]
+
+    # Offsets depend on the index size which depends on the offsets,
+    # so the index is rebuilt until its size is settled
+    index_size = 0
+    while True:
+        offset = (len(ARCHIVE_MAGIC) + struct.calcsize(INDEX_SIZE_FORMAT)
+                  + index_size)
+        index = {}
+        for path, size in zip(paths, sizes):
+            index[path] = [offset, size]
+            offset += size
+        index_data = json.dumps(index).encode('utf-8')
+        if len(index_data) == index_size:
+            break
+        index_size = len(index_data)
+
+    with open(filename, 'wb') as f:
+        f.write(ARCHIVE_MAGIC)
+        f.write(struct.pack(INDEX_SIZE_FORMAT, len(index_data)))
+        f.write(index_data)
+        for path in paths:
+            with open(os.path.join(BASE_DIR, path), 'rb') as asset:
+                f.write(asset.read())
+
+    print(f"Packed {len(paths)} files ({offset:,} bytes) into {filename}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        pack(sys.argv[1])
+    else:
+        pack(os.path.join(BASE_DIR, ARCHIVE_FILENAME))
@@ -0,0 +1,111 @@
+"""Module for capturing profiles of the game loop with cProfile. There
+are two ways of capturing:
+    on demand - profiling is started and stopped by the hotkey;
+    watchdog - the game is profiled continuously in short windows of
+    frames, and the window is kept only if one of its frames exceeds
+    the threshold (so rare slow frames are caught when they happen).
+Every capture is dumped to .pstats file with a JSON file of the same
+name beside it. The JSON file keeps the tags of the capture: game
+state, level number, entity counts and frame times.
+
+Note: profiling slows the game down, so the frame times of watchdog
+windows are greater than usual and the threshold must allow for it."""
+import cProfile
+import json
+import os
+import time
+
+# Directory for captured profiles (relative to the current directory)
+PROFILE_DIR = 'profiles'
+# Number of frames in the watchdog window
+WATCHDOG_WINDOW = 60
+
+class ProfileCapture():
+    def __init__(self, threshold=None, window=WATCHDOG_WINDOW,
+                 directory=PROFILE_DIR):
+        """Input parameters:
+        threshold - frame time in milliseconds which triggers keeping
+        the watchdog capture; watchdog is disabled if None;
+        window - number of frames in the watchdog window;
+        directory - directory for captured profiles."""
+        self.threshold = threshold
+        self.window = window
+        self.directory = directory
+        self.profile = None
+        # True for on-demand capture, False for watchdog window
+        self.on_demand = False
+        self.frames = 0
+        self.max_frame_time = 0.0
+        self.captures = 0
+
+    def _start(self, on_demand):
+        self.profile = cProfile.Profile()
+        self.on_demand = on_demand
+        self.frames = 0
+        self.max_frame_time = 0.0
+        self.profile.enable()
+
+    def _stop(self, tags=None):
+        """Stops profiling and dumps the capture with given tags (dict)
+        if they are specified, otherwise the capture is discarded."""
+        self.profile.disable()
+        if tags is not None:
+            self._dump(tags)
+        self.profile = None
+
+    def _dump(self, tags):
+        self.captures += 1
+        tags = dict(tags, frames=self.frames,
+                    max_frame_time=round(self.max_frame_time, 2),
+                    on_demand=self.on_demand)
+        name = "_".join((time.strftime('%Y%m%d_%H%M%S'),
+                         str(self.captures),
+                         str(tags.get('state', '')).replace(' ', '_'),
+                         f"level{tags.get('level', '')}"))
+        path = os.path.join(self.directory, name)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self.profile.dump_stats(f"{path}.pstats")
+            with open(f"{path}.json", 'w') as file:
+                json.dump(tags, file, indent=4)
+        except OSError as e:
+            print(f"Can't save profile {path}: {e}")
+        else:
+            print(f"Profile of {self.frames} frames is saved to "
+                  f"{path}.pstats (max frame time "
+                  f"{self.max_frame_time:.1f} ms)")
+
+    def toggle(self, tags):
+        """Starts on-demand capture or stops it and dumps the capture
+        with given tags (dict). Watchdog window being profiled is
+        discarded."""
+        if self.profile is not None and self.on_demand:
+            self._stop(tags)
+            return
+        if self.profile is not None:
+            self._stop()
+        self._start(on_demand=True)
+        print("Profiling started")
+
+    def begin_frame(self):
+        """Starts new watchdog window if needed. Call at the beginning
+        of every frame."""
+        if self.threshold is not None and self.profile is None:
+            self._start(on_demand=False)
+
+    def end_frame(self, frame_time, get_tags):
+        """Takes into account the frame time in milliseconds. At the end
+        of watchdog window the capture is dumped if one of its frames
+        exceeds the threshold and discarded otherwise.
+        get_tags - function returning the tags (dict) of the capture,
+        it's called only if the capture is dumped."""
+        if self.profile is None:
+            return
+        self.frames += 1
+        self.max_frame_time = max(self.max_frame_time, frame_time)
+        if self.on_demand or self.frames < self.window:
+            return
+        if self.max_frame_time > self.threshold:
+            self._stop(get_tags())
+        else:
+            self._stop()
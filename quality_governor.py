@@ -0,0 +1,100 @@
+"""Module for adapting visual quality to the speed of the computer.
+The governor watches rolling frame times and lowers quality step by step
+while the frames overrun the budget, then raises it back when there is
+enough headroom. Every change is logged and current quality level is
+shown on the screen."""
+from collections import deque
+from statistics import mean
+
+from text_label import TextLabel
+from scaling import scaled
+
+# Quality levels: every level includes all the previous reductions
+QUALITY_FULL = 0
+QUALITY_FEWER_STARS = 1
+QUALITY_SMALL_EXPLOSIONS = 2
+QUALITY_FRAME_SKIP = 3
+QUALITY_PLAIN_BACKGROUND = 4
+
+QUALITY_DESCRIPTIONS = (
+    'FULL QUALITY',
+    'FEWER STARS',
+    'SMALLER EXPLOSIONS',
+    'EXPLOSION FRAME SKIPPING',
+    'PLAIN BACKGROUND',
+    )
+
+# Frame time budget in milliseconds
+FRAME_BUDGET = 1000 / 60
+# Number of frames for averaging frame time
+WINDOW_SIZE = 60
+# Quality is lowered if average frame time exceeds the budget multiplied
+# by OVERRUN_RATIO and raised if it is below HEADROOM_RATIO of the budget
+OVERRUN_RATIO = 1.0
+HEADROOM_RATIO = 0.5
+# Minimum number of frames between quality changes
+COOLDOWN = 120
+
+FONT_SIZE = scaled(24)
+TEXT_COLOR = (109, 207, 246)
+TEXT_OFFSET = scaled(16)
+
+class QualityGovernor():
+    def __init__(self, scr, budget=FRAME_BUDGET):
+        """Input parameters:
+        scr - Surface for drawing;
+        budget - frame time budget in milliseconds."""
+        self.scr = scr
+        self.budget = budget
+        self.level = QUALITY_FULL
+        self.frame_times = deque(maxlen=WINDOW_SIZE)
+        self.cooldown = 0
+        self.label = TextLabel(
+            scr=self.scr,
+            text=QUALITY_DESCRIPTIONS[self.level],
+            color=TEXT_COLOR,
+            size=FONT_SIZE)
+
+    def _set_level(self, level, frame_time):
+        self.level = level
+        self.frame_times.clear()
+        self.cooldown = COOLDOWN
+        self.label.set_text(QUALITY_DESCRIPTIONS[self.level])
+        self.label.rect.bottomleft = (
+            self.scr.get_rect().left + TEXT_OFFSET,
+            self.scr.get_rect().bottom - TEXT_OFFSET)
+        print(f"Quality level {self.level} "
+              f"({QUALITY_DESCRIPTIONS[self.level].lower()}), "
+              f"average frame time {frame_time:.1f} ms")
+
+    def add_frame_time(self, frame_time):
+        """Takes into account the time in milliseconds spent for the
+        frame (without waiting for the next one). Returns True if the
+        quality level has been changed and False otherwise."""
+        self.frame_times.append(frame_time)
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return False
+        if len(self.frame_times) < WINDOW_SIZE:
+            return False
+
+        average = mean(self.frame_times)
+        if (average > self.budget * OVERRUN_RATIO
+                and self.level < len(QUALITY_DESCRIPTIONS) - 1):
+            self._set_level(self.level + 1, average)
+            return True
+        if (average < self.budget * HEADROOM_RATIO
+                and self.level > QUALITY_FULL):
+            self._set_level(self.level - 1, average)
+            return True
+        return False
+
+    def reset(self):
+        """Forgets measured frame times (for example, when the game
+        scene has been changed) without changing quality level."""
+        self.frame_times.clear()
+
+    def draw(self):
+        """Renders current quality level if it is reduced."""
+        if self.level > QUALITY_FULL:
+            self.label.draw()
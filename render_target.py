@@ -0,0 +1,46 @@
+"""Module for drawing the game in its logical resolution independently
+of the window size. Game objects draw to the render target surface and
+the finished frame is scaled to the window. If the sizes are equal then
+the window surface is used directly and nothing is scaled."""
+import pygame
+import pygame.display
+import pygame.transform
+
+from memory_registry import get_memory_registry
+
+class RenderTarget():
+    def __init__(self, window_size, scale=1.0, flags=0, smooth=False):
+        """Input parameters:
+        window_size - tuple (width, height) of the window;
+        scale - ratio of logical resolution to the window size;
+        flags - flags for pygame.display.set_mode();
+        smooth - if True then smoothscale is used for scaling the frame
+        to the window (slower, but looks better)."""
+        self.window = pygame.display.set_mode(window_size, flags)
+        self.smooth = smooth
+        window_width, window_height = self.window.get_size()
+        size = (round(window_width * scale), round(window_height * scale))
+        if size == self.window.get_size():
+            self.scr = self.window
+        else:
+            self.scr = get_memory_registry().register(
+                'render target', pygame.Surface(size).convert())
+
+    def get_surface(self):
+        """Returns the surface for drawing in logical resolution."""
+        return self.scr
+
+    def get_scale(self):
+        """Returns the ratio of logical resolution to the window size."""
+        return self.scr.get_width() / self.window.get_width()
+
+    def present(self):
+        """Scales the frame to the window (if needed) and shows it."""
+        if self.scr is not self.window:
+            if self.smooth:
+                pygame.transform.smoothscale(self.scr, self.window.get_size(),
+                                             self.window)
+            else:
+                pygame.transform.scale(self.scr, self.window.get_size(),
+                                       self.window)
+        pygame.display.flip()
@@ -0,0 +1,46 @@
+"""Module for scaling the game to its logical resolution. Game images
+are drawn for the screen height of BASE_HEIGHT pixels; for other
+resolutions the images, grid size, movement speeds and layout constants
+are multiplied by ASSET_SCALE. The scale is derived from the window
+height (--window=WIDTHxHEIGHT) and the render scale
+(--render-scale=PERCENT) or may be set explicitly in percents
+(--asset-scale=PERCENT). Text is scaled as well: font sizes and text
+offsets are given for BASE_HEIGHT and passed through scaled()."""
+from options import get_option, get_size_option, get_percent_option
+
+# Screen height the original images are drawn for
+BASE_HEIGHT = 768
+# The scale is rounded to a multiple of SCALE_STEP, so the tiles (which
+# are 128 pixels) have integer size and there are only a few variants
+# of the images (see AssetVariants)
+SCALE_STEP = 1 / 16
+# Limits of the render scale and the asset scale in percents
+RENDER_SCALE_MIN = 10
+RENDER_SCALE_MAX = 100
+ASSET_SCALE_MIN = 10
+ASSET_SCALE_MAX = 400
+
+# Logical resolution of the game as a ratio to the window size
+RENDER_SCALE = get_percent_option('--render-scale', 100, RENDER_SCALE_MIN,
+                                  RENDER_SCALE_MAX) / 100
+
+def _get_asset_scale():
+    if get_option('--asset-scale') is not None:
+        scale = get_percent_option('--asset-scale', 100, ASSET_SCALE_MIN,
+                                   ASSET_SCALE_MAX) / 100
+    else:
+        window_height = get_size_option('--window', (0, BASE_HEIGHT))[1]
+        scale = window_height * RENDER_SCALE / BASE_HEIGHT
+    return max(round(scale / SCALE_STEP), 1) * SCALE_STEP
+
+ASSET_SCALE = _get_asset_scale()
+
+def scaled(value):
+    """Returns the value (pixels or pixels per frame) multiplied by
+    ASSET_SCALE. Integers are rounded and stay integers (but not less
+    than 1 if the value is positive)."""
+    if isinstance(value, int):
+        if value > 0:
+            return max(round(value * ASSET_SCALE), 1)
+        return round(value * ASSET_SCALE)
+    return value * ASSET_SCALE
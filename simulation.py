@@ -0,0 +1,195 @@
+"""Module for simulating game levels without rendering. The simulation
+steps a level by the same rules as the game does in the playing state:
+ship kinematics, laser charging, the camera (ViewPoint), asteroid
+spawning, collisions with the track and asteroids, lives and score.
+No display surface, images and fonts are needed: collisions are checked
+with the bitmasks (see CollisionMasks) and geometry only, and all the
+coordinates are absolute, so thousands of ticks are simulated per
+second. Typical usage:
+    simulation = LevelSimulation(level_index, seed)
+    result = simulation.run(controller)
+Where controller is a function taking LevelSimulation object and
+setting the controls of its ship every tick.
+
+The ship, the track and the asteroids are the classes of game_rules
+module which the game objects extend, and the collisions are checked by
+the same functions (see game_rules.check_collisions()), so only the
+visual effects aren't simulated. The game spends random numbers on
+explosions, so asteroid animations picked after the first explosion
+differ from the game ones (the run is still reproducible by seed)."""
+import random
+
+import pygame
+
+from scaling import ASSET_SCALE, BASE_HEIGHT
+from map import map_read, get_borders
+from view_point import ViewPoint
+from game_level import LEVELS, scale_ship_speed, scale_ship_acceleration
+from game_stats import STARTING_LIVES, ASTEROID_HIT_PTS, LEVEL_COMPLETE_PTS
+from game_stats import EXTRA_LIFE_PTS
+from game_rules import TrackBody, AsteroidField, ShipBody, get_spawn_points
+from game_rules import check_collisions, restore_ship
+from game_rules import STATUS_NORMAL, STATUS_INACTIVE
+from game_rules import COLLISION_TRACK, COLLISION_ASTEROID, COLLISION_PENALTY
+from laser import LASER_FRAME_COLS, LASER_FRAME_ROWS
+from collision_masks import get_collision_masks
+
+# Viewport of the game in logical resolution (see RenderTarget)
+VIEWPORT_SIZE = (round(1024 * ASSET_SCALE), round(BASE_HEIGHT * ASSET_SCALE))
+# 10 minutes of the game at 60 frames per second
+MAX_TICKS = 36000
+
+RESULT_FINISHED = 'finished'
+RESULT_GAME_OVER = 'game over'
+RESULT_TIMEOUT = 'timeout'
+
+class Viewport():
+    """Stands for the display surface where only its size is needed
+    (see ViewPoint)."""
+    def __init__(self, size):
+        """Input parameters:
+        size - tuple (width, height)."""
+        self.size = size
+
+    def get_rect(self):
+        return pygame.Rect((0, 0), self.size)
+
+class LevelSimulation():
+    """Simulation of single level from LEVELS table. Statistics of the
+    run are kept in the attributes: ticks, lives, score, deaths,
+    asteroids_destroyed and collisions (list of dicts {'kind', 'x', 'y',
+    'tick'}, see COLLISION_... constants)."""
+    def __init__(self, level, seed=None, lives=STARTING_LIVES,
+                 viewport_size=VIEWPORT_SIZE, masks=None):
+        """Input parameters:
+        level - index of the level in LEVELS table;
+        seed - seed for randomness (asteroid spawns and animations); the
+        global random generator is seeded as the game uses it;
+        lives - number of lives at the start of the level;
+        viewport_size - size of the viewport in logical resolution;
+        masks - CollisionMasks object (the shared one if None)."""
+        if seed is not None:
+            random.seed(seed)
+        if masks is None:
+            masks = get_collision_masks()
+        self.level = level
+        settings = LEVELS[level]
+        map_read_result = map_read(f"map/{settings['mapfile']}")
+        self.track = TrackBody(masks.tiles, map_read_result['map'],
+                               get_borders(map_read_result['map']))
+        self.viewport = Viewport(viewport_size)
+        self.view_pt = ViewPoint(self.viewport)
+        scr_height = viewport_size[1]
+        self.view_pt.set_limits(
+            top=self.track.get_track_height() - scr_height / 2,
+            bottom=scr_height / 2)
+        self.finish_line_y = self.track.get_track_height() - scr_height / 2
+
+        self.asteroids = AsteroidField(masks.asteroids)
+        self.asteroids.respawn(
+            get_spawn_points(self.track.get_track_inner_tiles(),
+                             self.track.get_track_height(), scr_height,
+                             settings['asteroids']) +
+            [tuple(spawn_point) for spawn_point in
+             map_read_result['spawns']])
+
+        self.ship = ShipBody(masks.ship, masks.laser,
+                             LASER_FRAME_COLS * LASER_FRAME_ROWS)
+        self.ship.speed = scale_ship_speed(settings['speed'])
+        self.ship.acceleration = scale_ship_acceleration(
+            settings['acceleration'])
+        self.ship.restore((0, 0), reset_control=True)
+
+        self.tick = 0
+        self.result = None
+        self.lives = lives
+        self.score = 0
+        self.deaths = 0
+        self.asteroids_destroyed = 0
+        self.collisions = []
+
+    def _increase_score(self, increment):
+        new_score = self.score + increment
+        if (self.score // EXTRA_LIFE_PTS) != (new_score // EXTRA_LIFE_PTS):
+            self.lives += 1
+        self.score = new_score
+
+    def _ship_explode(self, kind, point=None):
+        if point is None:
+            point = self.ship.get_center()
+        self.collisions.append({'kind': kind, 'x': point[0], 'y': point[1],
+                                'tick': self.tick})
+        self.deaths += 1
+        if self.lives > 0:
+            self.lives -= 1
+        self.ship.explode()
+
+    def _ship_restore(self):
+        destroyed = restore_ship(self.ship, self.track, self.asteroids)
+        if destroyed is not None:
+            self.asteroids_destroyed += destroyed
+
+    def _check_collisions(self):
+        """See SpaceRacer._check_collisions()."""
+        kind, point, laser_hit = check_collisions(self.ship, self.track,
+                                                  self.asteroids)
+        if laser_hit:
+            self.asteroids_destroyed += 1
+            self._increase_score(ASTEROID_HIT_PTS)
+        if kind == COLLISION_ASTEROID:
+            self.asteroids_destroyed += 1
+        if kind is not None:
+            self._ship_explode(kind, point)
+
+    def step(self):
+        """Simulates single tick (a frame of the game). Returns the
+        result of the level (see RESULT_... constants) or None if it's
+        not over yet."""
+        if self.result is not None:
+            return self.result
+        self.tick += 1
+        self.view_pt.update()
+        self.asteroids.update(self.view_pt, self.tick)
+        full_speed = self.ship.update()
+        self.view_pt.set_speed(full_speed)
+        self.view_pt.set_trace_point(self.ship.get_center())
+
+        if self.lives <= 0:
+            self.result = RESULT_GAME_OVER
+        elif self.ship.y > self.finish_line_y:
+            self._increase_score(LEVEL_COMPLETE_PTS)
+            self.result = RESULT_FINISHED
+        elif self.ship.status == STATUS_NORMAL:
+            self._check_collisions()
+        elif self.ship.status == STATUS_INACTIVE:
+            self._ship_restore()
+        return self.result
+
+    def get_progress(self):
+        """Returns the part of the track passed by the ship (0..1)."""
+        return min(max(self.ship.y / self.finish_line_y, 0.0), 1.0)
+
+    def get_result(self):
+        """Returns a dict with the statistics of the run."""
+        return {
+            'level': self.level + 1,
+            'result': self.result or RESULT_TIMEOUT,
+            'ticks': self.tick,
+            'progress': self.get_progress(),
+            'lives': self.lives,
+            'score': self.score,
+            'deaths': self.deaths,
+            'asteroids_destroyed': self.asteroids_destroyed,
+            'collisions': self.collisions,
+            }
+
+    def run(self, controller=None, max_ticks=MAX_TICKS):
+        """Simulates the level till its end or max_ticks. Function
+        controller (if specified) is called every tick with this object
+        to set the controls of the ship. Returns a dict with the
+        statistics of the run (see get_result())."""
+        while self.result is None and self.tick < max_ticks:
+            if controller is not None:
+                controller(self)
+            self.step()
+        return self.get_result()
@@ -0,0 +1,356 @@
+"""Long-run soak test of the game. It cycles the whole state machine
+(title -> level start -> play -> level complete / game over -> ending
+-> title) without a window and sound device, pressing the keys by
+script or at random, and as fast as possible. After every cycle it
+measures resident memory, Python objects by type, surfaces, masks,
+sizes of sprite groups and voices kept by the voice manager. The test
+fails (exit status 1) if any of them grows over its threshold between
+the end of warm-up and the last cycle. Usage:
+    soak.py [--cycles=N] [--input=scripted|random] [--seed=N]
+            [--warmup=N] [--level-frames=N]
+Where:
+--cycles - number of cycles (100 by default);
+--input - scripted input presses the keys the autopilot (see
+autopilot.py) chooses, so the levels are finished; random one presses
+random keys (so it mostly ends with game over);
+--seed - seed for random input and game randomness;
+--warmup - number of cycles before the measurements are compared
+(caches are filled during them);
+--level-frames - if specified then the ship is moved to the finish
+line after this number of frames, so the cycles are shorter.
+The measurements are saved to soak_report.json."""
+import os
+import sys
+
+# No window and sound device are needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import gc
+import json
+import random
+from collections import Counter
+import pygame
+import pygame.mask
+import pygame.mixer
+import pygame.sprite
+
+from options import get_option
+from sound_box import get_sound_box
+from autopilot import Autopilot
+from space_racer import SpaceRacer, STATE_NAMES
+from space_racer import (STATE_TITLE, STATE_PAUSE, STATE_LEVEL_PLAYING,
+                         STATE_ENDING)
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SOAK_REPORT_FILENAME = 'soak_report.json'
+
+DEFAULT_CYCLES = 100
+DEFAULT_WARMUP = 2
+
+# Thresholds of growth between the end of warm-up and the last cycle
+MAX_RSS_GROWTH = 32 * 1024 * 1024
+MAX_OBJECT_GROWTH = 5000
+MAX_SURFACE_GROWTH = 16
+MAX_MASK_GROWTH = 16
+MAX_SPRITE_GROWTH = 64
+MAX_VOICE_GROWTH = 16
+
+# Frames to wait on the title and ending screens before pressing Enter
+SCREEN_FRAMES = 30
+# The game is paused once per level (within first PAUSE_WITHIN frames)
+# for PAUSE_FRAMES frames
+PAUSE_WITHIN = 600
+PAUSE_FRAMES = 10
+# Random input: probability of changing a key every frame
+RANDOM_KEY_CHANCE = 0.1
+CONTROL_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT,
+                pygame.K_SPACE)
+# Number of object types with the greatest growth in the report
+TOP_TYPES = 10
+
+def get_rss():
+    """Returns current resident memory of the process in bytes (peak
+    resident memory where current can't be read)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS - bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def get_reachable_objects(roots):
+    """Returns a list of all the objects reachable from the roots.
+    The garbage collector doesn't list frozen objects (see GCManager)
+    and untracked ones (surfaces, masks), so the references are
+    followed instead."""
+    seen = set()
+    objects = []
+    pending = list(roots)
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        objects.append(obj)
+        pending.extend(gc.get_referents(obj))
+    return objects
+
+def measure(game):
+    """Collects the garbage and returns a dict with resources reachable
+    from the game object and loaded modules."""
+    gc.collect()
+    objects = get_reachable_objects((game, sys.modules))
+    types = Counter(type(obj).__name__ for obj in objects)
+    surfaces = 0
+    masks = 0
+    sprites = 0
+    groups = 0
+    for obj in objects:
+        if isinstance(obj, pygame.Surface):
+            surfaces += 1
+        elif isinstance(obj, pygame.mask.Mask):
+            masks += 1
+        elif isinstance(obj, pygame.sprite.AbstractGroup):
+            groups += 1
+            sprites += len(obj)
+    voices = get_sound_box().voices
+    busy = sum(1 for i in range(pygame.mixer.get_num_channels())
+               if pygame.mixer.Channel(i).get_busy())
+    return {
+        'rss': get_rss(),
+        'objects': len(objects),
+        'types': types,
+        'surfaces': surfaces,
+        'masks': masks,
+        'groups': groups,
+        'sprites': sprites,
+        # The voices and their start times kept for the channel groups
+        'voices': (len(voices.voices) +
+                   sum(len(starts) for starts in voices.starts.values())),
+        'busy_channels': busy,
+        }
+
+class PlayingLevel():
+    """The class presents the level played by the game as a level
+    simulation (see simulation.py) for the autopilot."""
+    def __init__(self, game):
+        """Input parameters:
+        game - SpaceRacer instance playing the level."""
+        self.game = game
+        self.ship = game.ship
+        self.track = game.track
+        self.asteroids = game.asteroids
+        self.level = game.level.get_level()
+        self.finish_line_y = (game.track.get_track_height() -
+                              game.scr.get_rect().height / 2)
+
+    @property
+    def tick(self):
+        """The tick of the asteroid animations (the next frame has the
+        next one)."""
+        return self.asteroids.tick
+
+class SoakInput():
+    """The class presses the keys for the player by posting keyboard
+    events, so the game processes them as usual."""
+    def __init__(self, game, rng, random_input=False, level_frames=None):
+        """Input parameters:
+        game - SpaceRacer instance;
+        rng - random.Random instance;
+        random_input - if True then random keys are pressed while
+        playing, otherwise the keys are chosen by the autopilot;
+        level_frames - if specified then the ship is moved to the
+        finish line after this number of frames of the level."""
+        self.game = game
+        self.rng = rng
+        self.random_input = random_input
+        self.level_frames = level_frames
+        self.state = None
+        # Frames since the state has been changed
+        self.frames = 0
+        # Frames of the level being played (not counting the pause)
+        self.play_frames = 0
+        self.pause_frame = None
+        self.pressed = set()
+        self.autopilot = None
+        self.playing_level = None
+
+    def _post(self, event_type, key):
+        pygame.event.post(pygame.event.Event(event_type, key=key))
+
+    def _set_key(self, key, pressed):
+        if pressed and key not in self.pressed:
+            self.pressed.add(key)
+            self._post(pygame.KEYDOWN, key)
+        elif not pressed and key in self.pressed:
+            self.pressed.discard(key)
+            self._post(pygame.KEYUP, key)
+
+    def _release_keys(self):
+        for key in list(self.pressed):
+            self._set_key(key, False)
+
+    def _steer(self):
+        """Presses the keys for the controls the autopilot has set to
+        the ship."""
+        ship = self.game.ship
+        self.autopilot(self.playing_level)
+        self._set_key(pygame.K_LEFT, ship.moving_left)
+        self._set_key(pygame.K_RIGHT, ship.moving_right)
+        self._set_key(pygame.K_DOWN, ship.moving_down)
+        self._set_key(pygame.K_SPACE, ship.shooting)
+
+    def _press_random(self):
+        if self.rng.random() < RANDOM_KEY_CHANCE:
+            key = self.rng.choice(CONTROL_KEYS)
+            self._set_key(key, key not in self.pressed)
+
+    def _play(self):
+        game = self.game
+        self.play_frames += 1
+        if self.play_frames == self.pause_frame:
+            self._release_keys()
+            self._post(pygame.KEYDOWN, pygame.K_ESCAPE)
+            return
+        if (self.level_frames is not None
+                and self.play_frames > self.level_frames):
+            finish_line_y = (game.track.get_track_height() -
+                             game.scr.get_rect().height / 2)
+            game.ship.set_center(game.ship.get_center()[0], finish_line_y + 1)
+        if self.random_input:
+            self._press_random()
+        else:
+            self._steer()
+
+    def update(self):
+        """Posts the events for the next frame."""
+        state = self.game.state
+        if state != self.state:
+            if self.state == STATE_LEVEL_PLAYING:
+                self._release_keys()
+            if state == STATE_LEVEL_PLAYING and self.state != STATE_PAUSE:
+                self.play_frames = 0
+                self.pause_frame = self.rng.randint(1, PAUSE_WITHIN)
+                self.autopilot = Autopilot()
+                self.playing_level = PlayingLevel(self.game)
+            self.frames = 0
+            self.state = state
+        self.frames += 1
+
+        if state in (STATE_TITLE, STATE_ENDING):
+            if self.frames == SCREEN_FRAMES:
+                self._post(pygame.KEYDOWN, pygame.K_RETURN)
+        elif state == STATE_PAUSE:
+            if self.frames == PAUSE_FRAMES:
+                self._post(pygame.KEYDOWN, pygame.K_ESCAPE)
+        elif state == STATE_LEVEL_PLAYING:
+            self._play()
+
+def get_growth(first, last):
+    """Returns a dict with the growth of measured resources and a list
+    of object types with the greatest growth."""
+    growth = {key: last[key] - first[key]
+              for key in ('rss', 'objects', 'surfaces', 'masks', 'sprites',
+                          'voices')}
+    types = last['types'].copy()
+    types.subtract(first['types'])
+    growth['types'] = [(name, count) for name, count in
+                       types.most_common(TOP_TYPES) if count > 0]
+    return growth
+
+def check_growth(growth):
+    """Returns a list of messages about resources grown over the
+    thresholds."""
+    failures = []
+    for key, threshold in (('rss', MAX_RSS_GROWTH),
+                           ('objects', MAX_OBJECT_GROWTH),
+                           ('surfaces', MAX_SURFACE_GROWTH),
+                           ('masks', MAX_MASK_GROWTH),
+                           ('sprites', MAX_SPRITE_GROWTH),
+                           ('voices', MAX_VOICE_GROWTH)):
+        if growth[key] > threshold:
+            failures.append(f"{key} grew by {growth[key]} "
+                            f"(threshold {threshold})")
+    return failures
+
+def soak(cycles=DEFAULT_CYCLES, random_input=False, seed=None,
+         warmup=DEFAULT_WARMUP, level_frames=None,
+         filename=SOAK_REPORT_FILENAME):
+    """Runs the soak test. Returns True if it has passed."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = SpaceRacer()
+    soak_input = SoakInput(game, rng, random_input, level_frames)
+    measurements = []
+    frames = 0
+    state = game.state
+    while len(measurements) <= warmup + cycles:
+        if not game.load_queue.finished():
+            # Loading runs in time slices, so it's paced as usual
+            game.scheduler.tick()
+        soak_input.update()
+        game._run_frame()
+        frames += 1
+        if game.state != state:
+            # The cycle ends with the state preceding the title screen
+            last_state, state = state, game.state
+            if state == STATE_TITLE and game.load_queue.finished():
+                measurement = measure(game)
+                measurement['frames'] = frames
+                measurement['end'] = STATE_NAMES[last_state]
+                measurements.append(measurement)
+                print(f"Cycle {len(measurements) - 1} ({measurement['end']}): "
+                      f"frames {frames}, "
+                      f"RSS {measurement['rss'] // 1024} KB, "
+                      f"objects {measurement['objects']}, "
+                      f"surfaces {measurement['surfaces']}, "
+                      f"masks {measurement['masks']}, "
+                      f"sprites {measurement['sprites']}, "
+                      f"voices {measurement['voices']}, "
+                      f"busy channels {measurement['busy_channels']}")
+
+    # Caches are filled during the warm-up cycles
+    growth = get_growth(measurements[warmup], measurements[-1])
+    failures = check_growth(growth)
+    with open(filename, 'w') as f:
+        json.dump({'cycles': cycles, 'warmup': warmup,
+                   'input': 'random' if random_input else 'scripted',
+                   'seed': seed, 'growth': growth, 'failures': failures,
+                   'measurements': [
+                       {key: value for key, value in measurement.items()
+                        if key != 'types'}
+                       for measurement in measurements]}, f, indent=4)
+
+    print(f"Growth after warm-up: RSS {growth['rss'] // 1024} KB, "
+          f"objects {growth['objects']}, surfaces {growth['surfaces']}, "
+          f"masks {growth['masks']}, sprites {growth['sprites']}, "
+          f"voices {growth['voices']}")
+    for name, count in growth['types']:
+        print(f"    {name}: +{count}")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    if not failures:
+        print("PASSED")
+    return not failures
+
+
+if __name__ == '__main__':
+    seed = get_option('--seed')
+    level_frames = get_option('--level-frames')
+    passed = soak(
+        cycles=int(get_option('--cycles', DEFAULT_CYCLES)),
+        random_input=get_option('--input', 'scripted') == 'random',
+        seed=int(seed) if seed is not None else None,
+        warmup=int(get_option('--warmup', DEFAULT_WARMUP)),
+        level_frames=int(level_frames) if level_frames is not None else None)
+    pygame.quit()
+    sys.exit(0 if passed else 1)
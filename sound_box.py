@@ -1,83 +1,124 @@
-"""Module for playing sounds. It encapsulates SoundBox class and its
-only instance - sound_box. Don't create SoundBox objects manually, use
-sound_box object instead."""
-from random import randint
-from pygame.mixer import Sound
-
-EXPLOSION_VOLUME = 0.8
-EXPLOSION_FILES = (
-    'explosion_01.wav',
-    'explosion_02.wav',
-    'explosion_03.wav',
-    'explosion_04.wav',
-    )
-
-MULTI_EXPLOSION_VOLUME = 0.8
-MULTI_EXPLOSION_FILES = (
-    'multi_explosion_01.wav',
-    'multi_explosion_02.wav',
-    )
-
-LASER_VOLUME = 0.4
-LASER_FILES = (
-    'laser_01.wav',
-    'laser_02.wav',
-    'laser_03.wav',
-    'laser_04.wav',
-    )
-
-EXTRA_LIFE_VOLUME = 1.0
-EXTRA_LIFE_FILE = 'extra_life.wav'
-
-sound_box = None
-
-class SoundBox():
-    def __init__(self):
-        self.explosion_sounds = []
-        for filename in EXPLOSION_FILES:
-            sound = Sound(f"snd/{filename}")
-            sound.set_volume(EXPLOSION_VOLUME)
-            self.explosion_sounds.append(sound)
-
-        self.multi_explosion_sounds = []
-        for filename in MULTI_EXPLOSION_FILES:
-            sound = Sound(f"snd/{filename}")
-            sound.set_volume(MULTI_EXPLOSION_VOLUME)
-            self.multi_explosion_sounds.append(sound)
-
-        self.laser_sounds = []
-        for filename in LASER_FILES:
-            sound = Sound(f"snd/{filename}")
-            sound.set_volume(LASER_VOLUME)
-            self.laser_sounds.append(sound)
-
-        self.extra_life_sound = Sound(f"snd/{EXTRA_LIFE_FILE}")
-        self.extra_life_sound.set_volume(EXTRA_LIFE_VOLUME)
-
-    def play_extra_life(self):
-        self.extra_life_sound.play()
-
-    def play_explosion(self):
-        index = randint(0, len(self.explosion_sounds) - 1)
-        self.explosion_sounds[index].play()
-
-    def play_multi_explosion(self):
-        index = randint(0, len(self.multi_explosion_sounds) - 1)
-        self.multi_explosion_sounds[index].play()
-
-    def play_laser(self):
-        index = randint(0, len(self.laser_sounds) - 1)
-        self.laser_sounds[index].play()
-
-
-def init():
-    """Initializes SoundBox instance for further using."""
-    global sound_box
-    sound_box = SoundBox()
-
-def get_sound_box():
-    """Returns SoundBox singleton."""
-    global sound_box
-    if sound_box == None:
-        init()
-    return sound_box
+"""Module for playing sounds. It encapsulates SoundBox class and its
+only instance - sound_box. Don't create SoundBox objects manually, use
+sound_box object instead."""
+from random import randint
+
+from assets import load_sound
+from voice_manager import VoiceManager
+
+EXPLOSION_VOLUME = 0.8
+EXPLOSION_FILES = (
+    'explosion_01.wav',
+    'explosion_02.wav',
+    'explosion_03.wav',
+    'explosion_04.wav',
+    )
+
+MULTI_EXPLOSION_VOLUME = 0.8
+MULTI_EXPLOSION_FILES = (
+    'multi_explosion_01.wav',
+    'multi_explosion_02.wav',
+    )
+
+LASER_VOLUME = 0.4
+LASER_FILES = (
+    'laser_01.wav',
+    'laser_02.wav',
+    'laser_03.wav',
+    'laser_04.wav',
+    )
+
+EXTRA_LIFE_VOLUME = 1.0
+EXTRA_LIFE_FILE = 'extra_life.wav'
+
+# Sound categories
+CATEGORY_EXPLOSION = 0
+CATEGORY_MULTI_EXPLOSION = 1
+CATEGORY_LASER = 2
+CATEGORY_EXTRA_LIFE = 3
+
+# Channel groups for sound categories (see VoiceManager)
+CHANNEL_GROUPS = {
+    CATEGORY_EXPLOSION: {
+        'channels': 4,
+        'priority': 1,
+        'coalesce': 80,
+        'rate': 8,
+        },
+    CATEGORY_MULTI_EXPLOSION: {
+        'channels': 1,
+        'priority': 3,
+        'coalesce': 200,
+        'rate': 2,
+        },
+    CATEGORY_LASER: {
+        'channels': 2,
+        'priority': 2,
+        'coalesce': 40,
+        'rate': 6,
+        },
+    CATEGORY_EXTRA_LIFE: {
+        'channels': 1,
+        'priority': 4,
+        'coalesce': 500,
+        'rate': 2,
+        },
+    }
+
+sound_box = None
+
+class SoundBox():
+    def __init__(self, report=False):
+        """Input parameters:
+        report - if True then the statistics of the voices are printed
+        on exit."""
+        # The sounds are kept at full volume, their volumes are applied
+        # by the voice manager
+        self.voices = VoiceManager(CHANNEL_GROUPS, report=report)
+
+        self.explosion_sounds = [load_sound(f"snd/{filename}")
+                                 for filename in EXPLOSION_FILES]
+        self.multi_explosion_sounds = [load_sound(f"snd/{filename}")
+                                       for filename in MULTI_EXPLOSION_FILES]
+        self.laser_sounds = [load_sound(f"snd/{filename}")
+                             for filename in LASER_FILES]
+        self.extra_life_sound = load_sound(f"snd/{EXTRA_LIFE_FILE}")
+
+    def set_view_point(self, view_point):
+        """Sets ViewPoint class instance for stereo panning."""
+        self.voices.set_view_point(view_point)
+
+    def play_extra_life(self):
+        self.voices.play(CATEGORY_EXTRA_LIFE, self.extra_life_sound,
+                         EXTRA_LIFE_VOLUME)
+
+    def play_explosion(self, x=None):
+        """If specified, x is absolute x-coordinate of the explosion
+        (the same for other sounds)."""
+        index = randint(0, len(self.explosion_sounds) - 1)
+        self.voices.play(CATEGORY_EXPLOSION, self.explosion_sounds[index],
+                         EXPLOSION_VOLUME, x)
+
+    def play_multi_explosion(self, x=None):
+        index = randint(0, len(self.multi_explosion_sounds) - 1)
+        self.voices.play(CATEGORY_MULTI_EXPLOSION,
+                         self.multi_explosion_sounds[index],
+                         MULTI_EXPLOSION_VOLUME, x)
+
+    def play_laser(self, x=None):
+        index = randint(0, len(self.laser_sounds) - 1)
+        self.voices.play(CATEGORY_LASER, self.laser_sounds[index],
+                         LASER_VOLUME, x)
+
+
+def init(report=False):
+    """Initializes SoundBox instance for further using."""
+    global sound_box
+    sound_box = SoundBox(report)
+
+def get_sound_box():
+    """Returns SoundBox singleton."""
+    global sound_box
+    if sound_box == None:
+        init()
+    return sound_box
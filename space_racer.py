@@ -1,342 +1,699 @@
-"""Main program module. It pulls all other game modules together and
-ensures running the game."""
-import sys
-from random import randint
-from statistics import mean
-
-import pygame
-import pygame.mixer
-from pygame.time import Clock
-
-import sound_box
-from view_point import ViewPoint
-from track import Track
-from game_level import GameLevel
-from game_stats import GameStats
-from game_stats import ASTEROID_HIT_PTS, LEVEL_COMPLETE_PTS, EXTRA_LIFE_PTS
-from ship import Ship
-from ship import STATUS_INACTIVE as SHIP_STATUS_INACTIVE
-from ship import STATUS_NORMAL as SHIP_STATUS_NORMAL
-from explosions import Explosions
-from asteroids import Asteroids
-from stars import Stars
-from loading_screen import LoadingScreen
-from title_screen import TitleScreen
-from level_start_screen import LevelStartScreen
-from level_complete_effect import LevelCompleteEffect
-from game_over_effect import GameOverEffect
-from pause_screen import PauseScreen
-from ending_screen import EndingScreen
-
-if '--fullscreen' in sys.argv:
-    VID_MODE_FLAGS = pygame.FULLSCREEN | pygame.DOUBLEBUF | pygame.HWSURFACE
-else:
-    VID_MODE_FLAGS = 0
-
-SCREEN_SIZE = (1024, 768)
-WINDOW_CAPTION = "SPACE RACER"
-FRAMERATE = 60
-SOUND_BUFFER = 512
-MUSIC_FADEOUT = 2000
-
-# Each of the following constants represents continuous game state
-STATE_TITLE = 0
-STATE_PAUSE = 1
-STATE_LEVEL_STARTING = 2
-STATE_LEVEL_PLAYING = 3
-STATE_LEVEL_FINISHING = 4
-STATE_GAME_OVER = 5
-STATE_ENDING = 6
-
-class SpaceRacer():
-    """Represents the game itself"""
-    def __init__(self):
-        """Creates all game objects needed, loads resources, initializes
-        pygame library and sound mixer, sets display mode, etc."""
-        self.state = STATE_TITLE
-        pygame.mixer.pre_init(buffer=SOUND_BUFFER)
-        pygame.init()
-        self.clock = Clock()
-        self.scr = pygame.display.set_mode(SCREEN_SIZE, VID_MODE_FLAGS)
-        pygame.display.set_caption(WINDOW_CAPTION)
-        pygame.mouse.set_visible(False)
-        LoadingScreen(self.scr).draw()
-        sound_box.init()
-
-        self.level = GameLevel()
-        self.stats = GameStats(self.scr)
-        self.view_pt = ViewPoint(self.scr)
-        self.stars = Stars(self.scr, self.view_pt)
-        self.track = Track(self.scr, self.view_pt)
-        self.explosions = Explosions(self.scr, self.view_pt)
-        self.ship = Ship(self.scr, self.view_pt, self.explosions)
-        self.asteroids = Asteroids(self.scr, self.view_pt, self.explosions,
-                                   self.track)
-        self.title_screen = TitleScreen(self.scr, self.view_pt, self.stars)
-        self.level_start_screen = LevelStartScreen(self.scr)
-        self.level_complete_effect = LevelCompleteEffect(self.scr)
-        self.game_over_effect = GameOverEffect(self.scr)
-        self.pause_screen = PauseScreen(self.scr)
-        self.ending_screen = EndingScreen(self.scr)
-
-        self._init_title()
-
-    def run(self):
-        """The only public method just runs the game. It starts infinite
-        loop where game objects are updated, drawn and interacts with
-        each other. Also system events are processed."""
-        while True:
-            self.clock.tick(FRAMERATE)
-            # print(f"FPS: {round(self.clock.get_fps(), 2)}")
-            self._process_events()
-            self._update_objects()
-            self._interact_objects()
-            self._draw_objects()
-
-    def _init_title(self):
-        self.state = STATE_TITLE
-        self.stats.reset()
-        self.level.restart()
-        self.title_screen.restart()
-        self.title_screen.play_music()
-
-    def _init_level_starting(self):
-        self.state = STATE_LEVEL_STARTING
-        self.level_start_screen.set_level_number(self.level.get_level())
-        self.level_start_screen.set_subtitle_text(self.level.get_description())
-        self.level_start_screen.restart()
-
-    def _init_level_playing(self):
-        self.state = STATE_LEVEL_PLAYING
-        self.level.play_music()
-        self.view_pt.reset()
-        self.stars.respawn()
-        self.track.set_tile_map(self.level.get_map())
-
-        top_limit = (self.track.get_track_height() -
-                     self.scr.get_rect().height/2)
-        bottom_limit = self.scr.get_rect().height/2
-        self.view_pt.set_limits(top=top_limit, bottom=bottom_limit)
-
-        self.explosions.items.empty()
-        self.asteroids.set_spawn_density(self.level.get_asteroids_density())
-        self.asteroids.respawn(self.level.get_asteroid_spawns())
-
-        self.ship.set_speed(self.level.get_ship_speed())
-        self.ship.set_acceleration(self.level.get_ship_acceleration())
-        self.ship.restore((0, 0), reset_control=True)
-
-    def _init_level_finishing(self):
-        self.state = STATE_LEVEL_FINISHING
-        self.stats.increase_score(LEVEL_COMPLETE_PTS)
-        self.level_complete_effect.restart()
-        self.ship.set_autopilot()
-        pygame.mixer.music.fadeout(MUSIC_FADEOUT)
-
-    def _init_game_over(self):
-        self.state = STATE_GAME_OVER
-        self.game_over_effect.restart()
-        pygame.mixer.music.fadeout(MUSIC_FADEOUT)
-
-    def _init_ending(self):
-        self.state = STATE_ENDING
-        self.ending_screen.set_score(self.stats.score)
-        self.ending_screen.restart()
-        self.ending_screen.play_music()
-
-    def _init_pause(self):
-        self.state = STATE_PAUSE
-        self.pause_screen.refresh_background()
-        pygame.mixer.music.pause()
-
-    def _ship_control(self, key, control_status):
-        """Returns True if the key was a ship direction control key."""
-        key_processed = True
-
-        if key == pygame.K_UP:
-            self.ship.moving_up = control_status
-        elif key == pygame.K_DOWN:
-            self.ship.moving_down = control_status
-        elif key == pygame.K_LEFT:
-            self.ship.moving_left = control_status
-        elif key == pygame.K_RIGHT:
-            self.ship.moving_right = control_status
-        elif key == pygame.K_SPACE:
-            self.ship.shooting = control_status
-        else:
-            key_processed = False
-
-        return key_processed
-
-    def _process_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-
-            if self.state == STATE_TITLE:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        sys.exit()
-                    elif event.key == pygame.K_RETURN:
-                        pygame.mixer.music.fadeout(MUSIC_FADEOUT)
-                        self._init_level_starting()
-
-            elif self.state == STATE_PAUSE:
-                if event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_ESCAPE, pygame.K_PAUSE):
-                        self.state = STATE_LEVEL_PLAYING
-                        pygame.mixer.music.unpause()
-                    elif event.key == pygame.K_RETURN:
-                        sys.exit()
-
-            elif self.state == STATE_LEVEL_PLAYING:
-                if event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_ESCAPE, pygame.K_PAUSE):
-                        self._init_pause()
-                    else:
-                        self._ship_control(event.key, control_status=True)
-                elif event.type == pygame.KEYUP:
-                    self._ship_control(event.key, control_status=False)
-
-            if self.state == STATE_ENDING:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        sys.exit()
-                    elif event.key == pygame.K_RETURN:
-                        self._init_title()
-
-    def _update_objects(self):
-        if self.state == STATE_TITLE:
-            self.title_screen.update()
-
-        if self.state == STATE_LEVEL_STARTING:
-            self.level_start_screen.update()
-
-        if self.state in (STATE_LEVEL_PLAYING, STATE_LEVEL_FINISHING,
-                          STATE_GAME_OVER):
-            self.view_pt.update()
-            self.stars.update()
-            self.track.update()
-            self.asteroids.update()
-            self.ship.update()
-            self.explosions.update()
-
-        if self.state == STATE_LEVEL_FINISHING:
-            self.level_complete_effect.update()
-
-        if self.state == STATE_GAME_OVER:
-            self.game_over_effect.update()
-
-        if self.state == STATE_ENDING:
-            self.ending_screen.update()
-
-    def _crossed_finish_line(self):
-        finish_line_y = (self.track.get_track_height() -
-                         self.scr.get_rect().height/2)
-        return self.ship.y > finish_line_y
-
-    def _interact_objects(self):
-        if self.state == STATE_LEVEL_STARTING:
-            if self.level_start_screen.finished():
-                self._init_level_playing()
-
-        elif self.state == STATE_LEVEL_PLAYING:
-            if self.stats.game_over():
-                self._init_game_over()
-            elif self._crossed_finish_line():
-                self._init_level_finishing()
-            elif self.ship.status == SHIP_STATUS_NORMAL:
-                self._check_collisions()
-            elif self.ship.status == SHIP_STATUS_INACTIVE:
-                self._ship_restore()
-
-        elif self.state == STATE_LEVEL_FINISHING:
-            if self.level_complete_effect.finished():
-                if self.level.last_level():
-                    self._init_ending()
-                else:
-                    self.level.next_level()
-                    self._init_level_starting()
-
-        elif self.state == STATE_GAME_OVER:
-            if self.game_over_effect.finished():
-                self._init_title()
-
-    def _draw_objects(self):
-        if self.state == STATE_TITLE:
-            self.title_screen.draw()
-
-        if self.state == STATE_PAUSE:
-            self.pause_screen.draw()
-
-        if self.state == STATE_LEVEL_STARTING:
-            self.level_start_screen.draw()
-
-        if self.state in (STATE_LEVEL_PLAYING, STATE_LEVEL_FINISHING,
-                          STATE_GAME_OVER):
-
-            self.scr.blit(self.level.get_background(), (0, 0))
-            self.stars.draw()
-            self.track.draw()
-            self.asteroids.draw()
-            self.ship.draw()
-            self.explosions.draw()
-            self.stats.draw()
-
-        if self.state == STATE_LEVEL_FINISHING:
-            self.level_complete_effect.draw()
-
-        if self.state == STATE_GAME_OVER:
-            self.game_over_effect.draw()
-
-        if self.state == STATE_ENDING:
-            self.ending_screen.draw()
-
-        pygame.display.flip()
-
-    def _ship_explode(self, collide_point=None):
-        """collide_point is a tuple of absolute coordinates: (x, y)"""
-        self.stats.lost_life()
-        self.ship.explode(collide_point)
-
-    def _ship_restore(self):
-        restore_x, restore_y = self.ship.get_center()
-        borders = self.track.get_track_borders(restore_y)
-        if borders:
-            restore_x = mean(borders)
-        if self.ship.restore((restore_x, restore_y)):
-            self.asteroids.explode_nearest(self.ship.get_center())
-
-    def _check_ship_penalty(self):
-        borders = self.track.get_track_borders(self.ship.get_center()[1])
-        if borders:
-            left = self.ship.x
-            right = left + self.ship.rect.width
-            if right < borders[0] or left > borders[1]:
-                self._ship_explode()
-                return True
-        return False
-
-    def _check_collisions(self):
-        collide_point = self.track.collidemask(self.ship.mask, self.ship.rect)
-        if collide_point:
-            self._ship_explode(collide_point)
-            return True
-
-        collide_point = self.asteroids.collidemask(self.ship.mask,
-                                                   self.ship.rect,
-                                                   explode=True)
-        if collide_point:
-            self._ship_explode(collide_point)
-            return True
-
-        if self.ship.laser.shooting():
-            if self.asteroids.collidemask(self.ship.laser.mask,
-                                          self.ship.laser.rect, explode=True):
-                self.stats.increase_score(ASTEROID_HIT_PTS)
-
-        return self._check_ship_penalty()
-
-
-if __name__ == '__main__':
-    SpaceRacer().run()
+"""Main program module. It pulls all other game modules together and
+ensures running the game."""
+import sys
+import time
+from functools import partial
+from random import randint
+
+import pygame
+import pygame.mixer
+from frame_scheduler import FrameScheduler
+
+import sound_box
+import font_registry
+import text_cache
+import animated_sprite
+import memory_registry
+from asset_loader import AssetLoader
+from load_queue import LoadQueue
+from startup_profiler import StartupProfiler
+from tracer import Tracer
+from alloc_profiler import AllocationProfiler
+from gc_manager import GCManager
+from profile_capture import ProfileCapture
+from quality_governor import QualityGovernor
+from memory_view import MemoryView
+from render_target import RenderTarget
+from options import get_option, get_size_option
+from scaling import RENDER_SCALE
+from quality_governor import (QUALITY_FEWER_STARS, QUALITY_SMALL_EXPLOSIONS,
+                              QUALITY_FRAME_SKIP, QUALITY_PLAIN_BACKGROUND)
+from view_point import ViewPoint
+from track import Track, TILE_FILES
+from game_level import GameLevel, LEVELS
+from game_stats import GameStats
+from game_stats import ASTEROID_HIT_PTS, LEVEL_COMPLETE_PTS, EXTRA_LIFE_PTS
+from ship import Ship, SHIP_FILE, JET_FILE
+from laser import LASER_FILE, LASER_FRAME_COLS, LASER_FRAME_ROWS
+from ship import STATUS_INACTIVE as SHIP_STATUS_INACTIVE
+from ship import STATUS_NORMAL as SHIP_STATUS_NORMAL
+from game_rules import check_collisions, restore_ship
+from explosions import Explosions, EXPLOSION_FILES
+from asteroids import Asteroids, ASTEROID_FILES
+from asteroids import FRAME_COLS as ASTEROID_FRAME_COLS
+from asteroids import FRAME_ROWS as ASTEROID_FRAME_ROWS
+from stars import Stars, STAR_FILES, STAR_LIMIT
+from loading_screen import LoadingScreen
+from title_screen import TitleScreen
+from title_screen import BACKGROUND_FILENAME as TITLE_BACKGROUND
+from level_start_screen import LevelStartScreen
+from level_complete_effect import LevelCompleteEffect
+from game_over_effect import GameOverEffect
+from pause_screen import PauseScreen
+from ending_screen import EndingScreen
+from ending_screen import BACKGROUND_FILENAME as ENDING_BACKGROUND
+
+if '--fullscreen' in sys.argv:
+    VID_MODE_FLAGS = pygame.FULLSCREEN | pygame.DOUBLEBUF | pygame.HWSURFACE
+else:
+    VID_MODE_FLAGS = 0
+
+# Startup steps are timed and reported (see StartupProfiler)
+PROFILE_STARTUP = '--profile-startup' in sys.argv
+# Spans of the game loop are written to the file in Chrome trace event
+# format (--trace=FILENAME), see Tracer
+TRACE_FILENAME = get_option('--trace')
+# Allocations of the game loop are accounted (see AllocationProfiler)
+PROFILE_ALLOC = '--profile-alloc' in sys.argv
+# Garbage collection pauses and frame times are reported on exit
+GC_STATS = '--gc-stats' in sys.argv
+# Sounds played, coalesced, dropped and stolen by the voice manager are
+# reported on exit (see VoiceManager)
+SOUND_STATS = '--sound-stats' in sys.argv
+# The frames are profiled continuously and the profile is kept if a frame
+# exceeds the threshold (--profile-watchdog=MILLISECONDS). Profiling may
+# be also started and stopped with PROFILE_KEY. See ProfileCapture.
+PROFILE_WATCHDOG = get_option('--profile-watchdog')
+if PROFILE_WATCHDOG is not None:
+    PROFILE_WATCHDOG = float(PROFILE_WATCHDOG)
+PROFILE_KEY = pygame.K_F10
+# Memory held by surfaces and masks is shown by MEMORY_VIEW_KEY and
+# reported on exit (--memory-stats) along with hits and misses of the text
+# cache. Budgets of the subsystems may be changed by
+# --memory-budget=SUBSYSTEM:MEGABYTES[,SUBSYSTEM:MEGABYTES...]
+# See MemoryRegistry.
+MEMORY_VIEW_KEY = pygame.K_F11
+MEMORY_STATS = '--memory-stats' in sys.argv
+MEMORY_BUDGETS = memory_registry.parse_budgets(get_option('--memory-budget'))
+SCREEN_SIZE = (1024, 768)
+
+# Window size (--window=WIDTHxHEIGHT) and logical resolution of the game
+# in percents of the window size (--render-scale=PERCENT, see scaling.py).
+# The frame rendered in logical resolution is scaled to the window.
+WINDOW_SIZE = get_size_option('--window', SCREEN_SIZE)
+SMOOTH_SCALING = '--smooth' in sys.argv
+WINDOW_CAPTION = "SPACE RACER"
+FRAMERATE = 60
+SOUND_BUFFER = 512
+MUSIC_FADEOUT = 2000
+
+# Each of the following constants represents continuous game state
+STATE_TITLE = 0
+STATE_PAUSE = 1
+STATE_LEVEL_STARTING = 2
+STATE_LEVEL_PLAYING = 3
+STATE_LEVEL_FINISHING = 4
+STATE_GAME_OVER = 5
+STATE_ENDING = 6
+STATE_LOADING = 7
+
+STATE_NAMES = {
+    STATE_TITLE: 'title',
+    STATE_PAUSE: 'pause',
+    STATE_LEVEL_STARTING: 'level starting',
+    STATE_LEVEL_PLAYING: 'level playing',
+    STATE_LEVEL_FINISHING: 'level finishing',
+    STATE_GAME_OVER: 'game over',
+    STATE_ENDING: 'ending',
+    STATE_LOADING: 'loading',
+    }
+
+# Methods of the game traced when tracing is enabled
+TRACED_FRAME_METHODS = (
+    '_run_frame', '_process_events', '_update_objects', '_interact_objects',
+    '_draw_objects', '_draw_background', '_check_collisions',
+    '_ship_restore', '_govern_quality', '_init_level_starting',
+    '_init_level_playing', '_init_level_finishing', '_init_game_over',
+    '_init_title', '_init_ending', '_init_pause',
+    )
+# Methods of game objects traced when tracing is enabled (and accounted
+# by allocation profiler as the subsystem named after the attribute)
+# in format: [(attribute name, method name),...]
+TRACED_OBJECT_METHODS = (
+    ('title_screen', 'update'),
+    ('title_screen', 'draw'),
+    ('level_start_screen', 'update'),
+    ('level_start_screen', 'draw'),
+    ('level_complete_effect', 'update'),
+    ('level_complete_effect', 'draw'),
+    ('game_over_effect', 'update'),
+    ('game_over_effect', 'draw'),
+    ('pause_screen', 'draw'),
+    ('ending_screen', 'update'),
+    ('ending_screen', 'draw'),
+    ('view_pt', 'update'),
+    ('stars', 'update'),
+    ('stars', 'draw'),
+    ('track', 'update'),
+    ('track', 'draw'),
+    ('track', 'collide'),
+    ('asteroids', 'update'),
+    ('asteroids', 'draw'),
+    ('asteroids', 'collide'),
+    ('ship', 'update'),
+    ('ship', 'draw'),
+    ('explosions', 'update'),
+    ('explosions', 'draw'),
+    ('explosions', 'add'),
+    ('stats', 'draw'),
+    ('governor', 'draw'),
+    ('level', 'next_level'),
+    ('level', '_reload'),
+    ('render_target', 'present'),
+    )
+
+# Methods of the game accounted by allocation profiler as subsystems
+# in format: [(method name, subsystem),...]
+ALLOC_FRAME_METHODS = (
+    ('_check_collisions', 'collisions'),
+    ('_ship_explode', 'collisions'),
+    ('_ship_restore', 'collisions'),
+    )
+
+class SpaceRacer():
+    """Represents the game itself"""
+    def __init__(self):
+        """Initializes pygame library and sound mixer, sets display mode,
+        etc. Game objects are created and resources are loaded later by
+        the main loop (see _add_loading_tasks())."""
+        self.state = STATE_LOADING
+        # Every surface and mask is accounted from the very beginning
+        memory_registry.init(MEMORY_BUDGETS, report=MEMORY_STATS)
+        text_cache.init(report=MEMORY_STATS)
+        self.profiler = StartupProfiler(enabled=PROFILE_STARTUP)
+        self.tracer = Tracer(TRACE_FILENAME)
+        for method_name in TRACED_FRAME_METHODS:
+            self.tracer.instrument(self, method_name, method_name)
+        self.tracer.instrument(animated_sprite, 'tick', 'animated_sprite.tick')
+        self.tracer.instrument(pygame.display, 'flip', 'pygame.display.flip')
+        self.alloc_profiler = AllocationProfiler(enabled=PROFILE_ALLOC)
+        self.gc_manager = GCManager(report=GC_STATS)
+        self.profile_capture = ProfileCapture(PROFILE_WATCHDOG)
+        pygame.mixer.pre_init(buffer=SOUND_BUFFER)
+        self.profiler.call('pygame.init', pygame.init)
+        self.scheduler = FrameScheduler(FRAMERATE)
+        self.render_target = self.profiler.call(
+            'set_mode', RenderTarget, WINDOW_SIZE, RENDER_SCALE,
+            VID_MODE_FLAGS, SMOOTH_SCALING)
+        # All game objects draw in logical resolution
+        self.scr = self.render_target.get_surface()
+        pygame.display.set_caption(WINDOW_CAPTION)
+        pygame.mouse.set_visible(False)
+        self.profiler.call('fonts', font_registry.init)
+        self.loading_screen = self.profiler.call('loading screen',
+                                                 LoadingScreen, self.scr)
+        self.governor = QualityGovernor(self.scr)
+        self.memory_view = MemoryView(self.scr)
+
+        # Game objects are created by the loading tasks
+        self.asset_loader = AssetLoader()
+        self.load_queue = LoadQueue(self.profiler)
+        self._add_loading_tasks()
+
+    def _add_loading_tasks(self):
+        """Starts decoding images, building masks and parsing maps in
+        parallel and fills the queue of loading tasks. The title screen
+        is shown as soon as its own resources are ready, the rest is
+        loaded meanwhile."""
+        title_images = [f"img/{filename}" for filename in STAR_FILES]
+        title_images.append(f"img/bg/{TITLE_BACKGROUND}")
+        images = [f"img/{filename}" for filename in (
+            EXPLOSION_FILES + ASTEROID_FILES +
+            (SHIP_FILE, JET_FILE, LASER_FILE))]
+        images.append(f"img/bg/{ENDING_BACKGROUND}")
+        tiles = [f"img/tiles/{filename}" for filename in TILE_FILES]
+        maps = [f"map/{level['mapfile']}" for level in LEVELS]
+        frame_masks = [(f"img/{filename}", ASTEROID_FRAME_COLS,
+                        ASTEROID_FRAME_ROWS) for filename in ASTEROID_FILES]
+        frame_masks.append((f"img/{LASER_FILE}", LASER_FRAME_COLS,
+                            LASER_FRAME_ROWS))
+        self.asset_loader.start(images=title_images + images,
+                                cropped_images=tiles, maps=maps,
+                                frame_masks=frame_masks)
+
+        queue = self.load_queue
+        for path in title_images:
+            queue.add(f"wait {path}",
+                      partial(self.asset_loader.collect, [path]))
+        queue.add('game level', self._load_game_level)
+        queue.add('stars', self._load_stars)
+        queue.add('title screen', self._load_title_screen)
+        queue.add('title start', self._init_title)
+
+        queue.add('sounds', self._load_sounds)
+        for path in images + tiles + maps:
+            queue.add(f"wait {path}",
+                      partial(self.asset_loader.collect, [path]))
+        queue.add('track', self._load_track)
+        queue.add('explosions', self._load_explosions)
+        queue.add('ship', self._load_ship)
+        queue.add('asteroids', self._load_asteroids)
+        for attribute, screen_class in (
+                ('level_start_screen', LevelStartScreen),
+                ('level_complete_effect', LevelCompleteEffect),
+                ('game_over_effect', GameOverEffect),
+                ('pause_screen', PauseScreen),
+                ('ending_screen', EndingScreen)):
+            queue.add(attribute,
+                      partial(self._load_screen, attribute, screen_class))
+
+    def _report_startup(self):
+        """Reports startup profile including the time spent by the
+        workers of the asset loader and the use of the font registry
+        (if profiling is enabled)."""
+        for path, (wall, cpu) in self.asset_loader.timings.items():
+            self.profiler.add(f"prepare {path}", wall, cpu)
+        self.profiler.set_counters(
+            'fonts', font_registry.get_font_registry().get_stats())
+        self.profiler.report()
+
+    def _instrument_objects(self):
+        """Traces the methods of game objects and accounts their
+        allocations (if enabled). Called when all the objects are
+        created."""
+        for attribute, method_name in TRACED_OBJECT_METHODS:
+            obj = getattr(self, attribute)
+            self.tracer.instrument(obj, method_name,
+                                   f"{attribute}.{method_name}")
+            self.alloc_profiler.instrument(obj, method_name, attribute)
+        for method_name, subsystem in ALLOC_FRAME_METHODS:
+            self.alloc_profiler.instrument(self, method_name, subsystem)
+
+    def _load_game_level(self):
+        self.level = GameLevel(background_size=self.scr.get_size())
+        self.stats = GameStats(self.scr)
+        self.view_pt = ViewPoint(self.scr)
+
+    def _load_sounds(self):
+        sound_box.init(report=SOUND_STATS)
+        sound_box.get_sound_box().set_view_point(self.view_pt)
+
+    def _load_stars(self):
+        self.stars = Stars(self.scr, self.view_pt)
+
+    def _load_title_screen(self):
+        self.title_screen = TitleScreen(self.scr, self.view_pt, self.stars)
+        self.title_screen.bake()
+
+    def _load_track(self):
+        self.track = Track(self.scr, self.view_pt)
+
+    def _load_explosions(self):
+        self.explosions = Explosions(self.scr, self.view_pt)
+
+    def _load_ship(self):
+        self.ship = Ship(self.scr, self.view_pt, self.explosions)
+
+    def _load_asteroids(self):
+        self.asteroids = Asteroids(self.scr, self.view_pt, self.explosions,
+                                   self.track)
+
+    def _load_screen(self, attribute, screen_class):
+        """Creates the screen object, stores it as the attribute with
+        given name and renders its animation frames beforehand."""
+        screen = screen_class(self.scr)
+        setattr(self, attribute, screen)
+        if hasattr(screen, 'bake'):
+            screen.bake()
+
+    def run(self):
+        """The only public method just runs the game. It starts infinite
+        loop where game objects are updated, drawn and interacts with
+        each other. Also system events are processed. Frames which
+        look exactly like previous ones are not redrawn."""
+        while True:
+            frames = self.scheduler.tick()
+            # print(f"FPS: {round(self.scheduler.clock.get_fps(), 2)}")
+            frame_start = time.perf_counter()
+            self.profile_capture.begin_frame()
+            self._run_frame(frames)
+            self.tracer.update()
+            self.profile_capture.end_frame(
+                (time.perf_counter() - frame_start) * 1000,
+                self._get_profile_tags)
+
+    def _get_profile_tags(self):
+        """Returns a dict describing current game scene for tagging
+        captured profiles."""
+        tags = {'state': STATE_NAMES[self.state]}
+        if hasattr(self, 'level'):
+            tags['level'] = self.level.get_level()
+        if hasattr(self, 'stars'):
+            tags['stars'] = len(self.stars)
+        for attribute in ('asteroids', 'explosions'):
+            if hasattr(self, attribute):
+                tags[attribute] = len(getattr(self, attribute).items)
+        tags['quality'] = self.governor.level
+        return tags
+
+    def _run_frame(self, frames=1):
+        """Processes events, updates and draws single frame. If more
+        than one frame has elapsed (the game was idle), then the objects
+        are updated for the skipped frames as well."""
+        frame_start = time.perf_counter()
+        self.alloc_profiler.begin_frame(STATE_NAMES[self.state])
+        for i in range(frames - 1):
+            self._update_objects()
+        self._process_events()
+        self._update_objects()
+        self._interact_objects()
+        if self.scheduler.need_redraw(self._get_frame_signature(),
+                                      self._get_frame_static()):
+            self._draw_objects()
+            # Waiting for display refresh doesn't count
+            frame_time = time.perf_counter() - frame_start
+            self._govern_quality(frame_time)
+            self.gc_manager.add_frame_time(frame_time * 1000)
+            self.render_target.present()
+        self.alloc_profiler.end_frame()
+
+    def _govern_quality(self, frame_time):
+        """Passes the time in seconds spent for the gameplay frame to the
+        quality governor and applies new quality level if needed."""
+        if self.state not in (STATE_LEVEL_PLAYING, STATE_LEVEL_FINISHING,
+                              STATE_GAME_OVER):
+            return
+        if not self.governor.add_frame_time(frame_time * 1000):
+            return
+
+        level = self.governor.level
+        if level >= QUALITY_FEWER_STARS:
+            self.stars.set_limit(STAR_LIMIT // 2)
+        else:
+            self.stars.set_limit(STAR_LIMIT)
+        self.explosions.set_quality(small=level >= QUALITY_SMALL_EXPLOSIONS,
+                                    frame_skip=level >= QUALITY_FRAME_SKIP)
+
+    def _init_title(self):
+        self.state = STATE_TITLE
+        self.gc_manager.collect()
+        self.stats.reset()
+        self.level.restart()
+        self.title_screen.restart()
+        self.title_screen.play_music()
+
+    def _init_level_starting(self):
+        self.state = STATE_LEVEL_STARTING
+        # Level transitions are safe points for garbage collection
+        self.gc_manager.collect()
+        self.level_start_screen.set_level_number(self.level.get_level())
+        self.level_start_screen.set_subtitle_text(self.level.get_description())
+        self.level_start_screen.restart()
+
+    def _init_level_playing(self):
+        self.state = STATE_LEVEL_PLAYING
+        self.governor.reset()
+        self.level.play_music()
+        self.view_pt.reset()
+        self.stars.respawn()
+        self.track.set_tile_map(self.level.get_map(), self.level.get_borders())
+
+        top_limit = (self.track.get_track_height() -
+                     self.scr.get_rect().height/2)
+        bottom_limit = self.scr.get_rect().height/2
+        self.view_pt.set_limits(top=top_limit, bottom=bottom_limit)
+
+        self.explosions.items.empty()
+        self.asteroids.set_spawn_density(self.level.get_asteroids_density())
+        self.asteroids.respawn(self.level.get_asteroid_spawns())
+
+        self.ship.set_speed(self.level.get_ship_speed())
+        self.ship.set_acceleration(self.level.get_ship_acceleration())
+        self.ship.restore((0, 0), reset_control=True)
+
+    def _init_level_finishing(self):
+        self.state = STATE_LEVEL_FINISHING
+        self.stats.increase_score(LEVEL_COMPLETE_PTS)
+        self.level_complete_effect.restart()
+        self.ship.set_autopilot()
+        pygame.mixer.music.fadeout(MUSIC_FADEOUT)
+
+    def _init_game_over(self):
+        self.state = STATE_GAME_OVER
+        self.game_over_effect.restart()
+        pygame.mixer.music.fadeout(MUSIC_FADEOUT)
+
+    def _init_ending(self):
+        self.state = STATE_ENDING
+        self.gc_manager.collect()
+        self.ending_screen.set_score(self.stats.score)
+        self.ending_screen.restart()
+        self.ending_screen.play_music()
+
+    def _init_pause(self):
+        self.state = STATE_PAUSE
+        self.pause_screen.refresh_background()
+        pygame.mixer.music.pause()
+        self.gc_manager.collect()
+
+    def _ship_control(self, key, control_status):
+        """Returns True if the key was a ship direction control key."""
+        key_processed = True
+
+        if key == pygame.K_UP:
+            self.ship.moving_up = control_status
+        elif key == pygame.K_DOWN:
+            self.ship.moving_down = control_status
+        elif key == pygame.K_LEFT:
+            self.ship.moving_left = control_status
+        elif key == pygame.K_RIGHT:
+            self.ship.moving_right = control_status
+        elif key == pygame.K_SPACE:
+            self.ship.shooting = control_status
+        else:
+            key_processed = False
+
+        return key_processed
+
+    def _process_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                sys.exit()
+
+            if event.type in (pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT):
+                self.scheduler.invalidate()
+
+            if event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+                self.profile_capture.toggle(self._get_profile_tags())
+
+            if event.type == pygame.KEYDOWN and event.key == MEMORY_VIEW_KEY:
+                self.memory_view.toggle()
+
+            if self.state == STATE_LOADING:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        sys.exit()
+
+            elif self.state == STATE_TITLE:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        sys.exit()
+                    elif event.key == pygame.K_RETURN:
+                        pygame.mixer.music.fadeout(MUSIC_FADEOUT)
+                        if self.load_queue.finished():
+                            self._init_level_starting()
+                        else:
+                            # The game starts when loading is finished
+                            self.state = STATE_LOADING
+
+            elif self.state == STATE_PAUSE:
+                if event.type == pygame.KEYDOWN:
+                    if event.key in (pygame.K_ESCAPE, pygame.K_PAUSE):
+                        self.state = STATE_LEVEL_PLAYING
+                        pygame.mixer.music.unpause()
+                    elif event.key == pygame.K_RETURN:
+                        sys.exit()
+
+            elif self.state == STATE_LEVEL_PLAYING:
+                if event.type == pygame.KEYDOWN:
+                    if event.key in (pygame.K_ESCAPE, pygame.K_PAUSE):
+                        self._init_pause()
+                    else:
+                        self._ship_control(event.key, control_status=True)
+                elif event.type == pygame.KEYUP:
+                    self._ship_control(event.key, control_status=False)
+
+            if self.state == STATE_ENDING:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        sys.exit()
+                    elif event.key == pygame.K_RETURN:
+                        self._init_title()
+
+    def _update_objects(self):
+        # Animations are frozen while the game is paused
+        if self.state != STATE_PAUSE:
+            animated_sprite.tick()
+        self.memory_view.update()
+
+        if not self.load_queue.finished():
+            self.load_queue.run()
+            self.loading_screen.set_progress(self.load_queue.get_progress())
+            if self.load_queue.finished():
+                self._report_startup()
+                self._instrument_objects()
+                self.gc_manager.freeze()
+
+        if self.state == STATE_TITLE:
+            self.title_screen.update()
+
+        if self.state == STATE_LEVEL_STARTING:
+            self.level_start_screen.update()
+
+        if self.state in (STATE_LEVEL_PLAYING, STATE_LEVEL_FINISHING,
+                          STATE_GAME_OVER):
+            self.view_pt.update()
+            self.stars.update()
+            self.track.update()
+            self.asteroids.update()
+            self.ship.update()
+            self.explosions.update()
+
+        if self.state == STATE_LEVEL_FINISHING:
+            self.level_complete_effect.update()
+
+        if self.state == STATE_GAME_OVER:
+            self.game_over_effect.update()
+
+        if self.state == STATE_ENDING:
+            self.ending_screen.update()
+
+    def _crossed_finish_line(self):
+        finish_line_y = (self.track.get_track_height() -
+                         self.scr.get_rect().height/2)
+        return self.ship.y > finish_line_y
+
+    def _interact_objects(self):
+        if self.state == STATE_LOADING:
+            # Loading screen is left for the title screen by the loading
+            # task, so finished loading here means the game start
+            if self.load_queue.finished():
+                self._init_level_starting()
+
+        elif self.state == STATE_LEVEL_STARTING:
+            if self.level_start_screen.finished():
+                self._init_level_playing()
+
+        elif self.state == STATE_LEVEL_PLAYING:
+            if self.stats.game_over():
+                self._init_game_over()
+            elif self._crossed_finish_line():
+                self._init_level_finishing()
+            elif self.ship.status == SHIP_STATUS_NORMAL:
+                self._check_collisions()
+            elif self.ship.status == SHIP_STATUS_INACTIVE:
+                self._ship_restore()
+
+        elif self.state == STATE_LEVEL_FINISHING:
+            if self.level_complete_effect.finished():
+                if self.level.last_level():
+                    self._init_ending()
+                else:
+                    self.level.next_level()
+                    self._init_level_starting()
+
+        elif self.state == STATE_GAME_OVER:
+            if self.game_over_effect.finished():
+                self._init_title()
+
+    def _get_frame_signature(self):
+        """Returns a value describing everything visible in the current
+        frame or None if the frame must be redrawn anyway."""
+        if self.state == STATE_LOADING:
+            signature = self.loading_screen.get_signature()
+        elif self.state == STATE_PAUSE:
+            signature = self.pause_screen.get_signature()
+        elif self.state == STATE_TITLE:
+            signature = self.title_screen.get_signature()
+        elif self.state == STATE_LEVEL_STARTING:
+            signature = self.level_start_screen.get_signature()
+        elif self.state == STATE_ENDING:
+            signature = self.ending_screen.get_signature()
+        else:
+            return None
+
+        return (self.state, signature, self.memory_view.get_signature())
+
+    def _get_frame_static(self):
+        """Returns True if the current frame can't change without user
+        input, the number of frames after which it changes by itself if
+        the screen has settled (only endless animations are left) or
+        False otherwise (see FrameScheduler.need_redraw())."""
+        if self.state == STATE_PAUSE:
+            return True
+        if self.state == STATE_TITLE:
+            screen = self.title_screen
+        elif self.state == STATE_LEVEL_STARTING:
+            screen = self.level_start_screen
+        elif self.state == STATE_ENDING:
+            screen = self.ending_screen
+        else:
+            return False
+
+        if not screen.is_settled():
+            return False
+        frames = screen.get_frames_to_change()
+        return True if frames is None else frames
+
+    def _draw_objects(self):
+        if self.state == STATE_LOADING:
+            self.loading_screen.draw()
+
+        if self.state == STATE_TITLE:
+            self.title_screen.draw()
+
+        if self.state == STATE_PAUSE:
+            self.pause_screen.draw()
+
+        if self.state == STATE_LEVEL_STARTING:
+            self.level_start_screen.draw()
+
+        if self.state in (STATE_LEVEL_PLAYING, STATE_LEVEL_FINISHING,
+                          STATE_GAME_OVER):
+            self._draw_background()
+            self.stars.draw()
+            self.track.draw()
+            self.asteroids.draw()
+            self.ship.draw()
+            self.explosions.draw()
+            self.stats.draw()
+            self.governor.draw()
+
+        if self.state == STATE_LEVEL_FINISHING:
+            self.level_complete_effect.draw()
+
+        if self.state == STATE_GAME_OVER:
+            self.game_over_effect.draw()
+
+        if self.state == STATE_ENDING:
+            self.ending_screen.draw()
+
+        self.memory_view.draw()
+
+    def _draw_background(self):
+        if self.governor.level >= QUALITY_PLAIN_BACKGROUND:
+            self.scr.fill(self.level.get_background_color())
+        else:
+            self.scr.blit(self.level.get_background(), (0, 0))
+
+    def _ship_explode(self, collide_point=None):
+        """collide_point is a tuple of absolute coordinates: (x, y)"""
+        self.stats.lost_life()
+        self.ship.explode(collide_point)
+
+    def _ship_restore(self):
+        restore_ship(self.ship, self.track, self.asteroids)
+
+    def _check_collisions(self):
+        kind, collide_point, laser_hit = check_collisions(
+            self.ship, self.track, self.asteroids)
+        if laser_hit:
+            self.stats.increase_score(ASTEROID_HIT_PTS)
+        if kind is not None:
+            self._ship_explode(collide_point)
+            return True
+        return False
+
+
+if __name__ == '__main__':
+    SpaceRacer().run()
@@ -1,124 +1,227 @@
-"""Module for drawing space full of stars."""
-from random import randint, uniform, choice
-
-import pygame
-
-from star import Star
-
-# Parameters of star animation images
-FRAME_COLS = 6
-FRAME_ROWS = 5
-ANIMATION_SPEED = 0.25
-
-STAR_FILES = (
-    'stars_00.png',
-    'stars_01.png',
-    'stars_02.png',
-    'stars_03.png',
-    'stars_04.png',
-    'stars_05.png',
-    'stars_06.png',
-    'stars_07.png',
-    'stars_08.png',
-    )
-
-# Maximum stars generated
-STAR_LIMIT = 60
-
-class Stars():
-    """The class encapsulates a list of star animations (Star class
-    instances) and images for animations. It provides methods for
-    spawning and adding new stars, deleting 'out-of-order' ones and
-    drawing all the stars at once."""
-    def __init__(self, scr, view_point):
-        """Input parameters:
-        scr - Surface for drawing;
-        view_point - ViewPoint class instance."""
-        self.scr = scr
-        self.view_pt = view_point
-        self.images = []
-        for filename in STAR_FILES:
-            image = pygame.image.load(f"img/{filename}")
-            self.images.append(image)
-        self.items = pygame.sprite.Group()
-        self.respawn()
-
-    def spawn_single(self, rect):
-        """Creates single star inside bounding rect (pygame.Rect) in
-        screen coordinates system at random position."""
-        center_x = randint(rect.left, rect.right)
-        center_y = randint(rect.top, rect.bottom)
-        z = uniform(1, 5)
-        self.add(center_x, center_y, z)
-
-    def respawn(self, visible_only=False):
-        """Initial spawn of the stars. If visible_only is set to True,
-        then stars are created only on viewport."""
-        if visible_only:
-            rect = self.scr.get_rect()
-        else:
-            scr_height = self.scr.get_rect().height
-            scr_width = self.scr.get_rect().width
-            rect = pygame.Rect(int(-scr_width/2), int(-scr_height/2),
-                               scr_width * 2, scr_height * 2)
-        self.clear()
-        for i in range(0, STAR_LIMIT):
-            self.spawn_single(rect)
-
-    def spawn(self):
-        """Spawns new stars."""
-        scr_height = self.scr.get_rect().height
-        scr_width = self.scr.get_rect().width
-        while len(self.items) < STAR_LIMIT:
-            # Double propability for spawning stars in front of the ship
-            area = choice(('left', 'right', 'front', 'top'))
-            if area == 'left':
-                rect = pygame.Rect(-scr_width, -scr_height,
-                                   int(scr_width/2), scr_height * 2)
-            elif area == 'right':
-                rect = pygame.Rect(int(1.5 * scr_width), -scr_height,
-                                   int(scr_width/2), scr_height * 2)
-            else:
-                rect = pygame.Rect(int(-scr_width/2), -scr_height,
-                                   scr_width * 2, int(scr_height/2))
-            self.spawn_single(rect)
-
-    def clear(self):
-        """Removes all the stars."""
-        self.items.empty()
-
-    def add(self, center_x, center_y, z):
-        """Creates new star and adds it to the list. The animation
-        of the star is selected randomly.
-        Input parameters:
-        center_x, center_y - the center of star animation in screen
-        coordinates system;
-        z - depth coordinate of the star (see Star.set_depth())."""
-        star_ind = randint(0, len(self.images) - 1)
-        star = Star(self.images[star_ind], self.scr, self.view_pt,
-                    FRAME_COLS, FRAME_ROWS)
-        star.set_depth(z)
-        star.set_center_scr(center_x, center_y)
-        star.set_speed(ANIMATION_SPEED)
-        self.items.add(star)
-
-    def update(self):
-        """Updates star list (spawns new stars, deletes 'out-of-order'
-        ones) and calls update() method for each active star."""
-        self.spawn()
-
-        scr_height = self.scr.get_rect().height
-        scr_width = self.scr.get_rect().width
-        for star in self.items.sprites()[:]:
-            center_x, center_y = star.get_center_scr()
-            if ((center_x < -scr_width) or (center_x > 2 * scr_width) or
-                                           (center_y > scr_height * 1.5)):
-                self.items.remove(star)
-
-        self.items.update()
-
-    def draw(self):
-        """Draws all stars at one go."""
-        for star in self.items.sprites():
-            star.draw()
-            star.next_frame()
+"""Module for drawing space full of stars. Star positions, depths,
+animation images and frame phases are kept in NumPy arrays, so the whole
+star field is projected, culled and respawned at one go."""
+import numpy as np
+import pygame
+
+from animated_sprite import get_tick
+from asset_variants import get_asset_variants
+from memory_registry import get_memory_registry
+
+# Parameters of star animation images
+FRAME_COLS = 6
+FRAME_ROWS = 5
+FRAME_COUNT = FRAME_COLS * FRAME_ROWS
+ANIMATION_SPEED = 0.25
+
+STAR_FILES = (
+    'stars_00.png',
+    'stars_01.png',
+    'stars_02.png',
+    'stars_03.png',
+    'stars_04.png',
+    'stars_05.png',
+    'stars_06.png',
+    'stars_07.png',
+    'stars_08.png',
+    )
+
+# Maximum stars generated. Drawing cost grows with the number of stars
+# (about 0.5 ms per 1000 stars with RLE frames), 1000 stars cost no more
+# than the original field of 60 stars drawn from subsurfaces
+STAR_LIMIT = 1000
+
+# Range of z-coordinate ('depth') of the stars
+DEPTH_MIN = 1
+DEPTH_MAX = 5
+
+# Spawning areas for new stars (see Stars.spawn())
+AREA_LEFT = 0
+AREA_RIGHT = 1
+AREA_FRONT = 2
+AREA_TOP = 3
+
+class Stars():
+    """The class keeps the state of all the stars in NumPy arrays:
+    absolute coordinates (x, y) of animation upper-left corner,
+    z-coordinate for 'depth' effect, index of animation image and frame
+    phase. While game 'camera' is moving, far stars change their visual
+    position more slowly than near ones. And thus 'parallax' effect is
+    created. The class provides methods for spawning new stars, deleting
+    'out-of-order' ones and drawing all the stars at once."""
+    def __init__(self, scr, view_point):
+        """Input parameters:
+        scr - Surface for drawing;
+        view_point - ViewPoint class instance."""
+        self.scr = scr
+        self.view_pt = view_point
+        # Flat list of frame images: index is image * FRAME_COUNT + frame.
+        # Frames are separate RLE accelerated surfaces: transparent pixels
+        # of the small star images are skipped while blitting, which is
+        # twice as fast as blitting subsurfaces of the sheets
+        self.frames = []
+        frame_widths = []
+        frame_heights = []
+        for filename in STAR_FILES:
+            image = get_asset_variants().get_image(
+                f"img/{filename}", FRAME_COLS, FRAME_ROWS).convert_alpha()
+            width = image.get_rect().width // FRAME_COLS
+            height = image.get_rect().height // FRAME_ROWS
+            frame_widths.append(width)
+            frame_heights.append(height)
+            for frame in range(0, FRAME_COUNT):
+                frame_image = image.subsurface(pygame.Rect(
+                    (frame % FRAME_COLS) * width,
+                    (frame // FRAME_COLS) * height,
+                    width, height)).copy()
+                frame_image.set_alpha(255, pygame.RLEACCEL)
+                self.frames.append(
+                    get_memory_registry().register('stars', frame_image))
+        self.frame_widths = np.array(frame_widths)
+        self.frame_heights = np.array(frame_heights)
+
+        self.rng = np.random.default_rng()
+        # Only first self.limit slots are used for the stars
+        self.limit = STAR_LIMIT
+        self.x = np.zeros(STAR_LIMIT)
+        self.y = np.zeros(STAR_LIMIT)
+        self.z = np.ones(STAR_LIMIT)
+        self.image_ind = np.zeros(STAR_LIMIT, dtype=int)
+        self.phase = np.zeros(STAR_LIMIT)
+        self.alive = np.zeros(STAR_LIMIT, dtype=bool)
+        # Bumped every time stars are spawned or removed
+        self.version = 0
+        self.respawn()
+
+    def __len__(self):
+        """Returns the number of active stars."""
+        return int(np.count_nonzero(self.alive))
+
+    def _spawn(self, indices, left, top, width, height):
+        """Creates stars in the slots with given indices at random
+        positions inside bounding rects in screen coordinates system.
+        Parameters left, top, width and height are either scalars or
+        arrays with one rect for each slot."""
+        count = len(indices)
+        center_x = self.rng.integers(left, np.add(left, width), count,
+                                     endpoint=True)
+        center_y = self.rng.integers(top, np.add(top, height), count,
+                                     endpoint=True)
+        z = self.rng.uniform(DEPTH_MIN, DEPTH_MAX, count)
+        image_ind = self.rng.integers(0, len(STAR_FILES), count)
+
+        # Translating screen center of the animation to 3-d coordinates
+        scr_left = center_x - self.frame_widths[image_ind] / 2
+        scr_top = center_y - self.frame_heights[image_ind] / 2
+        view_pt = self.view_pt
+        self.x[indices] = scr_left * z + view_pt.x - view_pt.half_width
+        self.y[indices] = view_pt.y - scr_top * z + view_pt.half_height
+        self.z[indices] = z
+        self.image_ind[indices] = image_ind
+        self.phase[indices] = self.rng.integers(0, FRAME_COUNT, count)
+        self.alive[indices] = True
+        self.version += 1
+
+    def set_limit(self, limit):
+        """Sets the maximum number of stars (not more than STAR_LIMIT).
+        Extra stars are removed at once, missing ones are spawned
+        gradually as usual."""
+        self.limit = min(limit, STAR_LIMIT)
+        self.alive[self.limit:] = False
+        self.version += 1
+
+    def respawn(self, visible_only=False):
+        """Initial spawn of the stars. If visible_only is set to True,
+        then stars are created only on viewport (with the same density
+        as in the whole spawning area, i.e. a quarter of the limit)."""
+        scr_rect = self.scr.get_rect()
+        self.clear()
+        if visible_only:
+            self._spawn(np.arange(self.limit // 4), scr_rect.left,
+                        scr_rect.top, scr_rect.width, scr_rect.height)
+        else:
+            self._spawn(np.arange(self.limit), int(-scr_rect.width/2),
+                        int(-scr_rect.height/2), scr_rect.width * 2,
+                        scr_rect.height * 2)
+
+    def spawn(self):
+        """Spawns new stars in place of deleted ones."""
+        indices = np.flatnonzero(~self.alive[:self.limit])
+        if len(indices) == 0:
+            return
+
+        scr_height = self.scr.get_rect().height
+        scr_width = self.scr.get_rect().width
+        # Double propability for spawning stars in front of the ship
+        area = self.rng.integers(AREA_LEFT, AREA_TOP, len(indices),
+                                 endpoint=True)
+        left = np.choose(area, (-scr_width, int(1.5 * scr_width),
+                                int(-scr_width/2), int(-scr_width/2)))
+        width = np.choose(area, (int(scr_width/2), int(scr_width/2),
+                                 scr_width * 2, scr_width * 2))
+        height = np.choose(area, (scr_height * 2, scr_height * 2,
+                                  int(scr_height/2), int(scr_height/2)))
+        self._spawn(indices, left, -scr_height, width, height)
+
+    def clear(self):
+        """Removes all the stars."""
+        self.alive[:] = False
+        self.version += 1
+
+    def _get_screen_pos(self):
+        """Translates 3-d coordinates of all the stars to screen 2-d.
+        Returns a tuple of arrays (x, y) with upper-left corners."""
+        scr_x = np.round(self.x - self.view_pt.x + self.view_pt.half_width)
+        scr_y = np.round(self.view_pt.y - self.y + self.view_pt.half_height)
+        return (np.trunc(scr_x / self.z).astype(int),
+                np.trunc(scr_y / self.z).astype(int))
+
+    def get_signature(self):
+        """Returns a tuple describing the look of the star field (see
+        FrameScheduler): it is the same for the same stars, view point
+        and animation frames. Phases are whole frames, so all the stars
+        change their frames at the same ticks."""
+        return (self.version, self.view_pt.x, self.view_pt.y,
+                int(get_tick() * ANIMATION_SPEED))
+
+    def get_frames_to_change(self):
+        """Returns the number of ticks after which the stars change
+        their animation frames."""
+        tick = get_tick()
+        frames = 1
+        while (int((tick + frames) * ANIMATION_SPEED) ==
+               int(tick * ANIMATION_SPEED)):
+            frames += 1
+        return frames
+
+    def update(self):
+        """Deletes 'out-of-order' stars and spawns new ones instead."""
+        scr_height = self.scr.get_rect().height
+        scr_width = self.scr.get_rect().width
+        scr_x, scr_y = self._get_screen_pos()
+        center_x = scr_x + self.frame_widths[self.image_ind] // 2
+        center_y = scr_y + self.frame_heights[self.image_ind] // 2
+        self.alive &= ((center_x >= -scr_width) &
+                       (center_x <= 2 * scr_width) &
+                       (center_y <= scr_height * 1.5))
+        self.spawn()
+
+    def draw(self):
+        """Draws all visible stars at one go. Animation frames are
+        derived from the global animation tick."""
+        scr_rect = self.scr.get_rect()
+        scr_x, scr_y = self._get_screen_pos()
+        frame_widths = self.frame_widths[self.image_ind]
+        frame_heights = self.frame_heights[self.image_ind]
+        visible = (self.alive &
+                   (scr_x < scr_rect.right) & (scr_y < scr_rect.bottom) &
+                   (scr_x + frame_widths > scr_rect.left) &
+                   (scr_y + frame_heights > scr_rect.top))
+        phase = self.phase[visible] + get_tick() * ANIMATION_SPEED
+        frame_ind = (self.image_ind[visible] * FRAME_COUNT +
+                     phase.astype(int) % FRAME_COUNT)
+
+        frames = self.frames
+        self.scr.blits([(frames[i], (x, y)) for i, x, y in zip(
+            frame_ind.tolist(), scr_x[visible].tolist(),
+            scr_y[visible].tolist())], doreturn=False)
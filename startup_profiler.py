@@ -0,0 +1,137 @@
+"""Module for profiling the game startup. Every loading step is timed
+and the memory allocated by the step is measured. The report is printed
+as a table sorted by wall time and saved to JSON file, so the results
+of different builds may be compared.
+
+Note: Python allocations are traced by tracemalloc module which slows
+down the startup noticeably, so the times are relative. Pixel data of
+surfaces is allocated by SDL and isn't seen by tracemalloc, it shows
+up as the growth of resident memory instead (where available)."""
+import json
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    # Resident memory is not measured on this platform
+    resource = None
+
+STARTUP_PROFILE_FILENAME = 'startup_profile.json'
+
+# Width of the step name column in the report table
+NAME_WIDTH = 40
+
+class StartupProfiler():
+    """The class accumulates measurements for named steps. Repeated
+    calls of the same step are summed up. Disabled profiler just calls
+    the functions and costs nearly nothing."""
+    def __init__(self, enabled=True):
+        """Input parameters:
+        enabled - if False then nothing is measured."""
+        self.enabled = enabled
+        self.reported = False
+        # Format: {name: {'wall': seconds, 'cpu': seconds,
+        #                 'allocated': bytes, 'rss': bytes, 'calls': n}}
+        self.steps = {}
+        # Format: {name: {counter: value}}, see set_counters()
+        self.counters = {}
+        self.start_time = time.perf_counter()
+        self.start_cpu_time = time.process_time()
+        # Tracing may be started by another profiler as well
+        self.tracing = self.enabled and not tracemalloc.is_tracing()
+        if self.tracing:
+            tracemalloc.start()
+
+    def _get_rss(self):
+        """Returns peak resident memory of the process in bytes or None
+        if it can't be measured."""
+        if resource is None:
+            return None
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS - bytes
+        if sys.platform != 'darwin':
+            rss *= 1024
+        return rss
+
+    def add(self, name, wall, cpu, allocated=None, rss=None):
+        """Adds the measurement of the step.
+        Input parameters:
+        name - step name;
+        wall, cpu - wall time and CPU time of the step in seconds;
+        allocated - bytes allocated by Python during the step;
+        rss - growth of peak resident memory in bytes."""
+        step = self.steps.setdefault(name, {
+            'wall': 0.0, 'cpu': 0.0, 'allocated': None, 'rss': None,
+            'calls': 0})
+        step['wall'] += wall
+        step['cpu'] += cpu
+        if allocated is not None:
+            step['allocated'] = (step['allocated'] or 0) + allocated
+        if rss is not None:
+            step['rss'] = (step['rss'] or 0) + rss
+        step['calls'] += 1
+
+    def set_counters(self, name, counters):
+        """Sets the counters (a dict in format {counter: value}) of the
+        subsystem with given name which are reported along with the
+        steps (for example, hits and misses of a cache)."""
+        if self.enabled:
+            self.counters[name] = dict(counters)
+
+    def call(self, name, function, *args, **kwargs):
+        """Calls the function with given arguments, measures it as the
+        step with given name and returns its result."""
+        if not self.enabled:
+            return function(*args, **kwargs)
+
+        rss = self._get_rss()
+        allocated = tracemalloc.get_traced_memory()[0]
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        result = function(*args, **kwargs)
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        allocated = tracemalloc.get_traced_memory()[0] - allocated
+        if rss is not None:
+            rss = self._get_rss() - rss
+        self.add(name, wall, cpu, allocated, rss)
+        return result
+
+    def _format_bytes(self, size):
+        if size is None:
+            return '-'
+        return f"{size / 1024:.0f}"
+
+    def report(self, filename=STARTUP_PROFILE_FILENAME):
+        """Saves the measurements to JSON file and prints the table of
+        the steps sorted by wall time. Does nothing if the profiler is
+        disabled or the report has been done already."""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        total_wall = time.perf_counter() - self.start_time
+        total_cpu = time.process_time() - self.start_cpu_time
+        if self.tracing:
+            tracemalloc.stop()
+
+        with open(filename, 'w') as file:
+            json.dump({'total': {'wall': total_wall, 'cpu': total_cpu},
+                       'steps': self.steps, 'counters': self.counters},
+                      file, indent=4)
+
+        print(f"{'STEP':<{NAME_WIDTH}} {'WALL ms':>9} {'CPU ms':>9} "
+              f"{'ALLOC KB':>9} {'RSS KB':>9} {'CALLS':>6}")
+        for name, step in sorted(self.steps.items(),
+                                 key=lambda item: -item[1]['wall']):
+            print(f"{name[:NAME_WIDTH]:<{NAME_WIDTH}} "
+                  f"{step['wall'] * 1000:>9.1f} {step['cpu'] * 1000:>9.1f} "
+                  f"{self._format_bytes(step['allocated']):>9} "
+                  f"{self._format_bytes(step['rss']):>9} "
+                  f"{step['calls']:>6}")
+        print(f"{'TOTAL':<{NAME_WIDTH}} {total_wall * 1000:>9.1f} "
+              f"{total_cpu * 1000:>9.1f}")
+        for name, counters in self.counters.items():
+            print(f"{name}: " + ', '.join(f"{counter} {value}" for
+                                         counter, value in counters.items()))
@@ -0,0 +1,341 @@
+"""Synthetic stress scenarios of the game. Every sweep varies one
+parameter of the level over a range of values, the other parameters are
+kept at DEFAULT_SCENARIO:
+    length - length of the synthetic map in tiles;
+    width - width of the synthetic map (between the borders) in tiles;
+    asteroids - number of asteroids kept around the viewport;
+    explosions - number of explosions kept around the viewport (storm);
+    stars - star limit (not more than STAR_LIMIT);
+    speed - ship speed (as in LEVELS table);
+    acceleration - ship acceleration (as in LEVELS table).
+Synthetic maps are written in map_read() syntax to STRESS_MAP_DIR and
+are read by map_read() itself. Every scenario is played without a window
+and sound device as the playing state of the game does (the ship is
+kept in the middle of the track and can't be destroyed) and the time of
+every subsystem is measured. The scalability curves (frame time against
+entity counts) are saved to stress_report.json. Usage:
+    stress.py [--sweeps=NAME[,NAME...]] [--frames=N] [--seed=N]
+Where:
+--sweeps - names of the sweeps to run (all by default);
+--frames - number of measured frames of every scenario (300 by
+default);
+--seed - seed for randomness of the scenarios."""
+import os
+
+# No window and sound device are needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import json
+import random
+import time
+from statistics import mean
+
+import numpy as np
+import pygame
+
+import font_registry
+import animated_sprite
+from options import get_option
+from scaling import ASSET_SCALE
+from map import map_read, get_borders
+from view_point import ViewPoint
+from track import Track
+from asteroids import Asteroids
+from explosions import Explosions
+from stars import Stars, STAR_LIMIT
+from ship import Ship
+from game_level import scale_ship_speed, scale_ship_acceleration
+
+STRESS_REPORT_FILENAME = 'stress_report.json'
+STRESS_MAP_DIR = 'stress_maps'
+
+STRESS_SCREEN_SIZE = (1024, 768)
+BACKGROUND_COLOR = (0, 0, 0)
+
+DEFAULT_FRAMES = 300
+# Frames played before measuring (caches, animations, spawns)
+WARMUP_FRAMES = 30
+# Frame time budget in milliseconds: the curves report where it's
+# exceeded
+FRAME_BUDGET = 1000 / 60
+
+DEFAULT_SCENARIO = {
+    'length': 400,
+    'width': 6,
+    'asteroids': 0,
+    'explosions': 0,
+    'stars': STAR_LIMIT,
+    'speed': 6,
+    'acceleration': 0,
+    }
+
+SWEEPS = {
+    'length': (100, 400, 1600, 6400, 25600),
+    'width': (4, 16, 64, 256),
+    'asteroids': (0, 10, 100, 1000, 3000),
+    'explosions': (0, 10, 50, 200, 1000),
+    'stars': (0, STAR_LIMIT // 4, STAR_LIMIT // 2, STAR_LIMIT),
+    'speed': (2, 6, 12, 24, 48),
+    'acceleration': (0, 1.0E-5, 2.0E-5, 4.0E-5, 8.0E-5),
+    }
+
+# The track turns aside every BEND_PERIOD tiles (see make_map())
+BEND_PERIOD = 24
+SUBSYSTEMS = ('stars', 'track', 'asteroids', 'ship', 'explosions')
+
+def make_map(length, width):
+    """Returns text of a synthetic map in map_read() syntax: the track
+    of given length and width (in tiles between the borders) zigzags
+    aside by one tile every BEND_PERIOD tiles."""
+    # The lines are built from the start of the track (the bottom of
+    # the file) and are reversed at the end
+    lines = []
+    column = 0
+    while len(lines) < length:
+        if (len(lines) % BEND_PERIOD == BEND_PERIOD - 1
+                and len(lines) + 4 < length):
+            # Both borders are shifted along the diagonals to the right
+            # and back to the left next time
+            if column == 0:
+                step, diagonal = 1, '/'
+            else:
+                step, diagonal = -1, '\\'
+            for char in ('*', diagonal, '*'):
+                lines.append(' ' * column + char + ' ' * width + char)
+                column += step
+            column -= step
+        else:
+            lines.append(' ' * column + '|' + ' ' * width + '|')
+    lines.reverse()
+    return '\n'.join(lines) + '\n'
+
+def write_map(name, length, width):
+    """Writes the synthetic map to STRESS_MAP_DIR and returns its
+    path."""
+    os.makedirs(STRESS_MAP_DIR, exist_ok=True)
+    path = os.path.abspath(os.path.join(STRESS_MAP_DIR, f"{name}.map"))
+    with open(path, 'w') as f:
+        f.write(make_map(length, width))
+    return path
+
+class StressWorld():
+    """The game objects of the playing state without the game itself
+    (no title, screens, statistics, music)."""
+    def __init__(self, scr):
+        """Input parameters:
+        scr - Surface for drawing."""
+        self.scr = scr
+        self.view_pt = ViewPoint(scr)
+        self.track = Track(scr, self.view_pt)
+        self.explosions = Explosions(scr, self.view_pt)
+        self.asteroids = Asteroids(scr, self.view_pt, self.explosions,
+                                   self.track)
+        self.stars = Stars(scr, self.view_pt)
+        self.ship = Ship(scr, self.view_pt, self.explosions)
+        self.scenario = DEFAULT_SCENARIO
+        self.times = {}
+
+    def start(self, scenario, tiles, borders):
+        """Starts the scenario (dict in DEFAULT_SCENARIO format) on given
+        tile map."""
+        self.scenario = scenario
+        self.track.set_tile_map(tiles, borders)
+        self.stars.set_limit(scenario['stars'])
+        self.asteroids.set_spawn_density(0)
+        self._restart()
+
+    def _restart(self):
+        """Returns the ship to the start of the track (as the game does
+        when the level is started)."""
+        scr_height = self.scr.get_rect().height
+        self.view_pt.reset()
+        self.view_pt.set_limits(
+            top=self.track.get_track_height() - scr_height / 2,
+            bottom=scr_height / 2)
+        self.stars.respawn()
+        self.asteroids.respawn()
+        self.explosions.items.empty()
+        self.ship.set_speed(scale_ship_speed(self.scenario['speed']))
+        self.ship.set_acceleration(
+            scale_ship_acceleration(self.scenario['acceleration']))
+        self.ship.restore((0, 0), reset_control=True)
+        self.ship.shooting = True
+
+    def _random_point(self, y_min, y_max):
+        """Returns random absolute point between the track borders."""
+        y = random.uniform(y_min, y_max)
+        borders = self.track.get_track_borders(y)
+        if not borders:
+            return None
+        return (random.uniform(*borders), y)
+
+    def _stress(self):
+        """Keeps the numbers of asteroids and explosions."""
+        view_pt = self.view_pt
+        while len(self.asteroids.items) < self.scenario['asteroids']:
+            point = self._random_point(view_pt.y - view_pt.half_height,
+                                       view_pt.y + 3 * view_pt.half_height)
+            if point is None:
+                break
+            self.asteroids.add(*point)
+        while len(self.explosions.items) < self.scenario['explosions']:
+            point = self._random_point(view_pt.y - view_pt.half_height,
+                                       view_pt.y + view_pt.half_height)
+            if point is None:
+                break
+            self.explosions.add(*point)
+
+    def _steer(self):
+        """Keeps the ship in the middle of the track."""
+        center_x, center_y = self.ship.get_center()
+        borders = self.track.get_track_borders(center_y)
+        if borders:
+            self.ship.set_center(mean(borders), center_y)
+
+    def _time(self, subsystem, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        self.times[subsystem] += (time.perf_counter() - start) * 1000
+        return result
+
+    def run_frame(self):
+        """Plays single frame. Returns a dict with the time of every
+        subsystem in milliseconds."""
+        self.times = dict.fromkeys(SUBSYSTEMS, 0.0)
+        animated_sprite.tick()
+        self._stress()
+        self._steer()
+
+        self.view_pt.update()
+        self._time('stars', self.stars.update)
+        self._time('track', self.track.update)
+        self._time('asteroids', self.asteroids.update)
+        self._time('ship', self.ship.update)
+        self._time('explosions', self.explosions.update)
+
+        # Collisions are checked as usual, but the ship isn't destroyed
+        ship = self.ship
+        self._time('track', self.track.collide, ship.mask, *ship.get_pos())
+        self._time('asteroids', self.asteroids.collide, ship.mask,
+                   *ship.get_pos())
+        if ship.laser_shooting():
+            self._time('asteroids', self.asteroids.collide, ship.laser_mask,
+                       *ship.get_laser_pos())
+
+        self.scr.fill(BACKGROUND_COLOR)
+        self._time('stars', self.stars.draw)
+        self._time('track', self.track.draw)
+        self._time('asteroids', self.asteroids.draw)
+        self._time('ship', self.ship.draw)
+        self._time('explosions', self.explosions.draw)
+
+        finish_line_y = (self.track.get_track_height() -
+                         self.scr.get_rect().height / 2)
+        if ship.y > finish_line_y:
+            self._restart()
+        return self.times
+
+    def get_entities(self):
+        """Returns a dict with the numbers of entities in the frame."""
+        return {
+            'asteroids': len(self.asteroids.items),
+            'explosions': len(self.explosions.items),
+            'stars': len(self.stars),
+            'tiles': len(self.track._visible_tiles or ()),
+            }
+
+def run_scenario(world, name, scenario, frames=DEFAULT_FRAMES):
+    """Plays the scenario and returns a point of the scalability curve:
+    a dict with the average numbers of entities, frame times and
+    times of the subsystems in milliseconds."""
+    start = time.perf_counter()
+    path = write_map(name, scenario['length'], scenario['width'])
+    map_read_result = map_read(path)
+    map_read_time = (time.perf_counter() - start) * 1000
+    borders = get_borders(map_read_result['map'])
+
+    world.start(scenario, map_read_result['map'], borders)
+    for i in range(WARMUP_FRAMES):
+        world.run_frame()
+
+    frame_times = []
+    subsystem_times = dict.fromkeys(SUBSYSTEMS, 0.0)
+    entities = dict.fromkeys(world.get_entities(), 0)
+    for i in range(frames):
+        start = time.perf_counter()
+        times = world.run_frame()
+        frame_times.append((time.perf_counter() - start) * 1000)
+        for subsystem, subsystem_time in times.items():
+            subsystem_times[subsystem] += subsystem_time
+        for entity, count in world.get_entities().items():
+            entities[entity] += count
+
+    frame_times.sort()
+    return {
+        'scenario': scenario,
+        'map_read': map_read_time,
+        'entities': {entity: count / frames
+                     for entity, count in entities.items()},
+        'frame': {
+            'mean': mean(frame_times),
+            'p95': frame_times[int(len(frame_times) * 0.95)],
+            'max': frame_times[-1],
+            },
+        'subsystems': {subsystem: subsystem_time / frames
+                       for subsystem, subsystem_time in
+                       subsystem_times.items()},
+        }
+
+def run_sweep(world, sweep, frames=DEFAULT_FRAMES):
+    """Runs the scenarios of the sweep and returns a dict with the curve
+    (list of points, see run_scenario()) and the first value of the
+    parameter exceeding the frame time budget (None if there is no
+    such value)."""
+    curve = []
+    over_budget = None
+    for value in SWEEPS[sweep]:
+        scenario = dict(DEFAULT_SCENARIO, **{sweep: value})
+        point = run_scenario(world, f"{sweep}_{value:g}", scenario, frames)
+        point['value'] = value
+        curve.append(point)
+        if over_budget is None and point['frame']['mean'] > FRAME_BUDGET:
+            over_budget = value
+        entities = ', '.join(f"{entity} {count:.0f}" for entity, count
+                             in point['entities'].items())
+        subsystems = ', '.join(f"{subsystem} {subsystem_time:.2f}"
+                               for subsystem, subsystem_time
+                               in point['subsystems'].items())
+        print(f"{sweep}={value:g}: frame {point['frame']['mean']:.2f} ms "
+              f"(p95 {point['frame']['p95']:.2f}, "
+              f"max {point['frame']['max']:.2f}), map_read "
+              f"{point['map_read']:.0f} ms; {entities}; {subsystems}")
+    if over_budget is not None:
+        print(f"{sweep}: frame time budget is exceeded at {over_budget:g}")
+    return {'curve': curve, 'over_budget': over_budget}
+
+def stress(sweeps=tuple(SWEEPS), frames=DEFAULT_FRAMES, seed=None,
+           filename=STRESS_REPORT_FILENAME):
+    """Runs the sweeps and saves the report."""
+    random.seed(seed)
+    pygame.init()
+    scr = pygame.display.set_mode(STRESS_SCREEN_SIZE)
+    font_registry.init()
+    world = StressWorld(scr)
+    world.stars.rng = np.random.default_rng(seed)
+    report = {'frames': frames, 'seed': seed, 'asset_scale': ASSET_SCALE,
+              'frame_budget': FRAME_BUDGET, 'sweeps': {}}
+    for sweep in sweeps:
+        report['sweeps'][sweep] = run_sweep(world, sweep, frames)
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=4)
+    pygame.quit()
+    return report
+
+
+if __name__ == '__main__':
+    seed = get_option('--seed')
+    sweeps = get_option('--sweeps')
+    stress(sweeps=sweeps.split(',') if sweeps else tuple(SWEEPS),
+           frames=int(get_option('--frames', DEFAULT_FRAMES)),
+           seed=int(seed) if seed is not None else None)
@@ -0,0 +1,130 @@
+"""Module for caching rendered text. It encapsulates TextCache class and
+its only instance - text_cache. Don't create TextCache objects manually,
+use get_text_cache() function instead.
+
+Every text is rasterized by the font only once, in white color. Colored
+and transparent variants are derived from it by cheap surface operations
+and are kept in the cache as well. The least recently used surfaces are
+evicted when the total size of the cache exceeds its budget."""
+import atexit
+from collections import OrderedDict
+
+import pygame
+
+from memory_registry import get_memory_registry
+
+# Maximum total size of cached surfaces in bytes
+CACHE_BUDGET = 32 * 1024 * 1024
+
+# Base color for rasterizing the text before coloring
+BASE_COLOR = (255, 255, 255)
+
+text_cache = None
+
+class TextCache():
+    """The class keeps rendered text surfaces keyed by font, text, color,
+    background and alpha in LRU order.
+    Note: the surfaces are shared by all the callers and must not be
+    changed."""
+    def __init__(self, budget=CACHE_BUDGET, report=False):
+        """Input parameters:
+        budget - maximum total size of cached surfaces in bytes;
+        report - if True then the statistics are printed on exit."""
+        self.budget = budget
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.items = OrderedDict()
+        if report:
+            atexit.register(self.report)
+
+    def _get_bytes(self, image):
+        return image.get_pitch() * image.get_height()
+
+    def _store(self, key, image):
+        self.items[key] = image
+        self.bytes += self._get_bytes(image)
+        # The most recently used item is never evicted
+        while self.bytes > self.budget and len(self.items) > 1:
+            evicted_key, evicted_image = self.items.popitem(last=False)
+            self.bytes -= self._get_bytes(evicted_image)
+            self.evictions += 1
+
+    def render(self, font, font_key, text, color, background=None,
+               alpha=None):
+        """Returns pygame.Surface with rendered antialiased text.
+        Input parameters:
+        font - pygame.font.Font object;
+        font_key - hashable value identifying the font and its size
+        (for example, a tuple (typeface, size));
+        text - string to be rendered;
+        color - color of the text (list or tuple [r, g, b]);
+        background - if specified then the text is drawn on this color
+        which is made transparent by colorkey;
+        alpha - if specified then transparency of the whole surface
+        (from 0 to 255)."""
+        key = (font_key, text, tuple(color), background, alpha)
+        image = self.items.get(key)
+        if image is not None:
+            self.hits += 1
+            self.items.move_to_end(key)
+            return image
+
+        self.misses += 1
+        if alpha is not None:
+            image = self.render(font, font_key, text, color,
+                                background).copy()
+            if background is not None:
+                image.set_colorkey(background)
+            image.set_alpha(alpha)
+        elif background is not None:
+            source = self.render(font, font_key, text, color)
+            image = pygame.Surface(source.get_size())
+            image.fill(background)
+            image.blit(source, (0, 0))
+            image.set_colorkey(background)
+        elif tuple(color) == BASE_COLOR:
+            image = font.render(text, True, BASE_COLOR)
+        else:
+            image = self.render(font, font_key, text, BASE_COLOR).copy()
+            image.fill(tuple(color) + (255,),
+                       special_flags=pygame.BLEND_RGBA_MULT)
+
+        self._store(key, get_memory_registry().register('text', image))
+        return image
+
+    def clear(self):
+        """Removes all the surfaces from the cache."""
+        self.items.clear()
+        self.bytes = 0
+
+    def get_stats(self):
+        """Returns a dict with the number of cached surfaces, their total
+        size in bytes, hits, misses and evictions."""
+        return {'items': len(self.items), 'bytes': self.bytes,
+                'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
+
+    def report(self):
+        """Prints the statistics of the cache."""
+        stats = self.get_stats()
+        requests = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / requests if requests else 0
+        print(f"Text cache: {stats['items']} surfaces, "
+              f"{stats['bytes'] // 1024} KB; hits {stats['hits']}, "
+              f"misses {stats['misses']} ({hit_rate:.0%} hit rate), "
+              f"evictions {stats['evictions']}")
+
+
+def init(budget=CACHE_BUDGET, report=False):
+    """Initializes TextCache instance for further using."""
+    global text_cache
+    text_cache = TextCache(budget, report)
+
+def get_text_cache():
+    """Returns TextCache singleton."""
+    global text_cache
+    if text_cache == None:
+        init()
+    return text_cache
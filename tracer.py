@@ -0,0 +1,194 @@
+"""Module for recording named time spans of the game loop and writing
+them in Chrome trace event format, so a session may be inspected later
+in a trace viewer (chrome://tracing, Perfetto, etc.).
+
+Methods are traced by wrapping them in place (see Tracer.instrument()).
+If tracing is disabled nothing is wrapped at all, so the game runs
+exactly the same code as without the tracer.
+
+Spans are written to the file as they go (see Tracer.update()), so
+only the last second or so is lost if the game is killed or crashes.
+The file is a JSON array which is closed on normal exit; trace viewers
+open unclosed arrays as well. When the file gets too long it's renamed
+to NAME.1.EXT and a new one is started, so the disk holds about twice
+MAX_FILE_EVENTS latest spans at most."""
+import atexit
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+# Spans are written to the file at least every FLUSH_INTERVAL seconds and
+# whenever MAX_BUFFER_EVENTS spans are recorded (a few megabytes of RAM)
+FLUSH_INTERVAL = 1.0
+MAX_BUFFER_EVENTS = 20000
+# Number of spans in the file before it's rotated: about ten minutes of
+# the game (about 100 MB)
+MAX_FILE_EVENTS = 1000000
+
+class Span():
+    """Context manager recording a span with given name."""
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.add(self.name, self.start,
+                        time.perf_counter() - self.start)
+        return False
+
+
+class Tracer():
+    """The class keeps recorded spans not written to the file yet in
+    format: [(name, start time, duration),...]
+    Times are in seconds from performance counter."""
+    def __init__(self, filename=None, max_buffer_events=MAX_BUFFER_EVENTS,
+                 max_file_events=MAX_FILE_EVENTS,
+                 flush_interval=FLUSH_INTERVAL):
+        """Input parameters:
+        filename - file for writing the trace; tracing is disabled if
+        the filename is None;
+        max_buffer_events - number of recorded spans which makes them
+        written to the file at once;
+        max_file_events - number of spans in the file which makes it
+        rotated;
+        flush_interval - maximum time in seconds the spans are kept in
+        memory (see update())."""
+        self.filename = filename
+        self.enabled = filename is not None
+        self.events = []
+        self.max_buffer_events = max_buffer_events
+        self.max_file_events = max_file_events
+        self.flush_interval = flush_interval
+        self.origin = time.perf_counter()
+        self.flush_time = self.origin
+        self.pid = os.getpid()
+        self.thread_id = threading.get_ident()
+        self.file = None
+        self.file_events = 0
+        self.written = 0
+        if self.enabled:
+            self._open()
+            atexit.register(self.close)
+            # Termination of the process (e.g. cabinet shutdown) runs the
+            # exit handlers, so the file is closed properly
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    def _open(self):
+        try:
+            self.file = open(self.filename, 'w')
+            self.file.write('[')
+        except OSError as e:
+            print(f"Can't write trace {self.filename}: {e}")
+            self.file = None
+        self.file_events = 0
+
+    def _rotate(self):
+        """Closes the file, keeps it as NAME.1.EXT and starts a new one."""
+        self.file.write('\n]\n')
+        self.file.close()
+        root, ext = os.path.splitext(self.filename)
+        try:
+            os.replace(self.filename, f"{root}.1{ext}")
+        except OSError as e:
+            print(f"Can't rotate trace {self.filename}: {e}")
+        self._open()
+
+    def instrument(self, obj, method_name, name=None):
+        """Replaces the method (or function of the module) of the object
+        with the one recording a span for every call. The span name is
+        'ClassName.method_name' by default. Does nothing if tracing is
+        disabled."""
+        if not self.enabled:
+            return
+        function = getattr(obj, method_name)
+        if name is None:
+            name = f"{type(obj).__name__}.{method_name}"
+        add = self.add
+        clock = time.perf_counter
+
+        def traced(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                add(name, start, clock() - start)
+
+        setattr(obj, method_name, traced)
+
+    def add(self, name, start, duration):
+        """Records the span. Start time and duration are in seconds
+        from performance counter."""
+        self.events.append((name, start, duration))
+        if len(self.events) >= self.max_buffer_events:
+            self.flush()
+
+    def span(self, name):
+        """Returns context manager recording a span with given name
+        (or doing nothing if tracing is disabled)."""
+        if not self.enabled:
+            return nullcontext()
+        return Span(self, name)
+
+    def _get_event(self, name, start, duration):
+        """Returns the span in Chrome trace event format (complete event
+        with microsecond timestamps)."""
+        return {
+            'name': name,
+            'ph': 'X',
+            'ts': round((start - self.origin) * 1e6, 1),
+            'dur': round(duration * 1e6, 1),
+            'pid': self.pid,
+            'tid': self.thread_id,
+            }
+
+    def update(self):
+        """Call every frame: writes recorded spans to the file if they
+        have been kept longer than the flush interval."""
+        if (self.enabled and
+                time.perf_counter() - self.flush_time >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Writes recorded spans to the file."""
+        self.flush_time = time.perf_counter()
+        events, self.events = self.events, []
+        if self.file is None:
+            return
+        try:
+            for event in events:
+                if self.file_events >= self.max_file_events:
+                    self._rotate()
+                    if self.file is None:
+                        return
+                # Events are separated beforehand, so the array is valid
+                # JSON once it's closed
+                self.file.write(',\n' if self.file_events else '\n')
+                json.dump(self._get_event(*event), self.file)
+                self.file_events += 1
+                self.written += 1
+            self.file.flush()
+        except OSError as e:
+            print(f"Can't write trace {self.filename}: {e}")
+
+    def close(self):
+        """Writes the rest of the spans and closes the file."""
+        if self.file is None:
+            return
+        self.flush()
+        try:
+            self.file.write('\n]\n')
+            self.file.close()
+        except OSError as e:
+            print(f"Can't write trace {self.filename}: {e}")
+        else:
+            print(f"Trace of {self.written} spans is written "
+                  f"to {self.filename}")
+        self.file = None
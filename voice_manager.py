@@ -0,0 +1,172 @@
+"""Module for distributing sounds among mixer channels. Every category
+of sounds has its own reserved group of channels, so the number of
+sounds playing at once (and thus mixing cost) is bounded. Sounds of the
+same category started within a short window are coalesced into one
+louder voice, too frequent sounds are dropped, and a sound of higher
+priority may steal the channel from the one of lower priority. Sounds
+may be panned in stereo by their position relative to the view point.
+The sounds are expected to be loaded at full volume: the volume of the
+sound is applied by its channel, so coalesced voices can be louder."""
+import atexit
+from collections import deque
+
+import pygame
+import pygame.mixer
+
+# Period in milliseconds for rate limiting
+RATE_PERIOD = 1000
+# Increment of the voice volume for every sound coalesced into it
+# (up to 1.0)
+COALESCE_BOOST = 0.1
+# Maximum stereo panning: 0.0 - no panning, 1.0 - full separation
+PAN_DEPTH = 0.6
+
+class VoiceManager():
+    """The class keeps channel groups and the voices playing on them.
+    Channel group parameters are specified by the dict in format:
+    {
+    'channels': number of channels reserved for the category,
+    'priority': priority of the category sounds (greater is higher),
+    'coalesce': window in milliseconds for coalescing sounds,
+    'rate': maximum number of sounds started per RATE_PERIOD
+    }
+    """
+    def __init__(self, groups, view_point=None, report=False):
+        """Input parameters:
+        groups - dict in format {category: channel group parameters};
+        view_point - ViewPoint class instance for stereo panning;
+        report - if True then the statistics are printed on exit."""
+        self.groups = groups
+        self.view_pt = view_point
+        self.channels = {}
+        index = 0
+        for category, group in self.groups.items():
+            self.channels[category] = [
+                pygame.mixer.Channel(i)
+                for i in range(index, index + group['channels'])]
+            index += group['channels']
+        pygame.mixer.set_num_channels(index)
+        # Sound.play() must not interfere with the channel groups
+        pygame.mixer.set_reserved(index)
+
+        # Format: {channel: {'category', 'priority', 'start', 'volume',
+        #                    'pan', 'sounds'}}
+        self.voices = {}
+        # Format: {category: deque of start times}
+        self.starts = {category: deque() for category in self.groups}
+        self.stats = {'played': 0, 'coalesced': 0, 'dropped': 0,
+                      'stolen': 0}
+        if report:
+            atexit.register(self.report)
+
+    def set_view_point(self, view_point):
+        """Sets ViewPoint class instance for stereo panning."""
+        self.view_pt = view_point
+
+    def _get_pan(self, x):
+        """Returns stereo position from -1.0 (left) to 1.0 (right) for
+        the absolute x-coordinate."""
+        if x is None or self.view_pt is None:
+            return 0.0
+        pan = (x - self.view_pt.x) / self.view_pt.half_width
+        return min(max(pan, -1.0), 1.0)
+
+    def _set_volume(self, channel, volume, pan):
+        left = volume * (1 - max(pan, 0.0) * PAN_DEPTH)
+        right = volume * (1 + min(pan, 0.0) * PAN_DEPTH)
+        channel.set_volume(left, right)
+
+    def _get_voice(self, channel):
+        """Returns the voice playing on the channel or None."""
+        if not channel.get_busy():
+            self.voices.pop(channel, None)
+        return self.voices.get(channel)
+
+    def _coalesce(self, category, now, pan):
+        """Merges the sound into the voice of the same category started
+        within coalescing window. Returns the channel or None."""
+        window = self.groups[category]['coalesce']
+        for channel in list(self.voices):
+            voice = self._get_voice(channel)
+            if (voice and voice['category'] == category
+                    and now - voice['start'] < window):
+                voice['volume'] = min(voice['volume'] + COALESCE_BOOST, 1.0)
+                # The voice is panned to the mean position of its sounds
+                voice['sounds'] += 1
+                voice['pan'] += (pan - voice['pan']) / voice['sounds']
+                self._set_volume(channel, voice['volume'], voice['pan'])
+                return channel
+        return None
+
+    def _rate_exceeded(self, category, now):
+        starts = self.starts[category]
+        while starts and now - starts[0] >= RATE_PERIOD:
+            starts.popleft()
+        return len(starts) >= self.groups[category]['rate']
+
+    def _find_channel(self, category):
+        """Returns free channel of the category group or the channel to
+        be stolen. The victim is the voice of the lowest priority (not
+        higher than the category priority), the oldest one among equal.
+        Returns None if there is no such channel."""
+        priority = self.groups[category]['priority']
+        for channel in self.channels[category]:
+            if self._get_voice(channel) is None:
+                return channel
+
+        victim = None
+        for channels in self.channels.values():
+            for channel in channels:
+                voice = self._get_voice(channel)
+                if voice is None or voice['priority'] > priority:
+                    continue
+                if (victim is None
+                        or (voice['priority'], voice['start']) <
+                        (self.voices[victim]['priority'],
+                         self.voices[victim]['start'])):
+                    victim = channel
+
+        if victim is not None:
+            self.stats['stolen'] += 1
+        return victim
+
+    def play(self, category, sound, volume=1.0, x=None):
+        """Plays the sound of given category with given volume (from 0.0
+        to 1.0). If specified, x is absolute x-coordinate of the sound
+        source for stereo panning. Returns the channel playing the sound
+        or None if the sound has been dropped."""
+        now = pygame.time.get_ticks()
+        pan = self._get_pan(x)
+
+        channel = self._coalesce(category, now, pan)
+        if channel:
+            self.stats['coalesced'] += 1
+            return channel
+
+        if self._rate_exceeded(category, now):
+            self.stats['dropped'] += 1
+            return None
+
+        channel = self._find_channel(category)
+        if channel is None:
+            self.stats['dropped'] += 1
+            return None
+
+        channel.play(sound)
+        self.voices[channel] = {
+            'category': category,
+            'priority': self.groups[category]['priority'],
+            'start': now,
+            'volume': volume,
+            'pan': pan,
+            'sounds': 1,
+            }
+        self._set_volume(channel, volume, pan)
+        self.starts[category].append(now)
+        self.stats['played'] += 1
+        return channel
+
+    def report(self):
+        """Prints the statistics of the voices."""
+        print("Sounds: " + ', '.join(f"{name} {count}" for name, count
+                                     in self.stats.items()))